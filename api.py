@@ -0,0 +1,197 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from local_store import local_first
+from resilience import CircuitBreaker
+from snapshot import SnapshotStore, read_standings
+
+
+# JSON standings API, outside Streamlit
+#
+#   GET /standings        every team, by league, division and rank
+#   GET /league/AL        one league as {division: [teams by rank]} (or NL)
+#   GET /team/<team_id>   one team
+#
+# Served from the same computed snapshot as the page (teams table rows, see
+# snapshot.py), never from a pipeline run. Every response body is serialized
+# and gzipped once per snapshot version and kept as bytes, so a request is a
+# dictionary lookup plus a write. Strong ETags are content hashes; a matching
+# If-None-Match gets a 304 with no body.
+#
+# Usage:
+#   python api.py                  # 0.0.0.0:8600
+#   python api.py --port 8080
+#
+# Reads the worker's local SQLite copy like the page when there is a current
+# one (local_store.py), otherwise Supabase with SUPABASE_URL /
+# SUPABASE_SERVICE_ROLE_KEY. The last snapshot is kept in API_SNAPSHOT_PATH,
+# so a restart serves straight away.
+
+API_SNAPSHOT_PATH = os.environ.get("API_SNAPSHOT_PATH", os.path.join(".cache", "api_snapshot.json"))
+SNAPSHOT_TTL_SECONDS = 60
+CACHE_CONTROL = f"public, max-age={SNAPSHOT_TTL_SECONDS}"
+
+LEAGUES = {'AL': "American League", 'NL': "National League"}
+
+
+class Response:
+    __slots__ = ('etag', 'gzip_etag', 'body', 'gzip_body')
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, separators=(',', ':'), default=str).encode()
+        self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        digest = hashlib.sha1(self.body).hexdigest()[:20]
+        # Strong ETags differ per encoding
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+
+
+def sorted_teams(teams):
+    return sorted(teams, key=lambda team: (team['league'], team['division'], team['division_rank']))
+
+
+# {path: Response} for one snapshot
+def build_responses(snapshot):
+    teams = sorted_teams(dict(team) for team in snapshot.teams)
+    meta = {'version': snapshot.version, 'data_as_of': snapshot.data_as_of}
+
+    responses = {'/standings': Response({**meta, 'teams': teams})}
+    for code, league in LEAGUES.items():
+        divisions = {}
+        for team in teams:
+            if team['league'] == league:
+                divisions.setdefault(team['division'], []).append(team)
+        responses[f'/league/{code}'] = Response({**meta, 'league': league, 'divisions': divisions})
+    for team in teams:
+        responses[f"/team/{team['team_id']}"] = Response({**meta, 'team': team})
+    return responses
+
+
+class StandingsResponses:
+    def __init__(self, store, loader):
+        self.store = store
+        self.loader = loader
+        self.version = None
+        self.rebuilds = 0
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    # Current {path: Response}, rebuilt only when the snapshot changes (rows or
+    # data_as_of). An expired snapshot keeps being served while it reloads in
+    # the background.
+    def current(self):
+        snapshot = self.store.peek()
+        if snapshot is None:
+            snapshot = self.store.get(self.loader)
+        elif not self.store.is_fresh():
+            self.store.revalidate(self.loader)
+
+        version = (snapshot.version, snapshot.data_as_of)
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    self._responses = build_responses(snapshot)
+                    self.version = version
+                    self.rebuilds += 1
+        return self._responses
+
+
+class StandingsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    # Headers and body go out as separate writes, without this each keep-alive
+    # response waits on the client's delayed ACK
+    disable_nagle_algorithm = True
+    standings = None  # StandingsResponses, set by serve()
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        try:
+            responses = self.standings.current()
+        except Exception as e:
+            self._send_error(503, f"Standings unavailable: {e}")
+            return
+
+        path = self.path.split('?', 1)[0].rstrip('/')
+        response = responses.get(path)
+        if response is None:
+            self._send_error(404, f"Not found: {path}")
+            return
+
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        etag = response.gzip_etag if use_gzip else response.etag
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and (if_none_match.strip() == '*' or etag in if_none_match):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', CACHE_CONTROL)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        body = response.gzip_body if use_gzip else response.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', CACHE_CONTROL)
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        body = json.dumps({'error': message}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # No per-request logging, it would cost more than the response
+    def log_message(self, format, *args):
+        pass
+
+
+def create_loader():
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv() # Loads .env file
+    client = create_client(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_SERVICE_ROLE_KEY"))
+    breaker = CircuitBreaker("Supabase", failure_threshold=3, reset_seconds=60)
+    return local_first(lambda: breaker.call(lambda: read_standings(client)))
+
+
+def serve(host, port, loader, snapshot_path=API_SNAPSHOT_PATH):
+    StandingsHandler.standings = StandingsResponses(SnapshotStore(SNAPSHOT_TTL_SECONDS, snapshot_path), loader)
+    server = ThreadingHTTPServer((host, port), StandingsHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON standings API")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, create_loader())
+    print(f"Serving standings on http://{args.host}:{args.port}/standings")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
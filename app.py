@@ -1,13 +1,20 @@
 import streamlit as st
-import time
 import os
 import logging
 import warnings
 
-totaltime = time.time()
+import metrics
+
+from render import FOOTER_HTML, STYLESHEET_HTML, FragmentCache, build_stale_badge_html
+
+# Whole script run, closed at the bottom of the file (see metrics.py)
+page_build = metrics.span('page.build').start()
 
 st.set_page_config("MLB Playoff Race Tracker", layout='wide')
 
+# Shared stylesheet for the lanes, data rows and legend (see render.py)
+st.html(STYLESHEET_HTML)
+
 # Title
 st.markdown("<h1 style='text-align: center;'>MLB Playoff Race Tracker</h1>", unsafe_allow_html=True)
 
@@ -18,516 +25,194 @@ status_placeholder.info("Loading latest MLB data...")
 logging.getLogger('streamlit.runtime.scriptrunner.script_runner').setLevel(logging.ERROR)
 warnings.filterwarnings("ignore", message="missing ScriptRunContext")
 
-from dotenv import load_dotenv
+from live import LIVE_POLL_SECONDS, LiveScores, current_results
+from local_store import local_first
+from resilience import CircuitBreaker
+from seasons import CURRENT_SEASON, games_per_season, list_archived_seasons, load_archive
+from snapshot import SnapshotStore, read_standings
+
+# The live season plus every frozen archive (see seasons.py)
+season = st.sidebar.selectbox("Season", [CURRENT_SEASON] + [s for s in list_archived_seasons() if s != CURRENT_SEASON])
+
+# Season replay reads the local history files only (see history.py, replay.py)
+views = ["Live standings", "What if", "Season replay"] if season == CURRENT_SEASON else ["Live standings", "Season replay"]
+view = st.sidebar.radio("View", views)
+if view == "Season replay":
+    from replay import render_replay
 
-from supabase import create_client
+    status_placeholder.empty()
+    render_replay(season)
+    st.html(FOOTER_HTML)
+    page_build.finish()
+    metrics.registry.export('page')
+    st.stop()
 
-import statsapi
+# Live scores only make sense for the season being played
+live_mode = view == "Live standings" and season == CURRENT_SEASON and st.sidebar.toggle("Live scores", help="Standings, magic numbers and lanes as if current scores hold")
 
-from concurrent.futures import ThreadPoolExecutor
+# How long a page view waits on the database before painting what it has
+DB_DEADLINE_SECONDS = 3
 
-load_dotenv() # Loads .env file
+# The worker runs every 30 minutes, older data than this gets the stale badge
+STALE_AFTER_SECONDS = 3600
 
+# This page is read-only: the ingestion worker (ingest.py) fetches from the
+# MLB API, computes seeding/magic numbers and writes the teams table.
+# A page view only reads the latest computed rows back.
+
+# supabase (and dotenv) are imported on first use: the import alone is about
+# half a second, and a cold start can paint from the local snapshot file first
 @st.cache_resource
 def get_supabase_client():
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv() # Loads .env file
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
     supabase = create_client(url, key)
     return supabase
 
-supabase = get_supabase_client()
-
-@st.cache_data(ttl=1800, show_spinner=False)
-def fetch_teams_data():
-    return statsapi.get('teams', {'sportId': 1})
-    # print(data)
-
-@st.cache_data(ttl=1800, show_spinner=False)
-def fetch_standing_data():
-    return statsapi.standings_data(season='2025')
-
-start_time = time.time()
-
-# Multithreading for API calls
-with ThreadPoolExecutor(max_workers=2) as executor:
-    # Submit requests (both start immediately) 
-    teams_data_request = executor.submit(fetch_teams_data)
-    standings_data_request = executor.submit(fetch_standing_data)
-
-    # Pull responses once there ready
-    data = teams_data_request.result()
-    standings_data = standings_data_request.result()
-
-time_api_end = time.time()
-
-print(f"APIs take {time_api_end - start_time:.3f} seconds")
-mlb_teams = data['teams']
-
-# print((mlb_teams[1]))
-
-# test_team_id = statsapi.team_leaders(teamId='112', leaderCategories='hits')
-# print(test_team_id)
-
-# Strips the outside dictionary layer and only keeps the values in a list
-standings_data_divisions = list(standings_data.values())
-
-
-
-# 15 teams per league - NL, AL
-
-national_league_teams = []
-american_league_teams = []
-
-
-# Gets the division - standings_data_divisions[0]
-# Then gets all the teams in the division ['teams']
-# Then get the first team [0]
-# standings_data_divisions[0]['teams'][0]
-# Add any stat you want for example : wins
-# standings_data_divisions[0]['teams'][0]['w'] returns
-# the number of wins by that team
-
-
-# print(standings_data_divisions[0]['teams'][0]['w'])
-
-
-
-standings_lookup = {}
-for division in standings_data_divisions:
-    for team in division['teams']:
-        standings_lookup[team['team_id']] = team
-
-# print(standings_lookup[115])
-
-# print(standings_lookup[146])
+# One breaker per process so a failing database is not hit by every session
+@st.cache_resource
+def get_db_breaker():
+    return CircuitBreaker("Supabase", failure_threshold=3, reset_seconds=60)
 
-all_team_data = []
+# Latest rows and when the worker last succeeded (see snapshot.read_standings),
+# from the worker's local SQLite copy when it keeps one on this machine
+def load_supabase_standings():
+    return get_db_breaker().call(lambda: read_standings(get_supabase_client()))
 
-start_time = time.time()
+load_standings = local_first(load_supabase_standings)
 
-# Loops through all teams and stores team data in database table 
-for team in mlb_teams:
-    standings = standings_lookup.get(team['id'])
+# One snapshot per process, shared by every session (see snapshot.py)
+@st.cache_resource
+def get_snapshot_store():
+    return SnapshotStore(ttl_seconds=300)
 
-    games_played = standings['w'] + standings['l']
-    win_percentage = round(float(standings['w']/games_played), 3)
+snapshot_store = get_snapshot_store()
 
-    if team['league']['name'] == "National League": 
-        national_league_teams.append(team)
-    else:
-        american_league_teams.append(team)
-
-    team_data = {
-        'team_id': team['id'],
-        'team_name': team['name'],
-        'abbreviation': team['abbreviation'],
-        'division': team['division']['name'],
-        'league': team['league']['name'],
-        
-        # standings data
-        'wins': standings['w'],
-        'losses': standings['l'],
-        'games_played': games_played,
-        'win_percentage': win_percentage,
-        'division_rank': int(standings['div_rank']) if standings['div_rank'] != '-' else 1,
-        'games_back_in_division': 0.0 if standings['gb'] == '-' else float(standings['gb']),
-        'wild_card_rank': int(standings['wc_rank']) if standings['wc_rank'] != '-' else None,
-        'games_back_in_wild_card': 0.0 if standings['wc_gb'] == '-' else float(standings['wc_gb']) if standings['wc_gb'] else None,
-        'league_rank': standings['league_rank']
-    }
-
-    all_team_data.append(team_data)
-
-# Single batch insert after the loop
-try:
-    response = supabase.table('teams').upsert(all_team_data, on_conflict='team_id').execute()
-    end_time = time.time()
-    print(f"Successfully updated {len(all_team_data)} teams in {end_time - start_time:.3f} seconds")
-except Exception as e:
-    print(f"Could not update teams: {e}")
-    # Fallback to individual inserts if batch fails
-    for team_data in all_team_data:
-        try:
-            response = supabase.table('teams').upsert(team_data, on_conflict='team_id').execute()
-            print(f"Inserted/Updated: {team_data['team_name']}")
-        except Exception as individual_error:
-            print(f"Could not update {team_data['team_name']}: {individual_error}")
-
-
-# print(national_league_teams)
-# print(len(national_league_teams))
-
-# print(american_league_teams)
-# print(len(american_league_teams))
-
-
-
-
-
-# Calculate and assign playoff_position values for current playoff seeding (Priority 0)
-
-# Playoff Position Logic:
-# Seeds 1-3: Division winners ranked by win percentage (highest = seed 1).
-#            If two or more division winners are tied in win percentage, 
-#            use league_rank as the tie-breaker. This tie-break rule only 
-#            applies to division winners.
-# Seeds 4-6: Wild card teams ranked by wild_card_rank (1st WC = seed 4, etc.)
-# Seeds 7-15: Non-playoff teams ranked by wild_card_rank
-
-# Steps:
-# 1. Separate teams by league (AL/NL)
-# 2. For each league:
-#    - Get division winners (division_rank == 1), sort by win percentage 
-#      (and league_rank if tied), assign playoff_position 1, 2, 3
-#    - Get wild card teams (wild_card_rank 1-3), assign playoff_position 4, 5, 6
-#    - Get remaining teams, sort by wild_card_rank, assign playoff_position 7-15
-# 3. Store playoff_position in database along with other team stats
-
-# Result: playoff_position column will show current playoff seeding
-
-
-playoff_time_start = time.time()
-
-playoff_rank_NL = {}
-division_winners_NL = []
-wildcard_teams_NL = []
-
-
-# Calculates and assigns playoff_position values for current playoff seeding (National League)
-for team in national_league_teams:
-    standings = standings_lookup.get(team['id'])
-    wc_rank = standings['wc_rank']
-    win_percentage = round(float(standings['w']/(standings['w'] + standings['l'])), 4)
-
-    # Divsion winner
-    if (wc_rank == '-'):
-        division_winner_data = {
-            'team_id' : team['id'], 
-            'name' : standings['name'],
-            'win_percentage' : win_percentage,
-            'league_rank': int(standings['league_rank'])
-        }
-        division_winners_NL.append(division_winner_data)
-    # All other teams
+# Archives never change, one load per season and process
+@st.cache_resource
+def get_archived_snapshot(season):
+    return load_archive(season)
+
+if season != CURRENT_SEASON:
+    # Past seasons come from their archive file, never the API or the database
+    snapshot = get_archived_snapshot(season)
+    refresh_done = None
+else:
+    with metrics.span('page.snapshot') as span:
+        # Stale-while-revalidate: an expired snapshot (or one read from the snapshot
+        # file on a cold start) is painted now and reloaded in the background
+        snapshot = snapshot_store.peek()
+        refresh_done = None
+        if not snapshot_store.is_fresh():
+            refresh_done = snapshot_store.revalidate(load_standings)
+            span.count('revalidations')
+        if snapshot is None:
+            # Nothing to show yet, wait for the database but not forever
+            refresh_done.wait(DB_DEADLINE_SECONDS)
+            snapshot = snapshot_store.peek()
+            refresh_done = None
+
+if snapshot is None:
+    status_placeholder.error("Standings are unavailable right now, please try again in a minute.")
+    page_build.finish()
+    st.stop()
+
+divisions_NL = snapshot.divisions_NL
+divisions_AL = snapshot.divisions_AL
+
+# Stale badge when the reload failed or timed out, or the worker hasn't run in a while
+def show_status(snapshot, timed_out=False):
+    if timed_out or snapshot_store.last_error is not None or snapshot.data_age() > STALE_AFTER_SECONDS:
+        status_placeholder.html(build_stale_badge_html(snapshot.data_age()))
     else:
-        wildcard_data = {
-            'team_id' : team['id'], 
-            'name' : standings['name'],
-            'wc_rank' : int(standings['wc_rank'])
-        }
-        wildcard_teams_NL.append(wildcard_data)
-
-def get_division_sort_key(standings):
-    return (-standings['win_percentage'], standings['league_rank'])
-    
-division_winners_NL.sort(key=get_division_sort_key)
-    
-def get_wildcard_sort_key(standings):
-    return (standings['wc_rank'])
-    
-wildcard_teams_NL.sort(key=get_wildcard_sort_key)
+        status_placeholder.empty()
 
-# print(division_winners_NL)
+if season != CURRENT_SEASON:
+    status_placeholder.caption(f"Final {season} regular season standings")
+elif refresh_done is not None:
+    status_placeholder.info("Showing saved standings, checking for updates...")
+else:
+    show_status(snapshot)
 
-# print(wildcard_teams_NL)
+# One fragment cache per process, shared by every session
+@st.cache_resource
+def get_fragment_cache():
+    return FragmentCache(max_entries=64)
 
+fragment_cache = get_fragment_cache()
 
-playoff_position = 1
-    
-# Seeds 1-3: Division winners (already sorted by win % and league_rank)
-for team in division_winners_NL:
-    playoff_rank_NL[team['team_id']] = playoff_position
-    playoff_position += 1
-
-# Seeds 4-15: Remaining teams
-for team in wildcard_teams_NL:
-    playoff_rank_NL[team['team_id']] = playoff_position
-    playoff_position += 1
-
-# print("NL Playoff Rankings:")
-# print(playoff_rank_NL)
-
-playoff_rank_NL_data = []
-
-for team_id in playoff_rank_NL:
-    playoff_position_data = {
-        'team_id': team_id,                           # Use the key (team_id)
-        'playoff_position': playoff_rank_NL[team_id]  # Use the value (playoff_position)
-    }
-    # print(playoff_position_data)
-    playoff_rank_NL_data.append(playoff_position_data)
-
-playoff_rank_AL = {}
-division_winners_AL = []
-wildcard_teams_AL = []
-
-# Calculates and assigns playoff_position values for current playoff seeding (American League)
-for team in american_league_teams:
-    standings = standings_lookup.get(team['id'])
-    wc_rank = standings['wc_rank']
-    win_percentage = round(float(standings['w']/(standings['w'] + standings['l'])), 4)
-
-    # Divsion winner
-    if (wc_rank == '-'):
-        division_winner_data = {
-            'team_id' : team['id'], 
-            'name' : standings['name'],
-            'win_percentage' : win_percentage,
-            'league_rank': int(standings['league_rank'])
-        }
-        division_winners_AL.append(division_winner_data)
-    # All other teams
+# One poller per process, a single upstream request serves every session (see live.py)
+@st.cache_resource
+def get_live_scores():
+    return LiveScores()
+
+# One scenario engine per standings version, shared by every session (see scenarios.py)
+@st.cache_resource(max_entries=4)
+def get_scenario_engine(version, season, _rows):
+    from scenarios import ScenarioEngine
+
+    return ScenarioEngine(_rows, games_per_season(season))
+
+# What-if view: today's games from the shared poller, picks recompute in the fragment
+if view == "What if":
+    from whatif import render_whatif
+
+    engine = get_scenario_engine(snapshot.version, season, snapshot.teams)
+    abbreviations = {team['team_id']: team['abbreviation'] for team in snapshot.teams}
+    render_whatif(engine, get_live_scores().get(), fragment_cache, abbreviations)
+    st.html(FOOTER_HTML)
+    page_build.finish()
+    metrics.registry.export('page')
+    st.stop()
+
+def draw_division(division_name, teams_in_div):
+    st.markdown(f"<h3 style='color: #ffd93d; text-align: center; margin-bottom: 20px; font-size: 1.3rem;'>{division_name}</h3>", unsafe_allow_html=True)
+
+    with metrics.span('page.render_division') as span:
+        hits_before = fragment_cache.hits
+        lanes_html, data_html = fragment_cache.get(teams_in_div)
+        # Other sessions share the cache, so this can over-count under load
+        span.count('cache_hits' if fragment_cache.hits > hits_before else 'cache_misses')
+
+    # Create sub-columns: lanes take 2/3, data takes 1/3
+    lane_col, data_col = st.columns([2, 1])
+
+    with lane_col:
+        st.html(lanes_html)
+
+    with data_col:
+        st.html(data_html)
+
+# Each division is its own fragment, HTML comes from the cache unless the division changed
+render_division = st.fragment(draw_division)
+
+# Live mode: re-projects and redraws just this division every poll, no full-script rerun
+@st.fragment(run_every=LIVE_POLL_SECONDS)
+def render_live_division(division_name, league):
+    projected = live_scores.project(snapshot, games_per_season(season))
+    divisions = projected.divisions_AL if league == "American League" else projected.divisions_NL
+    draw_division(division_name, divisions[division_name])
+
+# Only leagues with games still to finish today, or finals the snapshot
+# hasn't counted yet, poll; a result anywhere in the league can move every
+# division's wild card numbers
+live_leagues = set()
+if live_mode:
+    live_scores = get_live_scores()
+    todays_games = live_scores.get()
+    playing = live_scores.live_teams(snapshot)
+    live_leagues = {team['league'] for team in snapshot.teams if team['team_id'] in playing}
+    st.sidebar.caption(f"{len(current_results(todays_games))} games with a leader right now, updating every {LIVE_POLL_SECONDS} seconds")
+
+def show_division(division_name, league, divisions):
+    if league in live_leagues:
+        render_live_division(division_name, league)
     else:
-        wildcard_data = {
-            'team_id' : team['id'], 
-            'name' : standings['name'],
-            'wc_rank' : int(standings['wc_rank'])
-        }
-        wildcard_teams_AL.append(wildcard_data)
-
-def get_division_sort_key(standings):
-    return (-standings['win_percentage'], standings['league_rank'])
-    
-division_winners_AL.sort(key=get_division_sort_key)
-    
-def get_wildcard_sort_key(standings):
-    return (standings['wc_rank'])
-    
-wildcard_teams_AL.sort(key=get_wildcard_sort_key)
-
-# print(division_winners_AL)
-
-# print(wildcard_teams_AL)
-
-
-playoff_position = 1
-    
-# Seeds 1-3: Division winners (already sorted by win % and league_rank)
-for team in division_winners_AL:
-    playoff_rank_AL[team['team_id']] = playoff_position
-    playoff_position += 1
-
-# Seeds 4-15: Remaining teams
-for team in wildcard_teams_AL:
-    playoff_rank_AL[team['team_id']] = playoff_position
-    playoff_position += 1
-
-# print("AL Playoff Rankings:")
-# print(playoff_rank_AL)
-
-
-playoff_rank_AL_data = []
-
-for team_id in playoff_rank_AL:
-    playoff_position_data = {
-        'team_id': team_id,                           # Use the key (team_id)
-        'playoff_position': playoff_rank_AL[team_id]  # Use the value (playoff_position)
-    }
-    # print(playoff_position_data)
-    playoff_rank_AL_data.append(playoff_position_data)
-
-all_playoff_data = playoff_rank_NL_data + playoff_rank_AL_data
-
-response = supabase.table('teams').upsert(all_playoff_data, on_conflict='team_id').execute()
-
-playoff_time_end = time.time()
-
-print(f"Playoff_rank has taken {playoff_time_end - playoff_time_start:.3f} seconds")
-
-def division_NL_sort_key(national_league_teams):
-    return (national_league_teams['division']['name'])
-
-def division_AL_sort_key(american_league_teams):
-    return (american_league_teams['division']['name'])
-
-national_league_teams.sort(key=division_NL_sort_key)
-
-american_league_teams.sort(key=division_AL_sort_key)
-
-# print(national_league_teams[1])
-
-# for team in national_league_teams:
-#     print(team['name'])
-
-# for team in american_league_teams:
-#     print(team['name'])
-
-
-def create_divisions_dict(teams):
-    divisions = {}
-    for team in teams:
-        standings = standings_lookup.get(team['id'])
-        division = team['division']['name']
-        
-        if division not in divisions:
-            divisions[division] = {}
-        
-        # Convert div_rank to int for proper indexing
-        div_rank = int(standings['div_rank'])
-        
-        divisions[division][div_rank] = {
-            'team': team,
-            'standings': standings,
-            'losses': standings['l'],
-            'wins': standings['w'],
-            'team_name': team['name']
-        }
-    
-    # # Print divisions
-    # for division_name, teams_in_div in divisions.items():
-    #     # print(f"\n{division_name}:")
-    #     for rank in sorted(teams_in_div.keys()):
-    #         team_info = teams_in_div[rank]
-    #         # print(f"  {rank}. {team_info['team_name']} ({team_info['wins']}-{team_info['losses']})")
-    
-    return divisions
-
-divisions_NL = create_divisions_dict(national_league_teams)
-divisions_AL = create_divisions_dict(american_league_teams)
-
-
-
-# Division (Magic Number) Distance to finish line calculations (Priority 1)
-
-# 163 (starting zone) Magic Number
-# 0 (finish line) Magic Number
-
-# Each teams has there own lane so they are not on top of each other
-
-# 1. Division Magic Number Formula:
-# RG + 1 - (Losses by second place team - losses by first place team)
-# Where:
-
-# RG = Remaining games for the first place team
-# Second/first place teams are within the same division
-
-
-
-def calculate_division_magic_numbers(teams, divisions_dict):
-    for team in teams:
-        standings = standings_lookup.get(team['id'])
-        division = team['division']['name']
-        
-        if int(standings['div_rank']) == 1:
-            # Only calculate for first place teams
-            remaining_games = 162 - (standings['w'] + standings['l'])
-            
-            # Check if ALL teams in the division have finished their season (played 162 games)
-            # This handles the edge case where two teams end with identical records:
-            # the team ranked #1 by tiebreaker rules will have their magic number set to 0
-            
-            all_teams_finished = all(
-                (divisions_dict[division][rank]['wins'] + divisions_dict[division][rank]['losses']) == 162
-                for rank in divisions_dict[division].keys()
-            )
-            
-            # If season is over and team is ranked #1, they've won the division
-            if all_teams_finished and remaining_games == 0:
-                team['magic_number_win_division'] = 0
-            else:
-                second_place_losses = divisions_dict[division][2]['losses']
-                team['magic_number_win_division'] = remaining_games + 1 - (second_place_losses - standings['l'])
-                # print(f"{team['name']}: Division Magic Number = {team['magic_number_win_division']}")
-        else:
-            # Set to NULL for non-first place teams
-            team['magic_number_win_division'] = None
-            # print(f"{team['name']}: Not in first place - no division magic number")
-
-# Use it for both leagues
-calculate_division_magic_numbers(national_league_teams, divisions_NL)
-calculate_division_magic_numbers(american_league_teams, divisions_AL)
-
-
-
-# Distance calculation for race track visual
-def calculate_distance_from_clinch(teams, divisions_dict):
-    for team in teams:
-        standings = standings_lookup.get(team['id'])
-        division = team['division']['name']
-        
-        # Find the division leader's magic number
-        division_leader = divisions_dict[division][1]  # First place team
-        leader_magic_number = division_leader['team'].get('magic_number_win_division', 0)
-        
-        if int(standings['div_rank']) == 1:
-            # Division leader: distance = their magic number
-            team['distance_from_clinched_division'] = leader_magic_number
-        else:
-            # Other teams: leader's magic number + games back
-            games_back = float(standings['gb']) if standings['gb'] != '-' else 0.0
-            team['distance_from_clinched_division'] = leader_magic_number + games_back
-        
-        # print(f"{team['name']}: Distance from division clinch = {team['distance_from_clinched_division']}")
-
-calculate_distance_from_clinch(national_league_teams, divisions_NL)
-calculate_distance_from_clinch(american_league_teams, divisions_AL)
-
-
-# Team Elimination
-
-def add_elimination_status(teams):
-    for team in teams:
-        standings = standings_lookup.get(team['id'])
-        
-        # Check if eliminated (API returns 'E' for eliminated teams)
-        team['eliminated_from_division'] = standings['elim_num'] == 'E'
-        team['eliminated_from_playoffs'] = standings['wc_elim_num'] == 'E'
-        
-        # print(f"{team['name']}: Div Eliminated = {team['eliminated_from_division']}, Playoff Eliminated = {team['eliminated_from_playoffs']}")
-
-# Add this to your code
-add_elimination_status(national_league_teams)
-add_elimination_status(american_league_teams)
-
-
-all_remaining_database_update_data = []
-
-def update_database_with_magic_numbers_and_elimination():
-    start_time = time.time()
-    # Update all teams with magic numbers and elimination status
-    all_teams = national_league_teams + american_league_teams
-
-    for team in all_teams:
-        standings = standings_lookup.get(team['id'])
-        
-        # Get elimination status from API (convert 'E' to 1, anything else to 0)
-        eliminated_from_division = 1 if standings['elim_num'] == 'E' else 0
-        eliminated_from_wildcard = 1 if standings['wc_elim_num'] == 'E' else 0
-        
-        # Get magic numbers (Already calculated before)
-        magic_number_division = team.get('magic_number_win_division', None)
-        distance_from_clinch = team.get('distance_from_clinched_division', None)
-        
-        # Data for database update
-        update_data = {
-            'team_id': team['id'],
-            'magic_number_division': magic_number_division,
-            'distance_from_clinched_division': distance_from_clinch,
-            'eliminated_from_division': eliminated_from_division,
-            'eliminated_from_wildcard': eliminated_from_wildcard
-        }
-
-        all_remaining_database_update_data.append(update_data)
-        
-    try:
-        response = supabase.table('teams').upsert(all_remaining_database_update_data, on_conflict='team_id').execute()
-        end_time = time.time()
-        print(f"Successfully updated {len(all_remaining_database_update_data)} teams in {end_time - start_time:.3f} seconds")
-    except Exception as e:
-        print(f"Could not update teams: {e}") 
-
-        # Fallback to individual inserts if batch fails
-        for update_data  in all_remaining_database_update_data:
-            try:
-                response = supabase.table('teams').upsert(update_data , on_conflict='team_id').execute()
-                print(f"Updated team {update_data['team_id']}")
-            except Exception as e:
-                print(f"Error updating team {update_data['team_id']}: {e}")
-
-# Updates magic_numbers_and_elimination in database
-update_database_with_magic_numbers_and_elimination()
-
-status_placeholder.empty()
+        render_division(division_name, divisions[division_name])
 
 col1, col2 = st.columns(2)
 
@@ -539,136 +224,7 @@ with col1:
     division_order = ['American League East', 'American League Central', 'American League West']
     for division_name in division_order:
         if division_name in divisions_AL:
-            teams_in_div = divisions_AL[division_name]
-            st.markdown(f"<h3 style='color: #ffd93d; text-align: center; margin-bottom: 20px; font-size: 1.3rem;'>{division_name}</h3>", unsafe_allow_html=True)
-            
-            # Create sub-columns within AL: lanes take 2/3, data takes 1/3
-            lane_col, data_col = st.columns([2, 1])
-            
-            with lane_col:
-                # Build HTML for racing lanes only
-                lanes_html = """
-                <div style="display: flex; flex-direction: column; gap: 8px;">
-                """
-                
-                # Create a lane for each team
-                for rank in sorted(teams_in_div.keys()):
-                    team_info = teams_in_div[rank]
-                    team = team_info['team']
-                    standings = team_info['standings']
-                    
-                    # Calculate position based on distance_from_clinched_division
-                    distance = team.get('distance_from_clinched_division', 80)
-                    max_distance = 163
-                    position_percent = ((max_distance - distance) / max_distance) * 85  # Max 85% to leave room for finish zone
-                    
-                    # Check if team has clinched division (magic number 0 or less)
-                    magic_number = team.get('magic_number_win_division', None)
-                    has_clinched = magic_number is not None and magic_number <= 0
-                    
-                    # If clinched, move them past the finish line
-                    if has_clinched:
-                        position_percent = 92  # Place them clearly past the finish line
-                    
-                    # Determine team circle style based on status - add transparency
-                    if has_clinched and int(standings['div_rank']) == 1:
-                        bg_color = "linear-gradient(135deg, rgba(76,175,80,0.9), rgba(102,187,106,0.9))"
-                        border_color = "#4caf50"
-                        text_color = "white"
-                    elif int(standings['div_rank']) == 1:
-                        bg_color = "linear-gradient(135deg, rgba(255,217,61,0.9), rgba(255,237,78,0.9))"
-                        border_color = "#ffd93d"
-                        text_color = "#333"
-                    elif standings.get('wc_rank', 99) != '-' and int(standings.get('wc_rank', 99)) <= 3:
-                        bg_color = "linear-gradient(135deg, rgba(77,150,255,0.9), rgba(103,181,255,0.9))"
-                        border_color = "#4d96ff"
-                        text_color = "white"
-                    elif team_info['standings'].get('elim_num') == 'E':
-                        bg_color = "linear-gradient(135deg, rgba(66,66,66,0.8), rgba(97,97,97,0.8))"
-                        border_color = "#666"
-                        text_color = "#ccc"
-                    else:
-                        bg_color = "linear-gradient(135deg, rgba(158,158,158,0.8), rgba(189,189,189,0.8))"
-                        border_color = "#9e9e9e"
-                        text_color = "#333"
-                    
-                    # Use abbreviation unless eliminated
-                    team_display = team['abbreviation']
-                    
-                    lanes_html += f"""
-                        <!-- Lane for {team['abbreviation']} -->
-                        <div style="position: relative; height: 50px; background: linear-gradient(90deg, rgba(220,53,69,0.15) 0%, rgba(255,193,7,0.15) 35%, rgba(40,167,69,0.15) 85%, rgba(40,167,69,0.2) 100%); border-radius: 25px; border: 1px solid rgba(255,255,255,0.15); overflow: hidden;">
-                            
-                            <!-- Track markers -->
-                            <div style="position: absolute; top: 30%; bottom: 30%; left: 5%; right: 8%; border-top: 1px dashed rgba(255,255,255,0.3); border-bottom: 1px dashed rgba(255,255,255,0.3);"></div>
-                            
-                            <!-- Finish line -->
-                            <div style="position: absolute; right: 8%; top: 8%; bottom: 8%; width: 3px; background: linear-gradient(180deg, #28a745, #40e95e); border-radius: 1px; box-shadow: 0 0 4px rgba(40,167,69,0.4);"></div>
-                            
-                            <!-- Team car -->
-                            <div style="position: absolute; top: 50%; transform: translateY(-50%); left: {position_percent}%; width: 34px; height: 34px; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: 700; font-size: 8px; color: {text_color}; background: {bg_color}; border: 2px solid {border_color}; transition: all 0.3s ease; z-index: 10; {'box-shadow: 0 0 10px rgba(40,167,69,0.6);' if has_clinched else ''}">
-                                {team_display}
-                            </div>
-                        </div>
-                    """
-                
-                lanes_html += "</div>"
-                st.html(lanes_html)
-            
-            with data_col:
-                # Build HTML for team data only - single line format to match lane height exactly
-                data_html = '<div style="display: flex; flex-direction: column; gap: 8px;">'
-                
-                for rank in sorted(teams_in_div.keys()):
-                    team_info = teams_in_div[rank]
-                    team = team_info['team']
-                    standings = team_info['standings']
-                    
-                    record = f"{team_info['wins']}-{team_info['losses']}"
-                    games_back = team_info['standings']['gb'] if team_info['standings']['gb'] != '-' else "LEAD"
-                    win_pct = f"{team_info['wins']/(team_info['wins'] + team_info['losses']):.3f}"
-                    
-                    # Magic number logic - only show if not clinched and is division leader
-                    magic_number = team.get('magic_number_win_division', None)
-                    has_clinched = magic_number is not None and magic_number <= 0
-                    magic_text = ""
-                    if not has_clinched and magic_number is not None and int(standings['div_rank']) == 1:
-                        magic_text = f" • Magic #: {magic_number}"
-                    
-                    # Status text and color
-                    if has_clinched and int(standings['div_rank']) == 1:
-                        status = "CLINCHED DIVISION"
-                        status_color = "#4caf50"
-                        emoji = "🏆"
-                    elif int(standings['div_rank']) == 1:
-                        status = "LEADING"
-                        status_color = "#ffd93d"
-                        emoji = "🥇"
-                    elif standings.get('wc_rank', 99) != '-' and int(standings.get('wc_rank', 99)) <= 3:
-                        status = f"PLAYOFFS • {games_back} GB"
-                        status_color = "#4d96ff"
-                        emoji = "🎯"
-                    elif team_info['standings'].get('elim_num') == 'E':
-                        status = "ELIMINATED"
-                        status_color = "#666"
-                        emoji = "❌"
-                    else:
-                        status = f"CHASING • {games_back} GB"
-                        status_color = "#9e9e9e"
-                        emoji = "⚔️"
-                    
-                    # Single line format matching lane height exactly (50px)
-                    data_html += f"""
-                        <div style="height: 50px; display: flex; align-items: center; text-align: left; padding: 0 12px; background: rgba(0,0,0,0.2); border-radius: 8px; border-left: 3px solid {status_color};">
-                            <div style="font-size: 0.85rem; line-height: 1.2;">
-                                <div style="font-weight: 600; color: white;">{emoji} {team['name']}</div>
-                                <div style="font-size: 0.75rem; opacity: 0.8; color: white;">{record} ({win_pct}){magic_text} • <span style="color: {status_color};">{status}</span></div>
-                            </div>
-                        </div>
-                    """
-                
-                data_html += "</div>"
-                st.html(data_html)
+            show_division(division_name, "American League", divisions_AL)
 
 # National League (Right Side)
 with col2:
@@ -678,172 +234,25 @@ with col2:
     division_order = ['National League East', 'National League Central', 'National League West']
     for division_name in division_order:
         if division_name in divisions_NL:
-            teams_in_div = divisions_NL[division_name]
-            st.markdown(f"<h3 style='color: #ffd93d; text-align: center; margin-bottom: 20px; font-size: 1.3rem;'>{division_name}</h3>", unsafe_allow_html=True)
-            
-            # Create sub-columns within NL: lanes take 2/3, data takes 1/3
-            lane_col, data_col = st.columns([2, 1])
-            
-            with lane_col:
-                # Build HTML for racing lanes only
-                lanes_html = """
-                <div style="display: flex; flex-direction: column; gap: 8px;">
-                """
-                
-                # Create a lane for each team
-                for rank in sorted(teams_in_div.keys()):
-                    team_info = teams_in_div[rank]
-                    team = team_info['team']
-                    standings = team_info['standings']
-                    
-                    # Calculate position based on distance_from_clinched_division
-                    distance = team.get('distance_from_clinched_division', 80)
-                    max_distance = 163
-                    position_percent = ((max_distance - distance) / max_distance) * 85  # Max 85% to leave room for finish zone
-                    
-                    # Check if team has clinched division (magic number 0 or less)
-                    magic_number = team.get('magic_number_win_division', None)
-                    has_clinched = magic_number is not None and magic_number <= 0
-                    
-                    # If clinched, move them past the finish line
-                    if has_clinched:
-                        position_percent = 92  # Place them clearly past the finish line
-                    
-                    # Determine team circle style based on status
-                    if has_clinched and int(standings['div_rank']) == 1:
-                        bg_color = "linear-gradient(135deg, rgba(76,175,80,0.9), rgba(102,187,106,0.9))"
-                        border_color = "#4caf50"
-                        text_color = "white"
-                    elif int(standings['div_rank']) == 1:
-                        bg_color = "linear-gradient(135deg, rgba(255,217,61,0.9), rgba(255,237,78,0.9))"
-                        border_color = "#ffd93d"
-                        text_color = "#333"
-                    elif standings.get('wc_rank', 99) != '-' and int(standings.get('wc_rank', 99)) <= 3:
-                        bg_color = "linear-gradient(135deg, rgba(77,150,255,0.9), rgba(103,181,255,0.9))"
-                        border_color = "#4d96ff"
-                        text_color = "white"
-                    elif team_info['standings'].get('elim_num') == 'E':
-                        bg_color = "linear-gradient(135deg, rgba(66,66,66,0.8), rgba(97,97,97,0.8))"
-                        border_color = "#666"
-                        text_color = "#ccc"
-                    else:
-                        bg_color = "linear-gradient(135deg, rgba(158,158,158,0.8), rgba(189,189,189,0.8))"
-                        border_color = "#9e9e9e"
-                        text_color = "#333"
-                    
-                    # Use abbreviation unless eliminated
-                    team_display = team['abbreviation']
-                    
-                    lanes_html += f"""
-                        <!-- Lane for {team['abbreviation']} -->
-                        <div style="position: relative; height: 50px; background: linear-gradient(90deg, rgba(220,53,69,0.15) 0%, rgba(255,193,7,0.15) 35%, rgba(40,167,69,0.15) 85%, rgba(40,167,69,0.2) 100%); border-radius: 25px; border: 1px solid rgba(255,255,255,0.15); overflow: hidden;">
-                            
-                            <!-- Track markers -->
-                            <div style="position: absolute; top: 30%; bottom: 30%; left: 5%; right: 8%; border-top: 1px dashed rgba(255,255,255,0.3); border-bottom: 1px dashed rgba(255,255,255,0.3);"></div>
-                            
-                            <!-- Finish line -->
-                            <div style="position: absolute; right: 8%; top: 8%; bottom: 8%; width: 3px; background: linear-gradient(180deg, #28a745, #40e95e); border-radius: 1px; box-shadow: 0 0 4px rgba(40,167,69,0.4);"></div>
-                            
-                            <!-- Team car -->
-                            <div style="position: absolute; top: 50%; transform: translateY(-50%); left: {position_percent}%; width: 34px; height: 34px; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: 700; font-size: 8px; color: {text_color}; background: {bg_color}; border: 2px solid {border_color}; transition: all 0.3s ease; z-index: 10; {'box-shadow: 0 0 10px rgba(40,167,69,0.6);' if has_clinched else ''}">
-                                {team_display}
-                            </div>
-                        </div>
-                    """
-                
-                lanes_html += "</div>"
-                st.html(lanes_html)
-            
-            with data_col:
-                # Build HTML for team data only - single line format to match lane height exactly
-                data_html = '<div style="display: flex; flex-direction: column; gap: 8px;">'
-                
-                for rank in sorted(teams_in_div.keys()):
-                    team_info = teams_in_div[rank]
-                    team = team_info['team']
-                    standings = team_info['standings']
-                    
-                    record = f"{team_info['wins']}-{team_info['losses']}"
-                    games_back = team_info['standings']['gb'] if team_info['standings']['gb'] != '-' else "LEAD"
-                    win_pct = f"{team_info['wins']/(team_info['wins'] + team_info['losses']):.3f}"
-                    
-                    # Magic number logic - only show if not clinched and is division leader
-                    magic_number = team.get('magic_number_win_division', None)
-                    has_clinched = magic_number is not None and magic_number <= 0
-                    magic_text = ""
-                    if not has_clinched and magic_number is not None and int(standings['div_rank']) == 1:
-                        magic_text = f" • Magic #: {magic_number}"
-                    
-                    # Status text and color
-                    if has_clinched and int(standings['div_rank']) == 1:
-                        status = "CLINCHED DIVISION"
-                        status_color = "#4caf50"
-                        emoji = "🏆"
-                    elif int(standings['div_rank']) == 1:
-                        status = "LEADING"
-                        status_color = "#ffd93d"
-                        emoji = "🥇"
-                    elif standings.get('wc_rank', 99) != '-' and int(standings.get('wc_rank', 99)) <= 3:
-                        status = f"PLAYOFFS • {games_back} GB"
-                        status_color = "#4d96ff"
-                        emoji = "🎯"
-                    elif team_info['standings'].get('elim_num') == 'E':
-                        status = "ELIMINATED"
-                        status_color = "#666"
-                        emoji = "❌"
-                    else:
-                        status = f"CHASING • {games_back} GB"
-                        status_color = "#9e9e9e"
-                        emoji = "⚔️"
-                    
-                    # Single line format matching lane height exactly (50px)
-                    data_html += f"""
-                        <div style="height: 50px; display: flex; align-items: center; text-align: left; padding: 0 12px; background: rgba(0,0,0,0.2); border-radius: 8px; border-left: 3px solid {status_color};">
-                            <div style="font-size: 0.85rem; line-height: 1.2;">
-                                <div style="font-weight: 600; color: white;">{emoji} {team['name']}</div>
-                                <div style="font-size: 0.75rem; opacity: 0.8; color: white">{record} ({win_pct}){magic_text} • <span style="color: {status_color};">{status}</span></div>
-                            </div>
-                        </div>
-                    """
-                
-                data_html += "</div>"
-                st.html(data_html)
-
-footer_html = """
-<div style="position: fixed; bottom: 0; left: 0; width: 100%; background: rgba(30,30,40,0.95); padding: 10px; z-index: 999; border-top: 1px solid rgba(255,217,61,0.3); backdrop-filter: blur(5px);">
-    <div style="display: flex; justify-content: center; flex-wrap: wrap; gap: 15px; align-items: center;">
-        <span style="color: #ffd93d; font-size: 0.85rem; font-weight: bold;">Legend:</span>
-        <div style="display: flex; align-items: center; gap: 5px;">
-            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(66,66,66,0.8), rgba(97,97,97,0.8)); border: 2px solid #666;"></div>
-            <span style="color: white; font-size: 0.8rem;">Eliminated</span>
-        </div>
-        <div style="display: flex; align-items: center; gap: 5px;">
-            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(158,158,158,0.8), rgba(189,189,189,0.8)); border: 2px solid #9e9e9e;"></div>
-            <span style="color: white; font-size: 0.8rem;">Chasing</span>
-        </div>
-        <div style="display: flex; align-items: center; gap: 5px;">
-            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(77,150,255,0.9), rgba(103,181,255,0.9)); border: 2px solid #4d96ff;"></div>
-            <span style="color: white; font-size: 0.8rem;">Wild Card</span>
-        </div>
-        <div style="display: flex; align-items: center; gap: 5px;">
-            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(255,217,61,0.9), rgba(255,237,78,0.9)); border: 2px solid #ffd93d;"></div>
-            <span style="color: white; font-size: 0.8rem;">Division Leader</span>
-        </div>
-        <div style="display: flex; align-items: center; gap: 5px;">
-            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(76,175,80,0.9), rgba(102,187,106,0.9)); border: 2px solid #4caf50;"></div>
-            <span style="color: white; font-size: 0.8rem;">Clinched</span>
-        </div>
-        <div style="display: flex; align-items: center; gap: 5px;">
-            <div style="width: 3px; height: 16px; background: linear-gradient(180deg, #28a745, #40e95e); border-radius: 1px;"></div>
-            <span style="color: white; font-size: 0.8rem;">Clinch Line</span>
-        </div>
-    </div>
-</div>
-"""
-
-st.html(footer_html)
-
-endtime = time.time() - totaltime
-print(f"Total time to run the whole program {endtime:.3f} seconds")
-
-# Try all the api calls if those dont work then pull data from database (Priority 3)
+            show_division(division_name, "National League", divisions_NL)
+
+st.html(FOOTER_HTML)
+
+metrics.registry.record_value('page.first_paint', page_build.elapsed())
+
+fresh_snapshot = snapshot
+if refresh_done is not None:
+    with metrics.span('page.refresh') as span:
+        # On timeout the reload keeps going in the background for the next view
+        timed_out = not refresh_done.wait(DB_DEADLINE_SECONDS)
+        if timed_out:
+            span.count('timeouts')
+        fresh_snapshot = snapshot_store.peek()
+    show_status(snapshot, timed_out)
+
+page_build.finish()
+metrics.registry.export('page')
+
+# Newer standings than the ones on screen: draw the page again with them
+if fresh_snapshot.version != snapshot.version:
+    st.rerun()
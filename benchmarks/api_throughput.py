@@ -0,0 +1,112 @@
+import argparse
+import contextlib
+import http.client
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api
+import pipeline
+
+from offline import offline_statsapi
+from response_cache import ResponseCache
+
+
+# Requests per second from the JSON standings API (api.py)
+#
+# The server runs in its own process on an offline snapshot; --clients
+# processes each hold one keep-alive connection and send requests back to back
+# for --seconds. Run once plain, once with gzip, and once revalidating with
+# If-None-Match (304s).
+#
+# Usage: python benchmarks/api_throughput.py [--clients 4] [--seconds 5] [--path /standings]
+
+
+def build_rows():
+    pipeline.response_cache = ResponseCache(tempfile.mkdtemp())
+    pipeline.schedule_dir = tempfile.mkdtemp()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+        return pipeline.compute_snapshot(teams, remaining)
+
+
+def run_server(port, rows):
+    server = api.serve('127.0.0.1', port, lambda: (rows, time.time()), snapshot_path=None)
+    server.serve_forever()
+
+
+def run_client(port, path, headers, seconds, results):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    requests = 0
+    status = None
+    end_time = time.perf_counter() + seconds
+    while time.perf_counter() < end_time:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        status = response.status
+        requests += 1
+    results.put((requests, status))
+
+
+def first_response(port, path, headers):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    connection.request('GET', path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def measure(port, path, headers, clients, seconds):
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=run_client, args=(port, path, headers, seconds, results)) for _ in range(clients)]
+    for worker in workers:
+        worker.start()
+    counts = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return sum(requests for requests, _ in counts) / seconds, {status for _, status in counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON standings API throughput")
+    parser.add_argument('--clients', type=int, default=4, help="Client processes, one keep-alive connection each")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--path', default='/standings')
+    parser.add_argument('--port', type=int, default=8651)
+    args = parser.parse_args()
+
+    server = multiprocessing.Process(target=run_server, args=(args.port, build_rows()), daemon=True)
+    server.start()
+    try:
+        for _ in range(50):
+            try:
+                response, body = first_response(args.port, args.path, {})
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.1)
+        else:
+            sys.exit("Server didn't start")
+
+        gzip_response, gzip_body = first_response(args.port, args.path, {'Accept-Encoding': 'gzip'})
+        print(f"{args.path}: {len(body)} bytes, {len(gzip_body)} gzipped, ETag {response.getheader('ETag')}")
+
+        runs = [
+            ("plain", {}),
+            ("gzip", {'Accept-Encoding': 'gzip'}),
+            ("If-None-Match", {'Accept-Encoding': 'gzip', 'If-None-Match': gzip_response.getheader('ETag')})
+        ]
+        for name, headers in runs:
+            rps, statuses = measure(args.port, args.path, headers, args.clients, args.seconds)
+            print(f"{name:<14} {rps:8.0f} requests/s  (status {', '.join(map(str, sorted(statuses)))})")
+    finally:
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
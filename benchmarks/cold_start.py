@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# Cold start benchmark: import time of the page's modules and time to first
+# paint, each measured in a fresh interpreter so nothing is already imported.
+#
+# First paint is the page.first_paint metric (script start to all six
+# divisions drawn). It is measured with and without a local snapshot file;
+# the database is FakeSupabase with --db-latency added to every request.
+#
+# Usage:
+#   python benchmarks/cold_start.py
+#   python benchmarks/cold_start.py --repeat 5 --db-latency 0.3 --json
+
+EAGER_MODULES = ['streamlit', 'metrics', 'render', 'snapshot']
+DEFERRED_MODULES = ['dotenv', 'supabase']
+
+IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+# Runs app.py once in AppTest. The supabase module is swapped for one whose
+# create_client still pays for the real import, then hands back FakeSupabase.
+PAGE_PROBE = """
+import importlib, json, sys, time, types
+sys.path.insert(0, {root!r})
+
+from offline import FakeSupabase
+
+fake = FakeSupabase(latency={db_latency!r})
+fake.seed_table('teams', json.load(open({rows_path!r})))
+
+def create_client(url, key):
+    sys.modules.pop('supabase')
+    importlib.import_module('supabase')
+    return fake
+
+stand_in = types.ModuleType('supabase')
+stand_in.create_client = create_client
+sys.modules['supabase'] = stand_in
+
+from streamlit.testing.v1 import AppTest
+
+app = AppTest.from_file({app_path!r}, default_timeout=60)
+app.run()
+
+import metrics
+stages = metrics.registry.summary()
+print(json.dumps({{name: stages[name]['last_seconds'] for name in ('page.first_paint', 'page.build') if name in stages}}))
+"""
+
+
+def run_python(code, env=None):
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def measure_imports(repeat):
+    timings = {}
+    for module in EAGER_MODULES + DEFERRED_MODULES:
+        samples = [float(run_python(IMPORT_PROBE.format(root=ROOT, module=module))) * 1000 for _ in range(repeat)]
+        timings[module] = statistics.median(samples)
+    return timings
+
+
+def measure_first_paint(repeat, db_latency, with_snapshot_file, rows_path):
+    first_paint = []
+    page_build = []
+    for _ in range(repeat):
+        work_dir = tempfile.mkdtemp()
+        snapshot_path = os.path.join(work_dir, 'snapshot.json')
+        if with_snapshot_file:
+            from snapshot import StandingsSnapshot, save_snapshot_file
+            with open(rows_path) as f:
+                save_snapshot_file(StandingsSnapshot(json.load(f)), snapshot_path)
+
+        env = {**os.environ, 'SNAPSHOT_PATH': snapshot_path, 'METRICS_DIR': os.path.join(work_dir, 'metrics')}
+        code = PAGE_PROBE.format(root=ROOT, db_latency=db_latency, rows_path=rows_path, app_path=os.path.join(ROOT, 'app.py'))
+        result = json.loads(run_python(code, env))
+        first_paint.append(result['page.first_paint'] * 1000)
+        page_build.append(result['page.build'] * 1000)
+
+    return {'first_paint_ms': statistics.median(first_paint), 'page_build_ms': statistics.median(page_build)}
+
+
+def build_rows(rows_path):
+    import contextlib
+    import pipeline
+
+    from offline import offline_statsapi
+    from response_cache import ResponseCache
+
+    # Empty response cache so the fixtures are always what gets read
+    pipeline.response_cache = ResponseCache(tempfile.mkdtemp())
+    pipeline.schedule_dir = tempfile.mkdtemp()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), offline_statsapi():
+        rows = pipeline.compute_snapshot(*pipeline.fetch_all())
+    with open(rows_path, 'w') as f:
+        json.dump(rows, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time and time to first paint (offline)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--db-latency', type=float, default=0.2, help="Seconds added to every FakeSupabase request")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    rows_path = os.path.join(tempfile.mkdtemp(), 'rows.json')
+    build_rows(rows_path)
+
+    results = {
+        'imports_ms': measure_imports(args.repeat),
+        'no_snapshot_file': measure_first_paint(args.repeat, args.db_latency, False, rows_path),
+        'snapshot_file': measure_first_paint(args.repeat, args.db_latency, True, rows_path)
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("Import time (median ms, fresh interpreter)")
+    for module, timing in results['imports_ms'].items():
+        when = 'deferred' if module in DEFERRED_MODULES else 'eager'
+        print(f"  {module:<12}{when:<10}{timing:>8.1f}")
+
+    print(f"\nCold page run, {args.db_latency:.2f}s database latency (median ms)")
+    print(f"  {'':<20}{'first paint':>12}{'page build':>12}")
+    for case in ('no_snapshot_file', 'snapshot_file'):
+        timing = results[case]
+        print(f"  {case:<20}{timing['first_paint_ms']:>12.1f}{timing['page_build_ms']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
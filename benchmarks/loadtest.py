@@ -0,0 +1,244 @@
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Keep the page's snapshot file and metrics away from the real .cache
+_scratch = tempfile.mkdtemp()
+os.environ['SNAPSHOT_PATH'] = os.path.join(_scratch, 'snapshot.json')
+os.environ['METRICS_DIR'] = os.path.join(_scratch, 'metrics')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics
+import pipeline
+
+from offline import FakeSupabase, offline_statsapi
+from response_cache import ResponseCache
+
+
+# Concurrent-session load test for the Streamlit page
+#
+# Drives N simulated sessions at once, each an AppTest running app.py
+# in this process. Like real sessions on one server process, they share the
+# cache_resource objects (snapshot store, fragment cache, live poller).
+# The MLB API and Supabase are the offline stand-ins, with optional latency.
+# Each session renders the page --reruns times.
+#
+# Reports throughput, p50/p95/p99 time-to-render (one AppTest.run() as seen
+# by the session), peak RSS growth per session, fragment cache hit ratio and
+# database requests per render. --json writes the same numbers, tagged with
+# the git commit, for comparing runs.
+#
+# Usage:
+#   python benchmarks/loadtest.py --sessions 20 --reruns 5
+#   python benchmarks/loadtest.py --sessions 50 --db-latency 0.05 --live --json loadtest.json
+#
+# Sessions are threads in one process, so this measures what one web process
+# (one Render instance) can serve, GIL included.
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP_PATH)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def build_rows():
+    pipeline.response_cache = ResponseCache(tempfile.mkdtemp())
+    pipeline.schedule_dir = tempfile.mkdtemp()
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+        return pipeline.compute_snapshot(teams, remaining)
+
+
+# AppTest installs a mock Runtime singleton and turns on the global.appTest
+# config option for each run, and undoes both when the run ends, so sessions
+# running at the same time would undo each other's. Here every session uses
+# one mock runtime, as sessions on a real server share one Runtime, the option
+# stays on for the whole load test, and AppTest's per-run set/undo goes to
+# stand-ins.
+@contextlib.contextmanager
+def shared_test_runtime():
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1.util import patch_config_options
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.testing.v1 import app_test
+
+    class PerRunRuntime:
+        _instance = None
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    app_test.Runtime = PerRunRuntime
+    app_test.patch_config_options = lambda options: contextlib.nullcontext()
+    try:
+        with patch_config_options({"global.appTest": True}):
+            yield
+    finally:
+        app_test.patch_config_options = patch_config_options
+        app_test.Runtime = Runtime
+        Runtime._instance = None
+
+
+def fragment_counters():
+    counters = metrics.registry.counters
+    return counters.get(('page.render_division', 'cache_hits'), 0), counters.get(('page.render_division', 'cache_misses'), 0)
+
+
+# One simulated viewer: opens the page, optionally switches live mode on, reruns
+def run_session(reruns, live, think_time, start_barrier, timings, errors):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    start_barrier.wait()
+    for rerun in range(reruns):
+        start_time = time.perf_counter()
+        try:
+            if rerun == 0:
+                app.run()
+            elif rerun == 1 and live:
+                app.sidebar.toggle[0].set_value(True).run()
+            else:
+                app.run()
+        except Exception as e:
+            errors.append(repr(e))
+            continue
+        timings.append((time.perf_counter() - start_time) * 1000)
+        if app.exception:
+            errors.append(str(app.exception[0].message))
+        if think_time:
+            time.sleep(think_time)
+
+
+def run_load(sessions, reruns, db_latency, mlb_latency, live, think_time):
+    import supabase
+
+    rows = build_rows()
+    fake = FakeSupabase(latency=db_latency)
+    fake.seed_table('teams', rows)
+    fake.seed_table('ingest_status', [{'id': 1, 'last_success_at': '2099-01-01T00:00:00+00:00'}], key='id')
+    supabase.create_client = lambda url, key: fake
+
+    with contextlib.ExitStack() as stack:
+        api = stack.enter_context(offline_statsapi(latency=mlb_latency))
+        from streamlit.testing.v1 import AppTest
+
+        # Cold start: first script run in the process, nothing cached yet
+        start_time = time.perf_counter()
+        AppTest.from_file(APP_PATH, default_timeout=120).run()
+        cold_start_ms = (time.perf_counter() - start_time) * 1000
+
+        hits_before, misses_before = fragment_counters()
+        requests_before = len(fake.requests)
+        rss_before = peak_rss_kb()
+
+        timings, errors = [], []
+        stack.enter_context(shared_test_runtime())
+        start_barrier = threading.Barrier(sessions + 1)
+        threads = [
+            threading.Thread(target=run_session, args=(reruns, live, think_time, start_barrier, timings, errors))
+            for _ in range(sessions)
+        ]
+        for thread in threads:
+            thread.start()
+        start_barrier.wait()
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        wall_seconds = time.perf_counter() - start_time
+
+        hits, misses = fragment_counters()
+        mlb_calls = api.calls
+
+    hits, misses = hits - hits_before, misses - misses_before
+    timings.sort()
+    return {
+        'commit': git_commit(),
+        'sessions': sessions,
+        'reruns': reruns,
+        'db_latency_seconds': db_latency,
+        'mlb_latency_seconds': mlb_latency,
+        'live': live,
+        'cold_start_ms': cold_start_ms,
+        'renders': len(timings),
+        'errors': len(errors),
+        'error_samples': errors[:5],
+        'wall_seconds': wall_seconds,
+        'throughput_renders_per_second': len(timings) / wall_seconds if wall_seconds else None,
+        'render_ms': {
+            'p50': percentile(timings, 0.50),
+            'p95': percentile(timings, 0.95),
+            'p99': percentile(timings, 0.99),
+            'max': timings[-1] if timings else None
+        },
+        'rss_growth_per_session_kb': (peak_rss_kb() - rss_before) / sessions,
+        'fragment_cache_hit_ratio': hits / (hits + misses) if hits + misses else None,
+        'db_requests': len(fake.requests) - requests_before,
+        'db_requests_per_render': (len(fake.requests) - requests_before) / len(timings) if timings else None,
+        'mlb_calls': mlb_calls
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for app.py (offline)")
+    parser.add_argument('--sessions', type=int, default=10, help="Simulated viewers at once")
+    parser.add_argument('--reruns', type=int, default=5, help="Page renders per session")
+    parser.add_argument('--db-latency', type=float, default=0.0, help="Seconds added to every FakeSupabase request")
+    parser.add_argument('--mlb-latency', type=float, default=0.0, help="Seconds added to every offline MLB API call")
+    parser.add_argument('--live', action='store_true', help="Switch live scores on in every session")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Seconds between a session's renders")
+    parser.add_argument('--json', metavar='PATH', help="Also write the results as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    # The page and pipeline print progress lines, keep the report readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results = run_load(args.sessions, args.reruns, args.db_latency, args.mlb_latency, args.live, args.think_time)
+
+    if args.json == '-':
+        print(json.dumps(results, indent=2))
+        return
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    render_ms = results['render_ms']
+    hit_ratio = results['fragment_cache_hit_ratio']
+    print(f"{results['sessions']} sessions x {results['reruns']} renders, {results['renders']} ok, {results['errors']} errors")
+    print(f"throughput      {results['throughput_renders_per_second']:.1f} renders/s over {results['wall_seconds']:.1f} s")
+    print(f"render ms       p50 {render_ms['p50']:.0f}  p95 {render_ms['p95']:.0f}  p99 {render_ms['p99']:.0f}  max {render_ms['max']:.0f}")
+    print(f"cold start ms   {results['cold_start_ms']:.0f}")
+    print(f"memory          {results['rss_growth_per_session_kb']:.0f} KB peak RSS growth per session")
+    print(f"fragment cache  {hit_ratio:.1%} hits" if hit_ratio is not None else "fragment cache  no renders")
+    print(f"database        {results['db_requests']} requests, {results['db_requests_per_render']:.2f} per render")
+    print(f"MLB API         {results['mlb_calls']} calls")
+
+
+if __name__ == '__main__':
+    main()
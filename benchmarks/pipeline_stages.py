@@ -0,0 +1,221 @@
+import argparse
+import contextlib
+import copy
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+
+from clinch import clinch_scenarios
+from elimination import EliminationEngine
+from local_store import LocalStore
+from offline import FakeSupabase, offline_statsapi
+from records import build_team_records, project_standings_response, project_teams_response, split_by_league
+from render import build_data_html, build_lanes_html
+from standings import compute_league
+from response_cache import ResponseCache
+from schedule import SeasonSchedule
+from snapshot import StandingsSnapshot, read_standings
+from write_behind import WriteBehindQueue
+
+
+# End-to-end pipeline benchmark against the offline fixtures and FakeSupabase,
+# nothing here touches the MLB API or the real database.
+#
+# Usage:
+#   python benchmarks/pipeline_stages.py
+#   python benchmarks/pipeline_stages.py --repeat 50 --db-latency 0.05 --json
+#   python benchmarks/pipeline_stages.py --check   # exit 1 if a stage is over budget
+#
+# The same stages run under pytest (tests/test_benchmarks.py) against
+# STAGE_BUDGETS_MS.
+
+# Median budget per stage with no added latency, about ten times a typical
+# run, so only a real regression goes over
+STAGE_BUDGETS_MS = {
+    'parse': 5,
+    'schedule_index': 10,
+    'schedule_update': 2,
+    'standings': 5,
+    'elimination': 2000,
+    'clinch_scenarios': 250,
+    'compute_snapshot': 250,
+    'render': 10,
+    'persist_all_rows': 25,
+    'persist_unchanged': 15,
+    'persist_queued': 15,
+    'read_local': 2,
+    'full_page': 5000
+}
+
+
+# Runs fn repeat times and returns timings in milliseconds
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return {
+        'min_ms': min(timings),
+        'median_ms': statistics.median(timings),
+        'max_ms': max(timings)
+    }
+
+
+# {stage: median_ms} for every stage slower than its budget
+def over_budget(results, budgets=STAGE_BUDGETS_MS):
+    return {
+        name: timing['median_ms']
+        for name, timing in results.items()
+        if name in budgets and timing['median_ms'] > budgets[name]
+    }
+
+
+def run_stages(repeat, db_latency, full_page=True):
+    # Empty response cache so the fixtures are always what gets read
+    pipeline.response_cache = ResponseCache(tempfile.mkdtemp())
+    pipeline.schedule_dir = tempfile.mkdtemp()
+    with offline_statsapi() as api:
+        all_teams, remaining = pipeline.fetch_all()
+        raw_teams = api.teams
+        raw_standings = api.standings
+        raw_schedule = api.games
+
+    leagues = list(split_by_league(all_teams).values())
+    rows = pipeline.compute_snapshot(all_teams, remaining)
+    snapshot = StandingsSnapshot(rows)
+
+    def parse():
+        build_team_records(project_teams_response(raw_teams), project_standings_response(raw_standings))
+
+    # Indexing the whole schedule (first run of a season) vs. taking one game
+    # day's finals off a copy of the index (every later run)
+    first_day = [dict(game, status='Final') for game in raw_schedule if game['game_date'] == remaining.next_day]
+
+    def schedule_index():
+        SeasonSchedule.build(pipeline.SEASON, raw_schedule)
+
+    def schedule_update():
+        index = copy.copy(remaining.index)
+        index.remaining = index.remaining.copy()
+        index.home_remaining = index.home_remaining.copy()
+        index.away_remaining = index.away_remaining.copy()
+        index.played = set(index.played)
+        index.update(first_day)
+
+    # Seeding, magic/tragic numbers and distances, one pass per league
+    def standings():
+        for teams in leagues:
+            compute_league(teams)
+
+    def elimination():
+        # Fresh engine so every run evaluates both leagues
+        EliminationEngine().update(pipeline.build_leagues(all_teams), remaining)
+
+    # Every outcome of the next game day's games, both leagues
+    def clinch():
+        clinch_scenarios(all_teams, remaining.next_games)
+
+    def render():
+        for league_divisions in (snapshot.divisions_AL, snapshot.divisions_NL):
+            for teams_in_div in league_divisions.values():
+                build_lanes_html(teams_in_div)
+                build_data_html(teams_in_div)
+
+    hashes_dir = tempfile.mkdtemp()
+    pipeline.ROW_HASHES_PATH = os.path.join(hashes_dir, 'row_hashes.json')
+    supabase = FakeSupabase(latency=db_latency)
+
+    def persist_all_rows():
+        pipeline.persist_snapshot(supabase, rows, full=True)
+
+    def persist_unchanged():
+        pipeline.persist_snapshot(supabase, rows)
+
+    # What the worker waits on with the write-behind queue: hashing and queueing
+    writer = WriteBehindQueue(supabase, on_written=pipeline.remember_written)
+
+    def persist_queued():
+        pipeline.persist_snapshot(supabase, rows, full=True, writer=writer)
+
+    # The page's and API's read when the worker keeps a local copy
+    store = LocalStore(':memory:')
+    store.table('teams').upsert(rows, on_conflict='team_id').execute()
+
+    def read_local():
+        read_standings(store)
+
+    stages = {
+        'parse': parse,
+        'schedule_index': schedule_index,
+        'schedule_update': schedule_update,
+        'standings': standings,
+        'elimination': elimination,
+        'clinch_scenarios': clinch,
+        'compute_snapshot': lambda: pipeline.compute_snapshot(all_teams, remaining),
+        'render': render,
+        'persist_all_rows': persist_all_rows,
+        'persist_unchanged': persist_unchanged,
+        'persist_queued': persist_queued,
+        'read_local': read_local
+    }
+
+    results = {name: measure(fn, repeat) for name, fn in stages.items()}
+    writer.close()
+    if full_page:
+        results['full_page'] = measure_full_page(rows, max(1, repeat // 10), db_latency)
+    return results
+
+
+# Whole Streamlit script run (AppTest) reading the rows from FakeSupabase
+def measure_full_page(rows, repeat, db_latency):
+    import supabase
+    from streamlit.testing.v1 import AppTest
+
+    fake = FakeSupabase(latency=db_latency)
+    fake.seed_table('teams', rows)
+    supabase.create_client = lambda url, key: fake
+
+    app_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+    def run_page():
+        AppTest.from_file(app_path, default_timeout=60).run()
+
+    return measure(run_page, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline stage benchmarks (offline)")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--db-latency', type=float, default=0.0, help="Seconds added to every FakeSupabase request")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if a stage's median is over its budget")
+    args = parser.parse_args()
+
+    # The pipeline and page print progress lines, keep the benchmark output readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        results = run_stages(args.repeat, args.db_latency)
+
+    slow = over_budget(results)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'stage':<20}{'min ms':>10}{'median ms':>12}{'max ms':>10}{'budget ms':>12}")
+        for name, timing in results.items():
+            flag = "  over budget" if name in slow else ""
+            print(f"{name:<20}{timing['min_ms']:>10.3f}{timing['median_ms']:>12.3f}{timing['max_ms']:>10.3f}"
+                  f"{STAGE_BUDGETS_MS.get(name, 0):>12}{flag}")
+
+    if args.check and slow:
+        sys.exit(f"Over budget: {', '.join(slow)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+import contextlib
+import gzip
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+
+from offline import offline_statsapi
+from pipeline import compute_snapshot, fetch_all
+from response_cache import ResponseCache
+from render import FOOTER_HTML, STYLESHEET_HTML, build_data_html, build_lanes_html
+
+
+# Page payload benchmark: bytes of HTML sent for one full page render,
+# the old inline-style markup (before) vs shared stylesheet + status classes (after).
+#
+# Usage: python benchmarks/render_payload.py
+
+
+# Divisions from the offline fixtures, grouped the way the page groups them
+def sample_divisions():
+    # Empty response cache so the fixtures are always what gets read
+    pipeline.response_cache = ResponseCache(tempfile.mkdtemp())
+    pipeline.schedule_dir = tempfile.mkdtemp()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), offline_statsapi():
+        teams, remaining = fetch_all()
+        rows = compute_snapshot(teams, remaining)
+
+    divisions = {}
+    for row in rows:
+        divisions.setdefault(row['division'], {})[row['division_rank']] = row
+    return divisions
+
+
+# ---- Markup before the shared stylesheet (kept here only for comparison) ----
+
+def legacy_lanes_html(teams_in_div):
+    # Build HTML for racing lanes only
+    lanes_html = """
+    <div style="display: flex; flex-direction: column; gap: 8px;">
+    """
+
+    # Create a lane for each team
+    for rank in sorted(teams_in_div.keys()):
+        team = teams_in_div[rank]
+
+        # Calculate position based on distance_from_clinched_division
+        distance = team.get('distance_from_clinched_division')
+        if distance is None:
+            distance = 80
+        max_distance = 163
+        position_percent = ((max_distance - distance) / max_distance) * 85  # Max 85% to leave room for finish zone
+
+        # Check if team has clinched division (magic number 0 or less)
+        magic_number = team.get('magic_number_division')
+        has_clinched = magic_number is not None and magic_number <= 0
+
+        # If clinched, move them past the finish line
+        if has_clinched:
+            position_percent = 92  # Place them clearly past the finish line
+
+        # Determine team circle style based on status - add transparency
+        if has_clinched and team['division_rank'] == 1:
+            bg_color = "linear-gradient(135deg, rgba(76,175,80,0.9), rgba(102,187,106,0.9))"
+            border_color = "#4caf50"
+            text_color = "white"
+        elif team['division_rank'] == 1:
+            bg_color = "linear-gradient(135deg, rgba(255,217,61,0.9), rgba(255,237,78,0.9))"
+            border_color = "#ffd93d"
+            text_color = "#333"
+        elif team['wild_card_rank'] is not None and team['wild_card_rank'] <= 3:
+            bg_color = "linear-gradient(135deg, rgba(77,150,255,0.9), rgba(103,181,255,0.9))"
+            border_color = "#4d96ff"
+            text_color = "white"
+        elif team['eliminated_from_division']:
+            bg_color = "linear-gradient(135deg, rgba(66,66,66,0.8), rgba(97,97,97,0.8))"
+            border_color = "#666"
+            text_color = "#ccc"
+        else:
+            bg_color = "linear-gradient(135deg, rgba(158,158,158,0.8), rgba(189,189,189,0.8))"
+            border_color = "#9e9e9e"
+            text_color = "#333"
+
+        # Use abbreviation unless eliminated
+        team_display = team['abbreviation']
+
+        lanes_html += f"""
+            <!-- Lane for {team['abbreviation']} -->
+            <div style="position: relative; height: 50px; background: linear-gradient(90deg, rgba(220,53,69,0.15) 0%, rgba(255,193,7,0.15) 35%, rgba(40,167,69,0.15) 85%, rgba(40,167,69,0.2) 100%); border-radius: 25px; border: 1px solid rgba(255,255,255,0.15); overflow: hidden;">
+
+                <!-- Track markers -->
+                <div style="position: absolute; top: 30%; bottom: 30%; left: 5%; right: 8%; border-top: 1px dashed rgba(255,255,255,0.3); border-bottom: 1px dashed rgba(255,255,255,0.3);"></div>
+
+                <!-- Finish line -->
+                <div style="position: absolute; right: 8%; top: 8%; bottom: 8%; width: 3px; background: linear-gradient(180deg, #28a745, #40e95e); border-radius: 1px; box-shadow: 0 0 4px rgba(40,167,69,0.4);"></div>
+
+                <!-- Team car -->
+                <div style="position: absolute; top: 50%; transform: translateY(-50%); left: {position_percent}%; width: 34px; height: 34px; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-weight: 700; font-size: 8px; color: {text_color}; background: {bg_color}; border: 2px solid {border_color}; transition: all 0.3s ease; z-index: 10; {'box-shadow: 0 0 10px rgba(40,167,69,0.6);' if has_clinched else ''}">
+                    {team_display}
+                </div>
+            </div>
+        """
+
+    lanes_html += "</div>"
+
+    return lanes_html
+
+
+def legacy_data_html(teams_in_div):
+    # Build HTML for team data only - single line format to match lane height exactly
+    data_html = '<div style="display: flex; flex-direction: column; gap: 8px;">'
+
+    for rank in sorted(teams_in_div.keys()):
+        team = teams_in_div[rank]
+
+        record = f"{team['wins']}-{team['losses']}"
+        games_back = f"{team['games_back_in_division']:.1f}" if team['games_back_in_division'] else "LEAD"
+        win_pct = f"{team['wins']/(team['wins'] + team['losses']):.3f}"
+
+        # Magic number logic - only show if not clinched and is division leader
+        magic_number = team.get('magic_number_division')
+        has_clinched = magic_number is not None and magic_number <= 0
+        magic_text = ""
+        if not has_clinched and magic_number is not None and team['division_rank'] == 1:
+            magic_text = f" • Magic #: {magic_number}"
+        elif team.get('magic_number_wild_card') is not None:
+            magic_text = f" • WC Magic #: {team['magic_number_wild_card']}"
+        elif team.get('tragic_number_wild_card'):
+            magic_text = f" • Elim #: {team['tragic_number_wild_card']}"
+
+        # Status text and color
+        if has_clinched and team['division_rank'] == 1:
+            status = "CLINCHED DIVISION"
+            status_color = "#4caf50"
+            emoji = "🏆"
+        elif team['division_rank'] == 1:
+            status = "LEADING"
+            status_color = "#ffd93d"
+            emoji = "🥇"
+        elif team['wild_card_rank'] is not None and team['wild_card_rank'] <= 3:
+            status = f"PLAYOFFS • {games_back} GB"
+            status_color = "#4d96ff"
+            emoji = "🎯"
+        elif team['eliminated_from_division']:
+            status = "ELIMINATED"
+            status_color = "#666"
+            emoji = "❌"
+        else:
+            status = f"CHASING • {games_back} GB"
+            status_color = "#9e9e9e"
+            emoji = "⚔️"
+
+        # Single line format matching lane height exactly (50px)
+        data_html += f"""
+            <div style="height: 50px; display: flex; align-items: center; text-align: left; padding: 0 12px; background: rgba(0,0,0,0.2); border-radius: 8px; border-left: 3px solid {status_color};">
+                <div style="font-size: 0.85rem; line-height: 1.2;">
+                    <div style="font-weight: 600; color: white;">{emoji} {team['team_name']}</div>
+                    <div style="font-size: 0.75rem; opacity: 0.8; color: white;">{record} ({win_pct}){magic_text} • <span style="color: {status_color};">{status}</span></div>
+                </div>
+            </div>
+        """
+
+    data_html += "</div>"
+
+    return data_html
+
+
+LEGACY_FOOTER_HTML = """
+<div style="position: fixed; bottom: 0; left: 0; width: 100%; background: rgba(30,30,40,0.95); padding: 10px; z-index: 999; border-top: 1px solid rgba(255,217,61,0.3); backdrop-filter: blur(5px);">
+    <div style="display: flex; justify-content: center; flex-wrap: wrap; gap: 15px; align-items: center;">
+        <span style="color: #ffd93d; font-size: 0.85rem; font-weight: bold;">Legend:</span>
+        <div style="display: flex; align-items: center; gap: 5px;">
+            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(66,66,66,0.8), rgba(97,97,97,0.8)); border: 2px solid #666;"></div>
+            <span style="color: white; font-size: 0.8rem;">Eliminated</span>
+        </div>
+        <div style="display: flex; align-items: center; gap: 5px;">
+            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(158,158,158,0.8), rgba(189,189,189,0.8)); border: 2px solid #9e9e9e;"></div>
+            <span style="color: white; font-size: 0.8rem;">Chasing</span>
+        </div>
+        <div style="display: flex; align-items: center; gap: 5px;">
+            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(77,150,255,0.9), rgba(103,181,255,0.9)); border: 2px solid #4d96ff;"></div>
+            <span style="color: white; font-size: 0.8rem;">Wild Card</span>
+        </div>
+        <div style="display: flex; align-items: center; gap: 5px;">
+            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(255,217,61,0.9), rgba(255,237,78,0.9)); border: 2px solid #ffd93d;"></div>
+            <span style="color: white; font-size: 0.8rem;">Division Leader</span>
+        </div>
+        <div style="display: flex; align-items: center; gap: 5px;">
+            <div style="width: 16px; height: 16px; border-radius: 50%; background: linear-gradient(135deg, rgba(76,175,80,0.9), rgba(102,187,106,0.9)); border: 2px solid #4caf50;"></div>
+            <span style="color: white; font-size: 0.8rem;">Clinched</span>
+        </div>
+        <div style="display: flex; align-items: center; gap: 5px;">
+            <div style="width: 3px; height: 16px; background: linear-gradient(180deg, #28a745, #40e95e); border-radius: 1px;"></div>
+            <span style="color: white; font-size: 0.8rem;">Clinch Line</span>
+        </div>
+    </div>
+</div>
+"""
+
+
+def page_payload(build_lanes, build_data, header, footer):
+    fragments = [header]
+    for teams_in_div in sample_divisions().values():
+        fragments.append(build_lanes(teams_in_div))
+        fragments.append(build_data(teams_in_div))
+    fragments.append(footer)
+    return ''.join(fragments).encode()
+
+
+def main():
+    before = page_payload(legacy_lanes_html, legacy_data_html, '', LEGACY_FOOTER_HTML)
+    after = page_payload(build_lanes_html, build_data_html, STYLESHEET_HTML, FOOTER_HTML)
+
+    print(f"{'':<8}{'raw bytes':>12}{'gzip bytes':>12}")
+    for name, payload in (('before', before), ('after', after)):
+        print(f"{name:<8}{len(payload):>12,}{len(gzip.compress(payload)):>12,}")
+    print(f"Full page render is {len(after) / len(before):.1%} of the previous size")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import copy
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from offline import OfflineStatsApi
+from records import build_team_records, project_standings_response, project_teams_response
+
+
+# Raw API responses vs the compact projection from records.py:
+# serialized size, deserialization time per cache hit (pickle, as st.cache_data
+# did, and JSON, as the disk response cache does) and memory held in Python.
+#
+# Usage: python benchmarks/team_records.py [--repeat 2000]
+
+
+def time_per_call(fn, repeat):
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start_time) / repeat * 1_000_000
+
+
+# Bytes allocated while building the object, i.e. what stays alive once cached
+def allocated_bytes(build):
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw API payload vs compact team records")
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    api = OfflineStatsApi()
+    raw = (api.teams, api.standings)
+    projection = (project_teams_response(api.teams), project_standings_response(api.standings))
+
+    cases = {'raw responses': raw, 'projection': projection}
+
+    print(f"{'':<16}{'pickle B':>10}{'json B':>10}{'unpickle us':>13}{'json load us':>14}{'memory B':>11}")
+    for name, payload in cases.items():
+        pickled = pickle.dumps(payload)
+        encoded = json.dumps(payload)
+        unpickle = time_per_call(lambda: pickle.loads(pickled), args.repeat)
+        json_load = time_per_call(lambda: json.loads(encoded), args.repeat)
+        memory = allocated_bytes(lambda: copy.deepcopy(payload))
+        print(f"{name:<16}{len(pickled):>10,}{len(encoded):>10,}{unpickle:>13.1f}{json_load:>14.1f}{memory:>11,}")
+
+    build = time_per_call(lambda: build_team_records(*projection), args.repeat)
+    records_memory = allocated_bytes(lambda: build_team_records(*projection))
+    print(f"\nBuilding 30 TeamRecords from the projection: {build:.1f} us, {records_memory:,} bytes")
+
+
+if __name__ == '__main__':
+    main()
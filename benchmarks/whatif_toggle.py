@@ -0,0 +1,72 @@
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+
+from offline import offline_statsapi
+from render import FragmentCache
+from response_cache import ResponseCache
+from scenarios import ScenarioEngine
+
+
+# Time per what-if toggle: recompute the picked scenario and get the HTML for
+# all six divisions, as the what-if view does. Target: under 10 ms per toggle.
+#
+# Usage: python benchmarks/whatif_toggle.py [--toggles 500] [--games 15]
+
+
+def percentile(timings, fraction):
+    return sorted(timings)[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if toggle latency")
+    parser.add_argument('--toggles', type=int, default=500)
+    parser.add_argument('--games', type=int, default=15, help="Games on the slate")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pipeline.response_cache = ResponseCache(tempfile.mkdtemp())
+    pipeline.schedule_dir = tempfile.mkdtemp()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+        rows = pipeline.compute_snapshot(teams, remaining)
+
+    # A slate of games between random pairs of teams
+    rng = random.Random(args.seed)
+    team_ids = [team.team_id for team in teams]
+    rng.shuffle(team_ids)
+    slate = [(team_ids[2 * i], team_ids[2 * i + 1]) for i in range(min(args.games, len(team_ids) // 2))]
+
+    engine = ScenarioEngine(rows)
+    fragment_cache = FragmentCache()
+    picks = {}
+    timings = []
+    for _ in range(args.toggles):
+        # Flip one game: unpicked -> one side -> the other side -> unpicked
+        game = rng.choice(slate)
+        state = picks.get(game)
+        picks[game] = {None: game, game: game[::-1]}.get(state)
+        outcomes = [pick for pick in picks.values() if pick is not None]
+
+        start_time = time.perf_counter()
+        for divisions in engine.evaluate(outcomes):
+            for teams_in_div in divisions.values():
+                fragment_cache.get(teams_in_div)
+        timings.append((time.perf_counter() - start_time) * 1000)
+
+    print(f"{args.toggles} toggles over {len(slate)} games")
+    print(f"median {statistics.median(timings):.2f} ms, p99 {percentile(timings, 0.99):.2f} ms, max {max(timings):.2f} ms")
+    print(f"scenario cache: {engine.hits} hits, {engine.misses} misses; fragment cache: {fragment_cache.hits} hits, {fragment_cache.misses} misses")
+
+
+if __name__ == '__main__':
+    main()
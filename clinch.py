@@ -0,0 +1,182 @@
+import itertools
+
+import numpy as np
+
+from elimination import WILD_CARD_SPOTS
+from records import split_by_league
+from standings import GAMES_PER_SEASON
+
+
+# "Clinches tonight if..." conditions
+#
+# Every combination of the next game day's results is enumerated at once:
+# outcome c is a bitmask over the n games (bit i set = home team wins game i),
+# so wins/losses for all 2^n outcomes are one (2^n, n) @ (n, teams) product.
+# Clinch and elimination are then evaluated for every outcome and team in
+# the same vectorized pass, using the same "can still reach" win bounds as
+# the magic numbers (a team's max wins = games in the season - losses):
+#
+# - clinches division:    more wins than any division rival's max
+# - eliminated, division: a rival already has more wins than the team's max
+# - clinches playoffs:    clinches division, or at most WILD_CARD_SPOTS other
+#                         teams can still reach the team's wins (then at most
+#                         WILD_CARD_SPOTS - 1 non-division-winners finish ahead)
+# - eliminated, playoffs: eliminated from the division and at least one team
+#                         per division plus WILD_CARD_SPOTS more are already
+#                         out of reach
+#
+# Ties count against the team, so every condition is sufficient. The exact
+# elimination engine (elimination.py) can still prove things earlier. Each
+# team's outcome mask is reduced to the games that matter to it and
+# summarized as a minimal OR of ANDs of game results.
+
+MAX_GAMES = 16        # 2^16 outcomes, a full slate is 15
+MAX_CONDITION_GAMES = 6   # more games than this are summarized as a share of outcomes
+
+EVENT_TEXT = {
+    'clinch_division': 'Clinches division',
+    'clinch_playoffs': 'Clinches playoffs',
+    'eliminated_playoffs': 'Eliminated',
+    'eliminated_division': 'Out of division race'
+}
+
+
+# (2^n, n) matrix of 0/1, row c = bits of outcome c
+def outcome_bits(num_games):
+    return ((np.arange(2 ** num_games)[:, None] >> np.arange(num_games)) & 1).astype(np.int16)
+
+
+# {event: (outcomes, teams) bool} for one league after each outcome of games
+def evaluate_outcomes(teams, games, games_per_season=GAMES_PER_SEASON):
+    index = {team.team_id: i for i, team in enumerate(teams)}
+    home = np.zeros((len(games), len(teams)), dtype=np.int16)
+    away = np.zeros((len(games), len(teams)), dtype=np.int16)
+    for game_index, (home_id, away_id) in enumerate(games):
+        if home_id in index:
+            home[game_index, index[home_id]] = 1
+        if away_id in index:
+            away[game_index, index[away_id]] = 1
+
+    bits = outcome_bits(len(games))
+    wins = np.array([team.w for team in teams], dtype=np.int16) + bits @ home + (1 - bits) @ away
+    losses = np.array([team.l for team in teams], dtype=np.int16) + (1 - bits) @ home + bits @ away
+    max_wins = games_per_season - losses
+
+    divisions = np.array([team.division for team in teams])
+    rivals = (divisions[:, None] == divisions[None, :]) & ~np.eye(len(teams), dtype=bool)
+    others = ~np.eye(len(teams), dtype=bool)
+    floor = np.int16(-1)
+
+    # [c, t, x] compares team t with team x in outcome c
+    rival_max_wins = np.where(rivals, max_wins[:, None, :], floor).max(axis=2)
+    rival_wins = np.where(rivals, wins[:, None, :], floor).max(axis=2)
+    can_reach = ((max_wins[:, None, :] >= wins[:, :, None]) & others).sum(axis=2)
+    out_of_reach = ((wins[:, None, :] > max_wins[:, :, None]) & others).sum(axis=2)
+
+    clinch_division = wins > rival_max_wins
+    eliminated_division = rival_wins > max_wins
+    return {
+        'clinch_division': clinch_division,
+        'clinch_playoffs': clinch_division | (can_reach <= WILD_CARD_SPOTS),
+        'eliminated_division': eliminated_division,
+        'eliminated_playoffs': eliminated_division & (out_of_reach >= len(set(divisions)) + WILD_CARD_SPOTS)
+    }
+
+
+# Games whose result changes the mask for at least one outcome
+def relevant_games(mask, num_games):
+    outcomes = np.arange(len(mask))
+    return [i for i in range(num_games) if np.any(mask != mask[outcomes ^ (1 << i)])]
+
+
+# Minimal sum of products for a truth table over k variables (k small):
+# prime implicants, then a greedy cover. Returns [[(var, value), ...], ...].
+def minimal_conditions(truth):
+    num_vars = int(np.log2(len(truth)))
+    true_rows = {row for row in range(len(truth)) if truth[row]}
+
+    def rows_of(cube):
+        free = [var for var, value in enumerate(cube) if value is None]
+        base = sum(1 << var for var, value in enumerate(cube) if value == 1)
+        return {base + sum(1 << var for var, bit in zip(free, bits) if bit)
+                for bits in itertools.product((0, 1), repeat=len(free))}
+
+    implicants = [cube for cube in itertools.product((0, 1, None), repeat=num_vars) if rows_of(cube) <= true_rows]
+    implicant_set = set(implicants)
+    primes = [
+        cube for cube in implicants
+        if not any(cube[:var] + (None,) + cube[var + 1:] in implicant_set for var in range(num_vars) if cube[var] is not None)
+    ]
+
+    conditions = []
+    uncovered = set(true_rows)
+    while uncovered:
+        best = max(primes, key=lambda cube: (len(rows_of(cube) & uncovered), -sum(v is not None for v in cube)))
+        uncovered -= rows_of(best)
+        conditions.append([(var, value) for var, value in enumerate(best) if value is not None])
+    return conditions
+
+
+# "NYY beat BAL or TB beat BOS and TOR beat SEA"
+def describe(mask, games, abbreviations):
+    games_involved = relevant_games(mask, len(games))
+    if not games_involved:
+        return "any result" if mask.all() else None
+    if len(games_involved) > MAX_CONDITION_GAMES:
+        return f"{mask.mean():.0%} of results"
+
+    # Truth table over the relevant games only, every other game's bit at 0
+    table_rows = np.arange(2 ** len(games_involved))
+    outcome = sum(((table_rows >> k) & 1) << game for k, game in enumerate(games_involved))
+    truth = mask[outcome]
+
+    terms = []
+    for condition in minimal_conditions(truth):
+        results = []
+        for var, value in condition:
+            home_id, away_id = games[games_involved[var]]
+            winner, loser = (home_id, away_id) if value else (away_id, home_id)
+            results.append(f"{abbreviations[winner]} beat {abbreviations[loser]}")
+        terms.append(" & ".join(results))
+    return " or ".join(terms)
+
+
+# {team_id: text} for teams whose clinch or elimination depends on the next
+# game day (games: [(home_id, away_id), ...], day_label: "tonight", "Sep 16").
+# already: {team_id: computed columns} from the standings engine, events that
+# already happened aren't repeated.
+def clinch_scenarios(teams, games, already=None, games_per_season=GAMES_PER_SEASON, day_label="tonight"):
+    already = already or {}
+    if not games or len(games) > MAX_GAMES:
+        return {}
+
+    abbreviations = {team.team_id: team.abbreviation for team in teams}
+    scenarios = {}
+    for league_teams in split_by_league(teams).values():
+        league_ids = {team.team_id for team in league_teams}
+        league_games = [game for game in games if game[0] in league_ids or game[1] in league_ids]
+        if not league_games:
+            continue
+
+        now = evaluate_outcomes(league_teams, [], games_per_season)
+        after = evaluate_outcomes(league_teams, league_games, games_per_season)
+        for index, team in enumerate(league_teams):
+            flags = already.get(team.team_id, {})
+            done = {
+                'clinch_division': flags.get('magic_number_division') is not None and flags['magic_number_division'] <= 0,
+                'eliminated_division': bool(flags.get('eliminated_from_division')),
+                'eliminated_playoffs': bool(flags.get('eliminated_from_wildcard'))
+            }
+            texts = []
+            # One clinch and one elimination line at most, the bigger one first
+            for group in (('clinch_division', 'clinch_playoffs'), ('eliminated_playoffs', 'eliminated_division')):
+                for event in group:
+                    if now[event][0, index] or done.get(event):
+                        break
+                    condition = describe(after[event][:, index], league_games, abbreviations)
+                    if condition is not None:
+                        texts.append(f"{EVENT_TEXT[event]} {day_label} with {condition}")
+                        break
+            if texts:
+                scenarios[team.team_id] = "; ".join(texts)
+    return scenarios
@@ -0,0 +1,314 @@
+import hashlib
+import itertools
+import json
+
+from collections import deque
+
+
+# Exact elimination and clinch detection from the remaining schedule
+#
+# The API's elim_num / wc_elim_num are formula based. This module decides
+# mathematically whether a team can still win its division or reach the
+# playoffs (3 division winners + 3 wild cards per league) using the classic
+# baseball elimination max-flow over the actual remaining games.
+#
+# Conventions match the MLB magic/elimination numbers:
+# - Eliminated: cannot even tie for the spot, ties are resolved in the team's favour
+# - Clinched: finishes strictly ahead no matter what, ties count against the team
+#
+# Inputs:
+# - teams: {team_id: {'w': wins, 'l': losses, 'division': division name}} for one league
+# - remaining: {(team_a, team_b): games left} with team_a < team_b, the whole schedule is fine
+#   (games against the other league only count towards a team's remaining total)
+
+WILD_CARD_SPOTS = 3
+
+
+class FlowNetwork:
+    def __init__(self, size):
+        self.size = size
+        self.graph = [[] for _ in range(size)]
+
+    # Edges are [to, capacity, index of reverse edge]
+    def add_edge(self, source, target, capacity):
+        self.graph[source].append([target, capacity, len(self.graph[target])])
+        self.graph[target].append([source, 0, len(self.graph[source]) - 1])
+
+    # Dinic's algorithm: BFS level graph + DFS blocking flows
+    def max_flow(self, source, sink):
+        flow = 0
+        while True:
+            level = [-1] * self.size
+            level[source] = 0
+            queue = deque([source])
+            while queue:
+                node = queue.popleft()
+                for target, capacity, _ in self.graph[node]:
+                    if capacity > 0 and level[target] < 0:
+                        level[target] = level[node] + 1
+                        queue.append(target)
+            if level[sink] < 0:
+                return flow
+
+            pointer = [0] * self.size
+            pushed = self._push(source, sink, float('inf'), level, pointer)
+            while pushed:
+                flow += pushed
+                pushed = self._push(source, sink, float('inf'), level, pointer)
+
+    def _push(self, node, sink, limit, level, pointer):
+        if node == sink:
+            return limit
+        edges = self.graph[node]
+        while pointer[node] < len(edges):
+            edge = edges[pointer[node]]
+            target, capacity, reverse = edge
+            if capacity > 0 and level[target] == level[node] + 1:
+                pushed = self._push(target, sink, min(limit, capacity), level, pointer)
+                if pushed:
+                    edge[1] -= pushed
+                    self.graph[target][reverse][1] += pushed
+                    return pushed
+            pointer[node] += 1
+        return 0
+
+
+def games_between(remaining, team_a, team_b):
+    return remaining.get((team_a, team_b) if team_a < team_b else (team_b, team_a), 0)
+
+
+def remaining_games_by_team(remaining):
+    totals = {}
+    for (team_a, team_b), games in remaining.items():
+        totals[team_a] = totals.get(team_a, 0) + games
+        totals[team_b] = totals.get(team_b, 0) + games
+    return totals
+
+
+# Can the games among `teams` be split so each team i wins at least
+# lower[i] and at most upper[i] of them? Only one bound type is used per call.
+def _games_can_be_split(teams, remaining, upper=None, lower=None):
+    teams = list(teams)
+    pairs = [
+        (team_a, team_b, games_between(remaining, team_a, team_b))
+        for team_a, team_b in itertools.combinations(teams, 2)
+    ]
+    pairs = [pair for pair in pairs if pair[2] > 0]
+
+    # Node layout: source, one node per pair, one node per team, sink
+    source = 0
+    sink = 1 + len(pairs) + len(teams)
+    team_node = {team_id: 1 + len(pairs) + index for index, team_id in enumerate(teams)}
+    network = FlowNetwork(sink + 1)
+
+    for index, (team_a, team_b, games) in enumerate(pairs):
+        node = 1 + index
+        network.add_edge(node, team_node[team_a], games)
+        network.add_edge(node, team_node[team_b], games)
+
+    if upper is not None:
+        # Every game has to be won by someone without anyone passing their cap
+        if any(upper[team_id] < 0 for team_id in teams):
+            return False
+        for index, (_, _, games) in enumerate(pairs):
+            network.add_edge(source, 1 + index, games)
+        for team_id in teams:
+            network.add_edge(team_node[team_id], sink, upper[team_id])
+        return network.max_flow(source, sink) == sum(pair[2] for pair in pairs)
+
+    # Every team has to collect its required wins from these games
+    for index, (_, _, games) in enumerate(pairs):
+        network.add_edge(source, 1 + index, games)
+    for team_id in teams:
+        network.add_edge(team_node[team_id], sink, lower[team_id])
+    return network.max_flow(source, sink) == sum(lower[team_id] for team_id in teams)
+
+
+def _division_members(teams):
+    divisions = {}
+    for team_id, team in teams.items():
+        divisions.setdefault(team['division'], []).append(team_id)
+    return divisions
+
+
+# x wins out; can every division rival finish with at most as many wins?
+def is_division_eliminated(team_id, teams, remaining, totals):
+    best_wins = teams[team_id]['w'] + totals.get(team_id, 0)
+    rivals = [other for other in teams if other != team_id and teams[other]['division'] == teams[team_id]['division']]
+    upper = {other: best_wins - teams[other]['w'] for other in rivals}
+    return not _games_can_be_split(rivals, remaining, upper=upper)
+
+
+# x loses out; is every rival still unable to reach x's wins?
+def is_division_clinched(team_id, teams, totals):
+    worst_wins = teams[team_id]['w']
+    return all(
+        teams[other]['w'] + totals.get(other, 0) < worst_wins
+        for other in teams
+        if other != team_id and teams[other]['division'] == teams[team_id]['division']
+    )
+
+
+# x wins out. x is still alive if some set A of teams can be left free to pass
+# x while everyone else stays at or below x, with at most 2 teams in A that are
+# not their division's winner: sum over divisions of max(0, |A in division| - 1) <= 2.
+# Bigger A only helps, so we try every maximal A: one team per division plus
+# the remaining extra picks.
+def is_playoffs_eliminated(team_id, teams, remaining, totals):
+    if not is_division_eliminated(team_id, teams, remaining, totals):
+        return False
+
+    best_wins = teams[team_id]['w'] + totals.get(team_id, 0)
+    extra_spots = WILD_CARD_SPOTS - 1
+    others = [other for other in teams if other != team_id]
+
+    # Teams already past x's best case have to be in A
+    forced = {other for other in others if teams[other]['w'] > best_wins}
+    divisions = {name: [other for other in members if other != team_id] for name, members in _division_members(teams).items()}
+
+    budget = extra_spots - sum(max(0, len(forced & set(members)) - 1) for members in divisions.values())
+    if budget < 0:
+        return True
+
+    # Most threatening teams first so live teams are usually confirmed on the first try
+    def threat(other):
+        return -(teams[other]['w'] + totals.get(other, 0))
+
+    division_choices = []
+    for members in divisions.values():
+        forced_here = [other for other in members if other in forced]
+        division_choices.append([tuple(forced_here)] if forced_here else [(other,) for other in sorted(members, key=threat)])
+
+    for picks in itertools.product(*division_choices):
+        free = set(itertools.chain.from_iterable(picks))
+        candidates = sorted((other for other in others if other not in free), key=threat)
+        for extra in itertools.combinations(candidates, min(budget, len(candidates))):
+            capped = [other for other in others if other not in free and other not in extra]
+            upper = {other: best_wins - teams[other]['w'] for other in capped}
+            if _games_can_be_split(capped, remaining, upper=upper):
+                return False
+
+    return True
+
+
+# x loses out. x misses the playoffs only if a division rival reaches x's wins
+# and at least 3 non division winners reach x's wins. We look for the smallest
+# such sets B and check whether all of B can get there at once.
+def is_playoffs_clinched(team_id, teams, remaining, totals):
+    if is_division_clinched(team_id, teams, totals):
+        return True
+
+    worst_wins = teams[team_id]['w']
+    own_division = teams[team_id]['division']
+    divisions = {name: [other for other in members if other != team_id] for name, members in _division_members(teams).items()}
+
+    # How many teams to pick per division: x's division needs at least 1,
+    # k teams in a division add k - 1 non winners
+    division_names = list(divisions)
+    size_options = []
+    for name in division_names:
+        if name == own_division:
+            size_options.append(range(1, len(divisions[name]) + 1))
+        else:
+            size_options.append([0] + list(range(2, len(divisions[name]) + 1)))
+
+    for sizes in itertools.product(*size_options):
+        if sum(max(0, size - 1) for size in sizes) != WILD_CARD_SPOTS:
+            continue
+
+        groups = [itertools.combinations(divisions[name], size) for name, size in zip(division_names, sizes)]
+        for chosen in itertools.product(*groups):
+            threats = list(itertools.chain.from_iterable(chosen))
+            lower = {}
+            for other in threats:
+                # Wins still needed after taking every game against teams outside the set
+                games_inside = sum(games_between(remaining, other, inside) for inside in threats if inside != other)
+                games_outside = totals.get(other, 0) - games_inside
+                lower[other] = max(0, worst_wins - teams[other]['w'] - games_outside)
+            if _games_can_be_split(threats, remaining, lower=lower):
+                return False
+
+    return True
+
+
+def evaluate_league(teams, remaining):
+    totals = remaining_games_by_team(remaining)
+    results = {}
+    for team_id in teams:
+        results[team_id] = {
+            'eliminated_from_division': is_division_eliminated(team_id, teams, remaining, totals),
+            'eliminated_from_playoffs': is_playoffs_eliminated(team_id, teams, remaining, totals),
+            'clinched_division': is_division_clinched(team_id, teams, totals),
+            'clinched_playoffs': is_playoffs_clinched(team_id, teams, remaining, totals)
+        }
+    return results
+
+
+# Remaining games that touch this league: pairs inside the league are kept,
+# games against the other league only add to the team's remaining total
+def league_remaining(teams, remaining):
+    league_remaining = {}
+    for (team_a, team_b), games in remaining.items():
+        if team_a in teams and team_b in teams:
+            league_remaining[(team_a, team_b)] = games
+        elif team_a in teams or team_b in teams:
+            # Stand-in opponent id so the game counts for the league team only
+            inside = team_a if team_a in teams else team_b
+            key = (-1, inside)
+            league_remaining[key] = league_remaining.get(key, 0) + games
+    return league_remaining
+
+
+def league_state_key(teams, remaining):
+    payload = json.dumps([sorted(teams.items()), sorted(remaining.items())], default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+# Keeps the last result per league and only re-evaluates a league whose
+# standings or remaining games changed, so one final only costs one league
+class EliminationEngine:
+    def __init__(self):
+        self._cache = {}
+
+    def update(self, leagues, remaining):
+        results = {}
+        for league_name, teams in leagues.items():
+            league_games = league_remaining(teams, remaining)
+            key = league_state_key(teams, league_games)
+            cached = self._cache.get(league_name)
+            if cached is None or cached[0] != key:
+                cached = (key, evaluate_league(teams, league_games))
+                self._cache[league_name] = cached
+            results.update(cached[1])
+        return results
+
+
+# Builds the {league: {team_id: {'w', 'l', 'division'}}} input from TeamRecords
+def build_leagues(teams):
+    leagues = {}
+    for team in teams:
+        leagues.setdefault(team.league, {})[team.team_id] = {
+            'w': team.w,
+            'l': team.l,
+            'division': team.division
+        }
+    return leagues
+
+
+# Flags where the API says eliminated but the local engine still finds a way in.
+# The API's numbers are measured against the team currently holding the spot,
+# so they can call a team out that could still get in if, say, the current
+# last wild card goes on to win its division. Local elimination coming
+# earlier than the API is expected and not reported.
+def compare_with_api_flags(results, teams):
+    teams_by_id = {team.team_id: team for team in teams}
+    mismatches = []
+    for team_id, result in results.items():
+        team = teams_by_id[team_id]
+        api_division = team.elim_num == 'E'
+        api_wildcard = team.wc_elim_num == 'E'
+        if api_division and not result['eliminated_from_division']:
+            mismatches.append((team_id, 'division', 'API eliminated, local alive'))
+        if api_wildcard and not result['eliminated_from_playoffs'] and result['eliminated_from_division']:
+            mismatches.append((team_id, 'wild card', 'API eliminated, local alive'))
+    return mismatches
@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import statsapi
+
+from records import build_team_records, project_standings_response, project_teams_response
+from response_cache import ResponseCache
+from seasons import CURRENT_SEASON, games_per_season, season_dates
+from snapshot import freeze_divisions
+from standings import GAMES_PER_SEASON, compute_standings
+
+
+# Daily standings history and season replay frames
+#
+# Backfill (run from the worker side, needs the MLB API):
+#   python history.py backfill --season 2025
+#   python history.py backfill --season 2025 --start 2025-03-27 --end 2025-09-28 --workers 4
+#
+# Every day's standings_data(date=...) response is projected (records.py) and
+# kept in the response cache with no expiry, so an interrupted backfill picks
+# up where it stopped and past days are never fetched twice. Once all days are
+# in, the season is written as one .npy array per metric shaped (days, teams)
+# plus a meta.json with the dates and team columns. SeasonHistory opens the
+# arrays memory-mapped: a replay frame is one contiguous row per metric, no
+# API or database call per frame.
+
+HISTORY_DIR = os.environ.get("HISTORY_DIR", os.path.join(".cache", "history"))
+BACKFILL_WORKERS = 4
+
+# Stored per day and team. Empty (None) values are stored as MISSING, magic
+# numbers go negative once clinched so -1 can't be used.
+INT_METRICS = (
+    'wins', 'losses', 'division_rank', 'wild_card_rank', 'magic_number_division',
+    'magic_number_wild_card', 'tragic_number_wild_card', 'eliminated_from_division', 'eliminated_from_wildcard'
+)
+FLOAT_METRICS = ('games_back_in_division', 'distance_from_clinched_division')
+MISSING = np.iinfo(np.int16).min
+
+# Day entries have always been records.py projections, so days fetched before
+# the cache was versioned (format 1) are kept. Bump when the projection changes.
+DAY_CACHE_FORMAT_VERSION = 1
+
+
+def season_dir(season, history_dir=None):
+    return os.path.join(history_dir or HISTORY_DIR, str(season))
+
+
+def fetch_day(cache, season, day):
+    def fetch():
+        return project_standings_response(statsapi.standings_data(season=season, date=day.strftime('%m/%d/%Y')))
+
+    # Past days never change, so cached days never expire
+    standings_rows, _ = cache.get_or_fetch(f"history:{season}:{day.isoformat()}", float('inf'), fetch)
+    return standings_rows
+
+
+# Fetches every day in [start, end] with at most `workers` requests in flight.
+# Days already in the cache are not fetched again.
+def backfill(season, start, end, workers=BACKFILL_WORKERS, history_dir=None):
+    directory = season_dir(season, history_dir)
+    cache = ResponseCache(os.path.join(directory, 'days'), max_bytes=float('inf'), format_version=DAY_CACHE_FORMAT_VERSION)
+    team_rows = project_teams_response(statsapi.get('teams', {'sportId': 1, 'season': season}))
+
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        daily_standings = list(executor.map(lambda day: fetch_day(cache, season, day), days))
+    print(f"Fetched {len(days)} days ({cache.misses} from the API) in {time.time() - start_time:.1f} seconds")
+
+    write_history(directory, team_rows, days, daily_standings, games_per_season(season))
+
+
+# One (days, teams) array per metric. Days before every team has played are
+# skipped, win percentages aren't defined yet.
+def write_history(directory, team_rows, days, daily_standings, games_per_season=GAMES_PER_SEASON):
+    team_ids = sorted(row[0] for row in team_rows)
+    column = {team_id: index for index, team_id in enumerate(team_ids)}
+    teams_by_id = {row[0]: row for row in team_rows}
+
+    kept_days = []
+    values = {metric: [] for metric in INT_METRICS + FLOAT_METRICS}
+    for day, standings_rows in zip(days, daily_standings):
+        records = build_team_records([teams_by_id[team_id] for team_id in team_ids], standings_rows)
+        if any(record.games_played == 0 for record in records):
+            continue
+
+        computed = compute_standings(records, games_per_season=games_per_season)
+        frame = {metric: [MISSING] * len(team_ids) for metric in values}
+        for record in records:
+            row = {
+                'wins': record.w,
+                'losses': record.l,
+                'division_rank': record.div_rank,
+                'wild_card_rank': record.wc_rank,
+                'games_back_in_division': record.gb,
+                **computed[record.team_id]
+            }
+            for metric in values:
+                value = row[metric]
+                frame[metric][column[record.team_id]] = MISSING if value is None else value
+
+        kept_days.append(day.isoformat())
+        for metric in values:
+            values[metric].append(frame[metric])
+
+    os.makedirs(directory, exist_ok=True)
+    for metric, rows in values.items():
+        dtype = np.int16 if metric in INT_METRICS else np.float32
+        np.save(os.path.join(directory, f"{metric}.npy"), np.array(rows, dtype=dtype).reshape(len(kept_days), len(team_ids)))
+
+    meta = {
+        'days': kept_days,
+        'teams': [
+            {'team_id': team_id, 'team_name': teams_by_id[team_id][1], 'abbreviation': teams_by_id[team_id][2],
+             'division': teams_by_id[team_id][3], 'league': teams_by_id[team_id][4]}
+            for team_id in team_ids
+        ]
+    }
+    tmp_path = os.path.join(directory, 'meta.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    # meta.json last and atomically: its presence means the arrays are complete
+    os.replace(tmp_path, os.path.join(directory, 'meta.json'))
+    print(f"Wrote {len(kept_days)} days x {len(team_ids)} teams to {directory}")
+
+
+# When the season's history was last written (meta.json's mtime), None if it
+# hasn't been backfilled
+def history_written_at(season, history_dir=None):
+    try:
+        return os.path.getmtime(os.path.join(season_dir(season, history_dir), 'meta.json'))
+    except OSError:
+        return None
+
+
+class SeasonHistory:
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+        self.days = meta['days']
+        self.teams = meta['teams']
+        # Memory-mapped: only the rows a frame touches are read from disk
+        self.arrays = {
+            metric: np.load(os.path.join(directory, f"{metric}.npy"), mmap_mode='r')
+            for metric in INT_METRICS + FLOAT_METRICS
+        }
+
+    @classmethod
+    def load(cls, season, history_dir=None):
+        directory = season_dir(season, history_dir)
+        if not os.path.exists(os.path.join(directory, 'meta.json')):
+            return None
+        return cls(directory)
+
+    def __len__(self):
+        return len(self.days)
+
+    # Teams table style rows for one day, what render.py reads
+    def rows_at(self, day_index):
+        columns = {metric: array[day_index].tolist() for metric, array in self.arrays.items()}
+        rows = []
+        for index, team in enumerate(self.teams):
+            row = dict(team)
+            for metric, values in columns.items():
+                value = values[index]
+                row[metric] = None if value == MISSING else value
+            rows.append(row)
+        return rows
+
+    # ({division: {rank: row}} for the AL, same for the NL) on one day
+    def divisions_at(self, day_index):
+        rows = self.rows_at(day_index)
+        return freeze_divisions(rows, "American League"), freeze_divisions(rows, "National League")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily standings history")
+    parser.add_argument('command', choices=['backfill'])
+    parser.add_argument('--season', default=CURRENT_SEASON)
+    parser.add_argument('--start', type=date.fromisoformat, help="First day (default: season start)")
+    parser.add_argument('--end', type=date.fromisoformat, help="Last day (default: season end or yesterday)")
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS, help="Concurrent API requests")
+    args = parser.parse_args()
+
+    if args.command == 'backfill':
+        start, end = args.start, args.end
+        if start is None or end is None:
+            season_start, season_end = season_dates(args.season)
+            start, end = start or season_start, end or season_end
+        backfill(args.season, start, end, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import time
+
+import metrics
+
+from local_store import LocalStore
+from pipeline import SEASON, create_supabase_client, remember_written, run_pipeline
+from write_behind import WriteBehindQueue
+
+
+# Standalone ingestion worker: fetch -> compute -> persist on its own schedule.
+# This is the only process that calls the MLB API or writes to Supabase,
+# the Streamlit page just reads the latest rows from the teams table.
+#
+# Usage:
+#   python ingest.py              # run every 30 minutes
+#   python ingest.py --interval 300
+#   python ingest.py --once       # single run (cron / Render cron job)
+#   python ingest.py --full       # rewrite every team, not just changed ones
+#   python ingest.py --season 2026
+#
+# Database writes go through a write-behind queue (write_behind.py), so a slow
+# or failing Supabase never holds up the next fetch and compute; failed writes
+# are retried with backoff in the background. --once waits up to
+# FLUSH_TIMEOUT_SECONDS for the queue before exiting. Every run is also
+# written through to the local SQLite store (local_store.py, LOCAL_STORE_PATH),
+# which the page and API on the same machine read instead of Supabase.
+#
+# Stage timings are written to METRICS_DIR/worker.prom and worker.json after
+# every run (see metrics.py).
+
+DEFAULT_INTERVAL_SECONDS = 1800
+FLUSH_TIMEOUT_SECONDS = 120
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="MLB Playoff Race Tracker ingestion worker")
+    parser.add_argument('--once', action='store_true', help="Run the pipeline once and exit")
+    parser.add_argument('--interval', type=int, default=DEFAULT_INTERVAL_SECONDS,
+                        help="Seconds between runs (default: %(default)s)")
+    parser.add_argument('--full', action='store_true',
+                        help="Rewrite every team on the first run, ignoring stored row hashes")
+    parser.add_argument('--season', default=SEASON,
+                        help="Season to keep in the teams table (default: SEASON or %(default)s)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    supabase = create_supabase_client()
+    writer = WriteBehindQueue(supabase, on_written=remember_written)
+    local_store = LocalStore()
+
+    if args.once:
+        try:
+            run_pipeline(supabase, full=args.full, season=args.season, writer=writer, local_store=local_store)
+        finally:
+            if not writer.close(FLUSH_TIMEOUT_SECONDS):
+                print(f"Gave up waiting on {writer.depth()} queued rows")
+            metrics.registry.export('worker', force=True)
+        return
+
+    full = args.full
+    while True:
+        try:
+            run_pipeline(supabase, full=full, season=args.season, writer=writer, local_store=local_store)
+            full = False
+        except Exception as e:
+            # Keep the worker alive, the next run will try again
+            print(f"Ingestion run failed: {e}")
+
+        metrics.registry.export('worker', force=True)
+
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
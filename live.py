@@ -0,0 +1,198 @@
+import threading
+import time
+
+from datetime import datetime
+
+import metrics
+
+from metrics import response_size
+from records import build_table_rows, carry_schedule_columns, records_from_table_rows
+from seasons import game_day
+from snapshot import StandingsSnapshot
+from standings import GAMES_PER_SEASON, apply_results, compute_standings
+
+
+# Live game-day mode: standings "if current scores hold"
+#
+# Today's schedule (statsapi.schedule, which carries the linescore: status,
+# inning, runs; "today" is the Eastern Time game day, seasons.game_day) is
+# polled by one LiveScores per web process, shared by every
+# session, so a single upstream request every LIVE_POLL_SECONDS serves all
+# viewers. Each in-progress game that isn't tied counts as a win for the team
+# ahead; the page's snapshot rows are re-ranked with those results
+# (standings.apply_results) and run through the standings engine again for
+# magic numbers and lane positions. The projection is memoized per
+# (snapshot version, results), so sessions and divisions polling at the same
+# time share one recompute.
+#
+# Finished games stay in until the snapshot counts them. The first time a
+# team's first game of the day is seen before it's over, the team's games
+# played in the snapshot is remembered as its day start; its k-th game today
+# (doubleheaders have two) is counted once the snapshot has day start + k
+# games played. For a team only seen after its first game ended (e.g. the
+# process started late) a final is counted if the snapshot's data_as_of is
+# at least GAME_LENGTH_SECONDS after first pitch, later than nearly every
+# game ends.
+#
+# This is the one place the web process calls the MLB API, and only while
+# someone has live mode switched on.
+
+LIVE_POLL_SECONDS = 30
+
+GAME_LENGTH_SECONDS = 4 * 3600
+
+# Games that haven't started yet or are already over
+NOT_LIVE_STATES = (
+    'Scheduled', 'Pre-Game', 'Warmup', 'Final', 'Game Over', 'Completed Early', 'Cancelled', 'Postponed'
+)
+
+# Games over with a result. They count in the projection until the page's
+# snapshot has them (the worker runs every 30 minutes), see LiveScores.
+FINAL_STATES = ('Final', 'Game Over', 'Completed Early')
+
+
+# statsapi is imported on first poll, it isn't needed for a cold start paint
+def fetch_todays_games():
+    import statsapi
+
+    return statsapi.schedule(date=game_day().isoformat())
+
+
+def is_live(game):
+    return game['game_type'] == 'R' and bool(game['current_inning']) and game['status'] not in NOT_LIVE_STATES
+
+
+def is_final(game):
+    return game['game_type'] == 'R' and game['status'] in FINAL_STATES
+
+
+# (winner_id, loser_id) for every live game with a leader, and every final game
+# for which counted(game) is False, sorted so equal scoreboards give equal keys
+def current_results(games, counted=lambda game: True):
+    results = []
+    for game in games:
+        if not (is_live(game) or (is_final(game) and not counted(game))):
+            continue
+        if game['home_score'] == game['away_score']:
+            continue
+        if game['home_score'] > game['away_score']:
+            results.append((game['home_id'], game['away_id']))
+        else:
+            results.append((game['away_id'], game['home_id']))
+    return tuple(sorted(results))
+
+
+# {team_id: [game, ...]} regular season games today that are or will be
+# played, in start order
+def games_by_team(games):
+    teams = {}
+    ordered = sorted(games, key=lambda game: (game.get('game_datetime') or '', game.get('game_num') or 1))
+    for game in ordered:
+        if game['game_type'] == 'R' and game['status'] not in ('Cancelled', 'Postponed'):
+            teams.setdefault(game['home_id'], []).append(game)
+            teams.setdefault(game['away_id'], []).append(game)
+    return teams
+
+
+def first_pitch(game):
+    return datetime.fromisoformat(game['game_datetime'].replace('Z', '+00:00')).timestamp()
+
+
+# Team ids playing a regular season game today that isn't over yet
+def teams_playing(games):
+    teams = set()
+    for game in games:
+        if game['game_type'] == 'R' and game['status'] not in ('Final', 'Game Over', 'Completed Early', 'Cancelled', 'Postponed'):
+            teams.update((game['home_id'], game['away_id']))
+    return teams
+
+
+class LiveScores:
+    def __init__(self, poll_seconds=LIVE_POLL_SECONDS, fetch=fetch_todays_games):
+        self.poll_seconds = poll_seconds
+        self.fetch = fetch
+        self.games = []
+        self.polled_at = 0.0
+        self.polls = 0
+        self.last_error = None
+        self._projection_key = None
+        self._projection = None
+        self._day_starts = {}  # (team_id, game_date) -> snapshot games played before the team's first game
+        self._lock = threading.Lock()
+
+    # Today's games, polled at most once every poll_seconds across all callers.
+    # A failed poll keeps the last scoreboard.
+    def get(self):
+        with self._lock:
+            if time.time() - self.polled_at >= self.poll_seconds:
+                try:
+                    with metrics.span('live.poll') as span:
+                        self.games = self.fetch()
+                        span.count('api_bytes', response_size(self.games))
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = e
+                self.polled_at = time.time()
+                self.polls += 1
+            return self.games
+
+    # Whether the snapshot already has a final game's result, see the top
+    def _counted(self, game, snapshot, games_played, team_games):
+        team_id = game['home_id']
+        day_start = self._day_starts.get((team_id, game['game_date']))
+        if day_start is not None:
+            ordinal = [other['game_id'] for other in team_games[team_id]].index(game['game_id']) + 1
+            return games_played.get(team_id, 0) >= day_start + ordinal
+        if snapshot.data_as_of is None or not game.get('game_datetime'):
+            return True
+        return first_pitch(game) + GAME_LENGTH_SECONDS <= snapshot.data_as_of
+
+    # counted(game) for current_results with this scoreboard and snapshot
+    def _counted_check(self, games, snapshot):
+        games_played = {row['team_id']: row['games_played'] for row in snapshot.teams}
+        team_games = games_by_team(games)
+        with self._lock:
+            day_starts = {}
+            for team_id, scheduled in team_games.items():
+                key = (team_id, scheduled[0]['game_date'])
+                if key in self._day_starts:
+                    day_starts[key] = self._day_starts[key]
+                elif not is_final(scheduled[0]):
+                    day_starts[key] = games_played.get(team_id, 0)
+            self._day_starts = day_starts
+        return lambda game: self._counted(game, snapshot, games_played, team_games)
+
+    # Team ids whose standings can still move today: playing a game that isn't
+    # over, or in a final the snapshot hasn't counted yet
+    def live_teams(self, snapshot):
+        games = self.get()
+        counted = self._counted_check(games, snapshot)
+        teams = teams_playing(games)
+        for game in games:
+            if is_final(game) and not counted(game):
+                teams.update((game['home_id'], game['away_id']))
+        return teams
+
+    # Snapshot of the standings if current scores hold, the snapshot itself
+    # when no live or uncounted final game has a leader
+    def project(self, snapshot, games_per_season=GAMES_PER_SEASON):
+        games = self.get()
+        results = current_results(games, self._counted_check(games, snapshot))
+        if not results:
+            return snapshot
+
+        key = (snapshot.version, results, games_per_season)
+        with self._lock:
+            if self._projection_key == key:
+                return self._projection
+
+        with metrics.span('live.project'):
+            teams = apply_results(records_from_table_rows(snapshot.teams), results)
+            rows = build_table_rows(teams, compute_standings(teams, games_per_season=games_per_season))
+            carry_schedule_columns(rows, snapshot.teams)
+            projection = StandingsSnapshot(rows, data_as_of=snapshot.data_as_of)
+
+        with self._lock:
+            self._projection_key = key
+            self._projection = projection
+        return projection
@@ -0,0 +1,259 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from datetime import datetime
+
+import metrics
+
+from seasons import MLB_TIMEZONE
+from snapshot import read_standings
+
+
+# Local embedded copy of the database (SQLite)
+#
+# The ingestion worker writes every run through to this store first (a local
+# transaction, well under a millisecond for 30 rows) and queues the same rows
+# for Supabase, which stays the durable remote copy (see write_behind.py).
+# Readers on the same machine (page, JSON API) read from here when the worker
+# has succeeded recently, and only go to Supabase when it hasn't, e.g. when
+# the worker runs on another host.
+#
+# LocalStore answers the small part of the Supabase client API the code uses:
+#
+#   store.table('teams').select('*').eq('league', 'American League').execute().data
+#   store.table('teams').upsert(rows, on_conflict='team_id').execute()
+#
+# so snapshot.read_standings() reads from either, and LocalStore(':memory:')
+# is a complete offline backend. Rows are stored as JSON per (table, key), so
+# new columns need no migration; upserts merge into the existing row like a
+# Postgres upsert of the given columns. Decoded tables are kept in memory
+# until the file changes (PRAGMA data_version), so repeat reads are a copy of
+# a list of dicts.
+#
+# Every distinct version of the teams rows is also appended to
+# snapshot_history, for looking back at what the standings were at a time.
+# Per season the last SNAPSHOT_HISTORY_KEEP versions are kept, and before
+# those the last version of each (ET) day.
+
+LOCAL_STORE_PATH = os.environ.get("LOCAL_STORE_PATH", os.path.join(".cache", "local_store.sqlite3"))
+
+# Readers use the local copy only if the worker succeeded this recently
+LOCAL_MAX_AGE_SECONDS = 3600
+
+# About a day of versions at one every 30 minutes
+SNAPSHOT_HISTORY_KEEP = 48
+
+SCHEMA = """
+create table if not exists rows (
+    table_name text not null,
+    key text not null,
+    row text not null,
+    primary key (table_name, key)
+);
+create table if not exists snapshot_history (
+    id integer primary key autoincrement,
+    season text,
+    version text not null,
+    data_as_of real,
+    recorded_at real not null,
+    rows text not null
+);
+"""
+
+
+class LocalResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class LocalQuery:
+    def __init__(self, store, table_name):
+        self.store = store
+        self.table_name = table_name
+        self.operation = 'select'
+        self.rows = None
+        self.on_conflict = 'id'
+        self.filters = []
+
+    def select(self, columns='*'):
+        self.operation = 'select'
+        return self
+
+    def upsert(self, rows, on_conflict='id'):
+        self.operation = 'upsert'
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def execute(self):
+        if self.operation == 'upsert':
+            return LocalResponse(self.store.upsert(self.table_name, self.rows, self.on_conflict))
+        return LocalResponse(self.store.select(self.table_name, self.filters))
+
+
+class LocalStore:
+    def __init__(self, path=LOCAL_STORE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # One connection shared by every thread (page sessions, writer thread)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._tables = {}  # table_name -> (data_version, {key: row})
+        with self._lock:
+            if path != ':memory:':
+                # Readers in other processes don't block the worker's writes
+                self._connection.execute('pragma journal_mode=wal')
+            self._connection.executescript(SCHEMA)
+
+    def table(self, name):
+        return LocalQuery(self, name)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    # Caller holds self._lock
+    def _data_version(self):
+        return self._connection.execute('pragma data_version').fetchone()[0]
+
+    # Caller holds self._lock. {key: row} for one table, decoded once per file change.
+    def _load_table(self, table_name):
+        data_version = self._data_version()
+        cached = self._tables.get(table_name)
+        if cached is not None and cached[0] == data_version:
+            return cached[1]
+        rows = {
+            key: json.loads(row)
+            for key, row in self._connection.execute('select key, row from rows where table_name = ?', (table_name,))
+        }
+        self._tables[table_name] = (data_version, rows)
+        return rows
+
+    def select(self, table_name, filters=()):
+        with self._lock:
+            rows = list(self._load_table(table_name).values())
+        for column, value in filters:
+            rows = [row for row in rows if row.get(column) == value]
+        return [dict(row) for row in rows]
+
+    # Merges each row into the stored one, all rows in one transaction
+    def upsert(self, table_name, rows, on_conflict='id'):
+        with self._lock:
+            stored = self._load_table(table_name)
+            merged = {}
+            for row in rows:
+                key = json.dumps(row[on_conflict])
+                merged[key] = {**stored.get(key, {}), **row}
+            with self._connection:
+                self._connection.execute('begin')
+                self._connection.executemany(
+                    'insert into rows (table_name, key, row) values (?, ?, ?) '
+                    'on conflict (table_name, key) do update set row = excluded.row',
+                    [(table_name, key, json.dumps(row, default=str)) for key, row in merged.items()]
+                )
+            # data_version doesn't change for this connection's own writes
+            self._tables.pop(table_name, None)
+        return [dict(row) for row in merged.values()]
+
+    # Seconds since the worker's last successful run as recorded here, None if never
+    def data_age(self):
+        status = self.select('ingest_status', [('id', 1)])
+        if not status or not status[0].get('last_success_at'):
+            return None
+        return time.time() - datetime.fromisoformat(status[0]['last_success_at']).timestamp()
+
+    # Whether readers should use this copy rather than Supabase
+    def is_current(self, max_age=LOCAL_MAX_AGE_SECONDS):
+        age = self.data_age()
+        return age is not None and age <= max_age
+
+    # Appends the rows if they differ from the last recorded version of the
+    # season, then drops versions outside the retention (see the top)
+    def record_snapshot(self, rows, version, data_as_of=None, season=None, keep_last=SNAPSHOT_HISTORY_KEEP):
+        with self._lock:
+            last = self._connection.execute(
+                'select version from snapshot_history where season is ? order by id desc limit 1', (season,)
+            ).fetchone()
+            if last is not None and last[0] == version:
+                return False
+            with self._connection:
+                self._connection.execute('begin')
+                self._connection.execute(
+                    'insert into snapshot_history (season, version, data_as_of, recorded_at, rows) values (?, ?, ?, ?, ?)',
+                    (season, version, data_as_of, time.time(), json.dumps(rows, default=str))
+                )
+                self._prune_history(season, keep_last)
+        return True
+
+    # Caller holds self._lock, inside a transaction
+    def _prune_history(self, season, keep_last):
+        recorded = self._connection.execute(
+            'select id, recorded_at from snapshot_history where season is ? order by id desc', (season,)
+        ).fetchall()
+        keep = {row_id for row_id, _ in recorded[:keep_last]}
+        days = set()
+        for row_id, recorded_at in recorded:
+            day = datetime.fromtimestamp(recorded_at, MLB_TIMEZONE).date()
+            if day not in days:
+                # Newest first, so this is the day's last version
+                days.add(day)
+                keep.add(row_id)
+        self._connection.executemany(
+            'delete from snapshot_history where id = ?', [(row_id,) for row_id, _ in recorded if row_id not in keep]
+        )
+
+    # [(recorded_at, version, data_as_of)], newest first
+    def snapshot_versions(self, season=None, limit=100):
+        with self._lock:
+            return self._connection.execute(
+                'select recorded_at, version, data_as_of from snapshot_history where season is ? '
+                'order by id desc limit ?', (season, limit)
+            ).fetchall()
+
+    # (rows, data_as_of) as recorded at or before the given epoch seconds, None if none
+    def snapshot_at(self, timestamp, season=None):
+        with self._lock:
+            found = self._connection.execute(
+                'select rows, data_as_of from snapshot_history where season is ? and recorded_at <= ? '
+                'order by id desc limit 1', (season, timestamp)
+            ).fetchone()
+        if found is None:
+            return None
+        return json.loads(found[0]), found[1]
+
+
+_open_stores = {}
+_open_lock = threading.Lock()
+
+
+# The local store if the worker has written one on this machine, else None
+# (checked again on the next call). Readers don't create an empty store file.
+def open_local_store(path=LOCAL_STORE_PATH):
+    with _open_lock:
+        if path not in _open_stores:
+            if path != ':memory:' and not os.path.exists(path):
+                return None
+            _open_stores[path] = LocalStore(path)
+        return _open_stores[path]
+
+
+# SnapshotStore loader: (rows, data_as_of) from the local copy when the worker
+# keeps it current, otherwise from remote_loader() (Supabase)
+def local_first(remote_loader, path=LOCAL_STORE_PATH, max_age=LOCAL_MAX_AGE_SECONDS):
+    def load():
+        with metrics.span('snapshot.load') as span:
+            store = open_local_store(path)
+            if store is not None and store.is_current(max_age):
+                span.count('local_reads')
+                return read_standings(store)
+            span.count('remote_reads')
+            return remote_loader()
+    return load
@@ -0,0 +1,241 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+from collections import deque
+
+
+# Stage timing and counters
+#
+# Code wraps each stage in a named span:
+#
+#   with metrics.span('fetch.standings') as span:
+#       standings_data = statsapi.standings_data(...)
+#       span.count('api_bytes', response_size(standings_data))
+#
+# Finished spans go into a ring buffer (the most recent RECENT_SPANS, for
+# p50/p99 and "where did this page build go") and into a cumulative histogram
+# per span name (for Prometheus, which computes its own quantiles).
+#
+# Both processes keep one registry each. The worker exports after every run
+# and the page at most every EXPORT_INTERVAL_SECONDS, as <name>.prom (text
+# exposition format, works with node_exporter's textfile collector) and
+# <name>.json in METRICS_DIR.
+
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(".cache", "metrics"))
+RECENT_SPANS = 1000
+EXPORT_INTERVAL_SECONDS = 30
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# Size of an API response once serialized, statsapi hands back parsed objects
+def response_size(payload):
+    return len(json.dumps(payload, default=str))
+
+
+class Span:
+    __slots__ = ('name', 'parent', 'started_at', 'duration', 'counters', '_start')
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.started_at = time.time()
+        self.duration = None
+        self.counters = {}
+        self._start = time.perf_counter()
+
+    def count(self, counter, amount=1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'parent': self.parent,
+            'started_at': self.started_at,
+            'duration_seconds': self.duration,
+            'counters': dict(self.counters)
+        }
+
+
+class Histogram:
+    __slots__ = ('bucket_counts', 'count', 'sum')
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class MetricsRegistry:
+    def __init__(self, recent_spans=RECENT_SPANS):
+        self.recent = deque(maxlen=recent_spans)
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_export = 0.0
+
+    def span(self, name):
+        return _SpanContext(self, name)
+
+    def _current_name(self):
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def _record(self, span):
+        with self._lock:
+            self.recent.append(span)
+            self.histograms.setdefault(span.name, Histogram()).observe(span.duration)
+            for counter, amount in span.counters.items():
+                key = (span.name, counter)
+                self.counters[key] = self.counters.get(key, 0) + amount
+
+    # Records a duration measured some other way, e.g. time to first paint
+    def record_value(self, name, seconds, parent=None):
+        span = Span(name, parent or self._current_name())
+        span.duration = seconds
+        self._record(span)
+
+    # Current value of something that goes up and down, e.g. a queue depth
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    # {span name: {count, p50, p99, max, last}} over the ring buffer
+    def summary(self):
+        with self._lock:
+            durations = {}
+            for span in self.recent:
+                durations.setdefault(span.name, []).append(span.duration)
+
+        summary = {}
+        for name, values in durations.items():
+            last = values[-1]
+            values.sort()
+            summary[name] = {
+                'count': len(values),
+                'p50_seconds': percentile(values, 0.50),
+                'p99_seconds': percentile(values, 0.99),
+                'max_seconds': values[-1],
+                'last_seconds': last
+            }
+        return summary
+
+    def to_json(self, recent=50):
+        with self._lock:
+            recent_spans = [span.to_dict() for span in list(self.recent)[-recent:]]
+            counters = {}
+            for (name, counter), amount in self.counters.items():
+                counters.setdefault(name, {})[counter] = amount
+            gauges = dict(self.gauges)
+        return {
+            'generated_at': time.time(),
+            'stages': self.summary(),
+            'counters': counters,
+            'gauges': gauges,
+            'recent_spans': recent_spans
+        }
+
+    def to_prometheus(self):
+        lines = [
+            '# HELP mlb_stage_duration_seconds Time spent in each pipeline/page stage',
+            '# TYPE mlb_stage_duration_seconds histogram'
+        ]
+        with self._lock:
+            for name in sorted(self.histograms):
+                histogram = self.histograms[name]
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS + (float('inf'),), histogram.bucket_counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'mlb_stage_duration_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'mlb_stage_duration_seconds_sum{{stage="{name}"}} {histogram.sum:.6f}')
+                lines.append(f'mlb_stage_duration_seconds_count{{stage="{name}"}} {histogram.count}')
+
+            lines.append('# HELP mlb_stage_events_total Counters recorded on stage spans (rows written, cache hits, API bytes)')
+            lines.append('# TYPE mlb_stage_events_total counter')
+            for (name, counter), amount in sorted(self.counters.items()):
+                lines.append(f'mlb_stage_events_total{{stage="{name}",counter="{counter}"}} {amount}')
+
+            if self.gauges:
+                lines.append('# HELP mlb_gauge Current values (queue depths)')
+                lines.append('# TYPE mlb_gauge gauge')
+                for name, value in sorted(self.gauges.items()):
+                    lines.append(f'mlb_gauge{{name="{name}"}} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    # Writes <name>.prom and <name>.json; throttled unless force=True
+    def export(self, name, directory=None, force=False):
+        now = time.time()
+        if not force and now - self._last_export < EXPORT_INTERVAL_SECONDS:
+            return False
+        self._last_export = now
+
+        directory = directory or METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        for extension, payload in (('prom', self.to_prometheus()), ('json', json.dumps(self.to_json(), indent=2))):
+            path = os.path.join(directory, f"{name}.{extension}")
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+            # Atomic swap so a scraper never reads a half written file
+            os.replace(tmp_path, path)
+        return True
+
+
+class _SpanContext:
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.span = Span(name, registry._current_name())
+
+    def __enter__(self):
+        stack = getattr(self.registry._local, 'stack', None)
+        if stack is None:
+            stack = self.registry._local.stack = []
+        stack.append(self.span.name)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.span.duration = time.perf_counter() - self.span._start
+        if exc_type is not None:
+            self.span.count('errors')
+        self.registry._local.stack.pop()
+        self.registry._record(self.span)
+        return False
+
+    def elapsed(self):
+        return time.perf_counter() - self.span._start
+
+    # For spans that can't be a with block, like a whole Streamlit script run
+    def start(self):
+        self.__enter__()
+        return self
+
+    def finish(self):
+        self.__exit__(None, None, None)
+
+
+# One registry per process
+registry = MetricsRegistry()
+
+
+def span(name):
+    return registry.span(name)
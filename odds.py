@@ -0,0 +1,268 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+from standings import GAMES_PER_SEASON
+
+
+# Monte Carlo playoff odds
+#
+# Simulates the rest of the regular season many times and counts how often
+# each team wins its division, takes a wild card, lands on each seed 1-6 and
+# gets a first round bye (seeds 1-2).
+#
+# Everything is done on NumPy arrays shaped (simulations, teams), one league at
+# a time, so the only Python loops are over the 3 divisions and 6 seeds.
+#
+# Target: 100,000 simulated seasons for both leagues in under 2 seconds on a
+# laptop-class CPU with a single process (python odds.py --benchmark).
+#
+# Model:
+# - Each team keeps its current wins/losses and plays its games left on the
+#   schedule (schedule.py) when known, otherwise games_per_season - (w + l)
+#   more games (162 unless the season was shortened, see seasons.py)
+# - Per-game win probability is the team's win percentage regressed toward .500
+#   (adds REGRESSION_GAMES games of .500 ball)
+# - Games left between two teams of the league (the schedule's pairs matrix)
+#   are drawn per pair: binomial wins for one side with the log5 probability,
+#   the rest go to the other, so head-to-head games are zero-sum. Games
+#   against the other league, or all games when the pairs aren't known, are
+#   binomial per team
+# - Ties in the final standings are broken at random
+
+REGRESSION_GAMES = 70
+PLAYOFF_SEEDS = 6
+DIVISION_WINNER_SEEDS = 3
+BYE_SEEDS = 2
+
+
+# Pulls flat arrays for one league out of the divisions dict built by the pipeline
+# ({division: {div_rank: TeamRecord}})
+def build_league_inputs(divisions_dict):
+    team_ids = []
+    wins = []
+    losses = []
+    division_index = []
+
+    for index, division in enumerate(sorted(divisions_dict.keys())):
+        for rank in sorted(divisions_dict[division].keys()):
+            team = divisions_dict[division][rank]
+            team_ids.append(team.team_id)
+            wins.append(team.w)
+            losses.append(team.l)
+            division_index.append(index)
+
+    return {
+        'team_ids': team_ids,
+        'wins': np.array(wins, dtype=np.int32),
+        'losses': np.array(losses, dtype=np.int32),
+        'division_index': np.array(division_index, dtype=np.int32)
+    }
+
+
+def estimate_win_probability(wins, losses):
+    return (wins + REGRESSION_GAMES / 2) / (wins + losses + REGRESSION_GAMES)
+
+
+# Probability team a beats team b in one game (log5)
+def head_to_head_probability(p_a, p_b):
+    return p_a * (1 - p_b) / (p_a * (1 - p_b) + p_b * (1 - p_a))
+
+
+# (team_a indexes, team_b indexes, games) for the league's pairs with games
+# left, and each team's games outside those pairs.
+# remaining_pairs: {(team_a, team_b): games}, e.g. a RemainingSchedule
+def build_pair_inputs(team_ids, remaining_pairs, remaining_games):
+    index = {team_id: i for i, team_id in enumerate(team_ids)}
+    pair_a, pair_b, pair_games = [], [], []
+    other_games = np.array(remaining_games, dtype=np.int32)
+    for (team_a, team_b), games in remaining_pairs.items():
+        if team_a in index and team_b in index and games > 0:
+            pair_a.append(index[team_a])
+            pair_b.append(index[team_b])
+            pair_games.append(games)
+            other_games[index[team_a]] -= games
+            other_games[index[team_b]] -= games
+    pairs = (np.array(pair_a, dtype=np.intp), np.array(pair_b, dtype=np.intp), np.array(pair_games, dtype=np.int32))
+    return pairs, np.maximum(other_games, 0)
+
+
+# Runs one batch of simulations for a league.
+# Returns counts: division titles, wild cards and a (teams, 6) seed table.
+# remaining_games: games left per team from the schedule index (schedule.py),
+# otherwise games_per_season - games played. With pairs (see
+# build_pair_inputs) remaining_games are the games outside those pairs.
+def simulate_league(wins, losses, division_index, simulations, seed=None, win_probability=None,
+                    games_per_season=GAMES_PER_SEASON, remaining_games=None, pairs=None):
+    rng = np.random.default_rng(seed)
+    num_teams = len(wins)
+
+    if win_probability is None:
+        win_probability = estimate_win_probability(wins, losses)
+    if remaining_games is None:
+        remaining_games = np.maximum(games_per_season - (wins + losses), 0)
+
+    # Final wins for every simulated season, plus a random fraction to break ties
+    final_wins = wins + rng.binomial(remaining_games, win_probability, size=(simulations, num_teams))
+    if pairs is not None and len(pairs[2]):
+        pair_a, pair_b, pair_games = pairs
+        a_wins = rng.binomial(pair_games, head_to_head_probability(win_probability[pair_a], win_probability[pair_b]),
+                              size=(simulations, len(pair_games)))
+        # Pair wins onto teams as one matrix product per side (floats for BLAS, exact for these counts)
+        to_a = np.zeros((len(pair_games), num_teams))
+        to_a[np.arange(len(pair_games)), pair_a] = 1
+        to_b = np.zeros((len(pair_games), num_teams))
+        to_b[np.arange(len(pair_games)), pair_b] = 1
+        final_wins = final_wins + np.rint(a_wins @ to_a + (pair_games - a_wins) @ to_b).astype(final_wins.dtype)
+    score = final_wins + rng.random((simulations, num_teams))
+
+    rows = np.arange(simulations)
+    is_division_winner = np.zeros((simulations, num_teams), dtype=bool)
+    for division in np.unique(division_index):
+        columns = np.flatnonzero(division_index == division)
+        winners = columns[np.argmax(score[:, columns], axis=1)]
+        is_division_winner[rows, winners] = True
+
+    # Seeds 1-3: division winners by record, seeds 4-6: best non-winners
+    division_order = np.argsort(np.where(is_division_winner, -score, np.inf), axis=1)[:, :DIVISION_WINNER_SEEDS]
+    wildcard_order = np.argsort(np.where(is_division_winner, np.inf, -score), axis=1)[:, :PLAYOFF_SEEDS - DIVISION_WINNER_SEEDS]
+    seed_order = np.concatenate([division_order, wildcard_order], axis=1)
+
+    seed_counts = np.zeros((num_teams, PLAYOFF_SEEDS), dtype=np.int64)
+    for seed_index in range(PLAYOFF_SEEDS):
+        seed_counts[:, seed_index] = np.bincount(seed_order[:, seed_index], minlength=num_teams)
+
+    return {
+        'division': is_division_winner.sum(axis=0),
+        'wild_card': seed_counts[:, DIVISION_WINNER_SEEDS:].sum(axis=1),
+        'seeds': seed_counts
+    }
+
+
+# Process pool entry point (must be a top level function to be picklable)
+def _simulate_chunk(args):
+    return simulate_league(*args)
+
+
+def merge_counts(results):
+    merged = results[0]
+    for result in results[1:]:
+        merged = {key: merged[key] + result[key] for key in merged}
+    return merged
+
+
+# Simulates one league and returns {team_id: probability table}.
+# processes > 1 spreads the simulations across a process pool (0 = all cores).
+# remaining_by_team: {team_id: games left}, e.g. RemainingSchedule.by_team
+# remaining_pairs: {(team_a, team_b): games left}, e.g. the RemainingSchedule
+# itself, for zero-sum head-to-head games (needs remaining_by_team)
+def simulate_playoff_odds(divisions_dict, simulations=100_000, processes=1, seed=None, games_per_season=GAMES_PER_SEASON,
+                          remaining_by_team=None, remaining_pairs=None):
+    league = build_league_inputs(divisions_dict)
+    remaining_games = None
+    pairs = None
+    if remaining_by_team:
+        remaining_games = np.array([remaining_by_team.get(team_id, 0) for team_id in league['team_ids']], dtype=np.int32)
+        if remaining_pairs:
+            pairs, remaining_games = build_pair_inputs(league['team_ids'], remaining_pairs, remaining_games)
+
+    if processes == 0:
+        processes = os.cpu_count() or 1
+
+    if processes > 1:
+        # Independent random streams per chunk so workers don't repeat each other
+        chunk_seeds = np.random.SeedSequence(seed).spawn(processes)
+        chunk_sizes = [simulations // processes + (1 if i < simulations % processes else 0) for i in range(processes)]
+        chunks = [
+            (league['wins'], league['losses'], league['division_index'], size, chunk_seed, None, games_per_season,
+             remaining_games, pairs)
+            for size, chunk_seed in zip(chunk_sizes, chunk_seeds)
+        ]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            counts = merge_counts(list(executor.map(_simulate_chunk, chunks)))
+    else:
+        counts = simulate_league(league['wins'], league['losses'], league['division_index'], simulations, seed,
+                                 games_per_season=games_per_season, remaining_games=remaining_games, pairs=pairs)
+
+    odds = {}
+    for index, team_id in enumerate(league['team_ids']):
+        seeds = counts['seeds'][index] / simulations
+        odds[team_id] = {
+            'division': counts['division'][index] / simulations,
+            'wild_card': counts['wild_card'][index] / simulations,
+            'playoffs': seeds.sum(),
+            'bye': seeds[:BYE_SEEDS].sum(),
+            'seeds': seeds.tolist()
+        }
+
+    return odds
+
+
+def print_odds_table(odds, team_names):
+    print(f"{'Team':<24}{'Div':>7}{'WC':>7}{'Playoffs':>10}{'Bye':>7}  Seeds 1-6")
+    for team_id in sorted(odds, key=lambda team_id: -odds[team_id]['playoffs']):
+        team_odds = odds[team_id]
+        seeds = ' '.join(f"{p:5.1%}" for p in team_odds['seeds'])
+        print(f"{team_names[team_id]:<24}{team_odds['division']:>7.1%}{team_odds['wild_card']:>7.1%}"
+              f"{team_odds['playoffs']:>10.1%}{team_odds['bye']:>7.1%}  {seeds}")
+
+
+# Two even 15-team leagues 120 games into the season, no network needed
+def run_benchmark(simulations, processes):
+    rng = np.random.default_rng(0)
+    start_time = time.time()
+    for _ in range(2):
+        wins = rng.integers(50, 75, size=15).astype(np.int32)
+        losses = (120 - wins).astype(np.int32)
+        division_index = np.repeat(np.arange(3), 5).astype(np.int32)
+        if processes == 1:
+            simulate_league(wins, losses, division_index, simulations)
+        else:
+            chunk = simulations // processes
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                list(executor.map(_simulate_chunk, [(wins, losses, division_index, chunk, None)] * processes))
+    print(f"Simulated {simulations:,} seasons for both leagues in {time.time() - start_time:.3f} seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo playoff odds")
+    parser.add_argument('--simulations', type=int, default=100_000)
+    parser.add_argument('--processes', type=int, default=1, help="0 = one per CPU core")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--season', default=None, help="Season to simulate (default: SEASON)")
+    parser.add_argument('--benchmark', action='store_true', help="Time the engine on synthetic standings")
+    args = parser.parse_args()
+
+    processes = args.processes or os.cpu_count() or 1
+
+    if args.benchmark:
+        run_benchmark(args.simulations, processes)
+        return
+
+    from pipeline import SEASON, fetch_all
+    from records import split_by_league
+    from seasons import games_per_season
+    from standings import create_divisions_dict
+
+    season = args.season or SEASON
+    teams, remaining = fetch_all(season)
+    remaining_by_team = remaining.by_team if remaining is not None else None
+    team_names = {team.team_id: team.name for team in teams}
+    leagues = split_by_league(teams)
+
+    for league_name in ("American League", "National League"):
+        divisions = create_divisions_dict(leagues[league_name])
+
+        start_time = time.time()
+        odds = simulate_playoff_odds(divisions, args.simulations, processes, args.seed, games_per_season(season),
+                                     remaining_by_team, remaining)
+        print(f"\n{league_name} ({args.simulations:,} simulations in {time.time() - start_time:.3f} seconds)")
+        print_odds_table(odds, team_names)
+
+
+if __name__ == '__main__':
+    main()
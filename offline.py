@@ -0,0 +1,204 @@
+import argparse
+import contextlib
+import copy
+import json
+import os
+import random
+import threading
+import time
+
+from datetime import date
+
+import statsapi
+
+
+# Offline stand-ins for the MLB Stats API and Supabase
+#
+# OfflineStatsApi answers statsapi.get('teams'), statsapi.standings_data and
+# statsapi.schedule from JSON fixtures in fixtures/. The fixtures are a
+# snapshot of the API on meta.json's recorded_at date, so schedule date
+# filters are applied relative to that day rather than the real today, and
+# seasons.game_day() returns that day while the stand-in is in use.
+#
+# The bundled fixtures are sample data in the exact response shapes
+# (source: "sample" in meta.json). With network access, replace them with a
+# live recording:
+#   python offline.py record --season 2025
+#
+# FakeSupabase is an in-process client covering the calls this app makes
+# (table().select().execute(), table().upsert(rows, on_conflict=).execute())
+# with configurable latency and failure injection.
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name, fixtures_dir=FIXTURES_DIR):
+    with open(os.path.join(fixtures_dir, f"{name}.json")) as f:
+        return json.load(f)
+
+
+class OfflineStatsApi:
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=0.0):
+        self.latency = latency
+        self.teams = load_fixture('teams', fixtures_dir)
+        # JSON object keys are strings, statsapi keys divisions by int id
+        self.standings = {int(division_id): division for division_id, division in load_fixture('standings', fixtures_dir).items()}
+        self.games = load_fixture('schedule', fixtures_dir)
+        self.meta = load_fixture('meta', fixtures_dir)
+        self.calls = 0
+
+    def _respond(self, payload):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        # Callers get their own copy, same as a fresh API response
+        return copy.deepcopy(payload)
+
+    def get(self, endpoint, params=None, **kwargs):
+        if endpoint != 'teams':
+            raise ValueError(f"No fixture for endpoint {endpoint}")
+        return self._respond(self.teams)
+
+    def standings_data(self, *args, **kwargs):
+        return self._respond(self.standings)
+
+    def schedule(self, date=None, start_date=None, end_date=None, **kwargs):
+        start_date = start_date or date
+        end_date = end_date or date
+        # Nothing before the recording day is in the fixture
+        if start_date is None or start_date > self.meta['recorded_at']:
+            start_date = self.meta['recorded_at']
+        games = [
+            game for game in self.games
+            if start_date <= game['game_date'] and (end_date is None or game['game_date'] <= end_date)
+        ]
+        return self._respond(games)
+
+
+# Swaps the statsapi functions the app uses for the offline stand-in
+@contextlib.contextmanager
+def offline_statsapi(fixtures_dir=FIXTURES_DIR, latency=0.0):
+    from seasons import pinned_game_day
+
+    stand_in = OfflineStatsApi(fixtures_dir, latency)
+    originals = (statsapi.get, statsapi.standings_data, statsapi.schedule)
+    statsapi.get = stand_in.get
+    statsapi.standings_data = stand_in.standings_data
+    statsapi.schedule = stand_in.schedule
+    try:
+        with pinned_game_day(date.fromisoformat(stand_in.meta['recorded_at'])):
+            yield stand_in
+    finally:
+        statsapi.get, statsapi.standings_data, statsapi.schedule = originals
+
+
+class FakeSupabaseError(Exception):
+    pass
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.operation = 'select'
+        self.rows = None
+        self.on_conflict = 'id'
+        self.filters = []
+
+    def select(self, columns='*'):
+        self.operation = 'select'
+        return self
+
+    def upsert(self, rows, on_conflict='id'):
+        self.operation = 'upsert'
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def execute(self):
+        return self.client._execute(self)
+
+
+class FakeSupabase:
+    def __init__(self, latency=0.0, failure_rate=0.0, fail_next=0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_next = fail_next
+        self.tables = {}
+        self.requests = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    # Pre-loads rows as if they had been written earlier
+    def seed_table(self, name, rows, key='team_id'):
+        self.tables[name] = {row[key]: dict(row) for row in rows}
+
+    def _execute(self, query):
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.requests.append((query.table_name, query.operation, len(query.rows or [])))
+
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                raise FakeSupabaseError(f"Injected failure on {query.operation} {query.table_name}")
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                raise FakeSupabaseError(f"Random failure on {query.operation} {query.table_name}")
+
+            table = self.tables.setdefault(query.table_name, {})
+
+            if query.operation == 'upsert':
+                for row in query.rows:
+                    key = row[query.on_conflict]
+                    table[key] = {**table.get(key, {}), **row}
+                return FakeResponse([dict(table[row[query.on_conflict]]) for row in query.rows])
+
+            rows = [dict(row) for row in table.values()]
+            for column, value in query.filters:
+                rows = [row for row in rows if row.get(column) == value]
+            return FakeResponse(rows)
+
+
+# Writes live API responses to the fixtures folder (needs network access)
+def record_fixtures(season, fixtures_dir=FIXTURES_DIR):
+    from seasons import game_day
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    today = game_day().isoformat()
+    responses = {
+        'teams': statsapi.get('teams', {'sportId': 1}),
+        'standings': statsapi.standings_data(season=season),
+        'schedule': statsapi.schedule(start_date=today, end_date=f"{season}-12-31", season=season),
+        'meta': {'recorded_at': today, 'season': season, 'source': 'statsapi.mlb.com'}
+    }
+    for name, payload in responses.items():
+        with open(os.path.join(fixtures_dir, f"{name}.json"), 'w') as f:
+            json.dump(payload, f)
+    print(f"Recorded {len(responses)} fixtures to {fixtures_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MLB Stats API fixtures")
+    parser.add_argument('command', choices=['record'])
+    parser.add_argument('--season', default='2025')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_fixtures(args.season)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,441 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import statsapi
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import date, datetime, timedelta, timezone
+from dotenv import load_dotenv
+from supabase import create_client
+
+import metrics
+
+from clinch import clinch_scenarios
+from elimination import EliminationEngine, build_leagues, compare_with_api_flags
+from metrics import response_size
+from records import build_table_rows, build_team_records, project_standings_response, project_teams_response
+from resilience import CircuitBreaker, CircuitOpenError
+from response_cache import ResponseCache
+from schedule import LOOKAHEAD_DAYS, SCHEDULE_DIR, SeasonSchedule, schedule_path
+from seasons import CURRENT_SEASON, game_day, games_per_season
+from snapshot import compute_version
+from standings import compute_standings, win_percentage
+
+
+# Fetch -> compute -> persist pipeline for the teams table
+# Shared by the ingestion worker (ingest.py); the Streamlit page only reads
+# what this pipeline has already written
+
+# Season the worker keeps live in the teams table (SEASON environment variable)
+SEASON = CURRENT_SEASON
+
+
+def create_supabase_client():
+    load_dotenv() # Loads .env file
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+    return create_client(url, key)
+
+
+# Disk cache under the teams and standings calls (see response_cache.py).
+# Teams hardly change during a season, standings change with every final.
+TEAMS_CACHE_TTL_SECONDS = 3 * 24 * 3600
+STANDINGS_CACHE_TTL_SECONDS = 5 * 60
+
+response_cache = ResponseCache()
+
+
+# Fetches through the response cache, recording the outcome and API bytes on span.
+# project turns the raw response into what gets cached and returned.
+def cached_fetch(span, key, ttl_seconds, fetch, project):
+    def fetch_and_count():
+        payload = fetch()
+        span.count('api_bytes', response_size(payload))
+        return project(payload)
+
+    payload, outcome = response_cache.get_or_fetch(key, ttl_seconds, fetch_and_count)
+    span.count(f"cache_{outcome}")
+    return payload
+
+
+# Both return the compact projections from records.py, that's what gets cached.
+# Cache keys include the season, so seasons never share entries.
+def fetch_teams_data(season=SEASON):
+    with metrics.span('fetch.teams') as span:
+        return cached_fetch(span, f"teams:{season}", TEAMS_CACHE_TTL_SECONDS,
+                            lambda: statsapi.get('teams', {'sportId': 1, 'season': season}), project_teams_response)
+
+
+def fetch_standing_data(season=SEASON):
+    with metrics.span('fetch.standings') as span:
+        return cached_fetch(span, f"standings:{season}", STANDINGS_CACHE_TTL_SECONDS,
+                            lambda: statsapi.standings_data(season=season), project_standings_response)
+
+
+# Remaining-schedule index per season (see schedule.py), kept across worker
+# runs and on disk. The first run of a season fetches the whole schedule,
+# later runs only the days since the last update plus the next few.
+season_schedules = {}
+schedule_dir = SCHEDULE_DIR
+_schedule_lock = threading.Lock()
+
+
+def fetch_remaining_schedule(season=SEASON):
+    today = game_day()
+    # A hung fetch can outlive its run, don't let two update the index at once
+    with _schedule_lock:
+        schedule = season_schedules.get(season) or SeasonSchedule.load(schedule_path(season, schedule_dir))
+
+        with metrics.span('fetch.schedule') as span:
+            if schedule is None:
+                games = statsapi.schedule(start_date=f"{season}-01-01", end_date=f"{season}-12-31", season=season)
+                span.count('full_fetches')
+            else:
+                end_date = (today + timedelta(days=LOOKAHEAD_DAYS)).isoformat()
+                games = statsapi.schedule(start_date=schedule.updated_through, end_date=end_date, season=season)
+            span.count('api_bytes', response_size(games))
+
+        with metrics.span('compute.schedule') as span:
+            if schedule is None:
+                schedule = SeasonSchedule.build(season, games, today.isoformat())
+            else:
+                span.count('finals_applied', schedule.update(games, today.isoformat()))
+            schedule.updated_through = today.isoformat()
+            try:
+                schedule.save(schedule_path(season, schedule_dir))
+            except OSError as e:
+                print(f"Could not save schedule index: {e}")
+            season_schedules[season] = schedule
+            return schedule.remaining_schedule()
+
+
+# Deadlines and circuit breakers for the MLB calls
+# statsapi has no request timeout, so a hung call is abandoned after its
+# deadline rather than blocking the run. Three failures or timeouts in a row
+# open that endpoint's breaker for 5 minutes, and calls fail fast meanwhile.
+
+FETCH_DEADLINES_SECONDS = {'teams': 10, 'standings': 10, 'schedule': 20}
+
+api_breakers = {name: CircuitBreaker(f"MLB {name}") for name in FETCH_DEADLINES_SECONDS}
+
+# Long lived pool: a hung call keeps its thread, but the run doesn't wait for it
+_fetch_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix='mlb-fetch')
+
+
+class FetchError(Exception):
+    pass
+
+
+def submit_fetch(name, fn):
+    api_breakers[name].before_call()
+    return _fetch_executor.submit(fn)
+
+
+# Waits for a submitted fetch until deadline (a time.monotonic() value)
+def collect_fetch(name, future, deadline):
+    breaker = api_breakers[name]
+    try:
+        result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        breaker.record_failure()
+        raise FetchError(f"MLB {name} call timed out after {FETCH_DEADLINES_SECONDS[name]} seconds")
+    except Exception as e:
+        breaker.record_failure()
+        raise FetchError(f"MLB {name} call failed: {e}") from e
+    breaker.record_success()
+    return result
+
+
+def fetch_all(season=SEASON):
+    # Multithreading for API calls, each fetch records its own span
+    with metrics.span('fetch') as span:
+        start = time.monotonic()
+        fetchers = {
+            'teams': lambda: fetch_teams_data(season),
+            'standings': lambda: fetch_standing_data(season),
+            'schedule': lambda: fetch_remaining_schedule(season)
+        }
+
+        # Submit requests (all start immediately), an open breaker fails fast
+        requests = {}
+        for name, fn in fetchers.items():
+            try:
+                requests[name] = submit_fetch(name, fn)
+            except CircuitOpenError as e:
+                span.count('breaker_open')
+                requests[name] = e
+
+        # Pull responses once there ready, each within its own deadline
+        results = {}
+        for name, request in requests.items():
+            try:
+                if isinstance(request, CircuitOpenError):
+                    raise FetchError(str(request))
+                results[name] = collect_fetch(name, request, start + FETCH_DEADLINES_SECONDS[name])
+            except FetchError as e:
+                span.count('fetch_failures')
+                # Without the schedule we fall back to the API's elimination flags
+                if name == 'schedule':
+                    print(f"Could not fetch remaining schedule: {e}")
+                    results[name] = None
+                else:
+                    raise
+
+    # One TeamRecord per team (see records.py) and the remaining schedule
+    return build_team_records(results['teams'], results['standings']), results['schedule']
+
+
+# Kept across worker runs so only leagues with a new result are re-evaluated
+elimination_engine = EliminationEngine()
+
+
+# Exact elimination/clinch from the remaining schedule (see elimination.py),
+# logging any team where the API says eliminated but the local engine doesn't
+def calculate_local_elimination(teams, remaining):
+    with metrics.span('compute.elimination') as span:
+        results = elimination_engine.update(build_leagues(teams), remaining)
+
+        for team_id, kind, reason in compare_with_api_flags(results, teams):
+            print(f"Elimination mismatch for team {team_id} ({kind}): {reason}")
+            span.count('api_mismatches')
+
+    return results
+
+
+# Builds one teams table row per team from the TeamRecords: standings data,
+# plus seeding, magic numbers, distance and elimination flags from the
+# standings engine (see standings.py), and from the remaining schedule the
+# clinch scenarios and remaining strength of schedule.
+def compute_snapshot(teams, remaining=None, season=SEASON):
+    local_elimination = {}
+    if remaining is not None:
+        local_elimination = calculate_local_elimination(teams, remaining)
+
+    computed = compute_standings(teams, local_elimination, games_per_season(season))
+    rows = build_table_rows(teams, computed)
+
+    scenarios = {}
+    strength_of_schedule = {}
+    if remaining is not None:
+        scenarios = calculate_clinch_scenarios(teams, remaining, computed, season)
+        if remaining.index is not None:
+            strength_of_schedule = remaining.index.strength_of_schedule({team.team_id: win_percentage(team) for team in teams})
+    for row in rows:
+        row['clinch_scenarios'] = scenarios.get(row['team_id'])
+        row['remaining_sos'] = strength_of_schedule.get(row['team_id'])
+    return rows
+
+
+# What clinches or eliminates each team on the next game day (see clinch.py)
+def calculate_clinch_scenarios(teams, remaining, computed, season=SEASON):
+    if remaining.next_day == game_day().isoformat():
+        day_label = "tonight"
+    else:
+        day_label = date.fromisoformat(remaining.next_day).strftime('on %b %-d') if remaining.next_day else ""
+
+    with metrics.span('compute.clinch_scenarios') as span:
+        scenarios = clinch_scenarios(teams, remaining.next_games, computed, games_per_season(season), day_label)
+        span.count('games', len(remaining.next_games))
+    return scenarios
+
+
+# Diff-based writes
+# Each team row is hashed; only rows whose hash changed since the last
+# successful write are sent. Hashes live in memory and in a small JSON file
+# so a restarted worker doesn't rewrite all 30 teams.
+
+ROW_HASHES_PATH = os.environ.get("ROW_HASHES_PATH", os.path.join(".cache", "row_hashes.json"))
+
+_row_hashes = None
+# The write-behind thread (remember_written) and the worker (persist_snapshot)
+# both read and update the hashes. Reentrant: the helpers below take it too.
+_row_hashes_lock = threading.RLock()
+
+
+def hash_row(row):
+    payload = json.dumps(row, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def load_row_hashes():
+    global _row_hashes
+    with _row_hashes_lock:
+        if _row_hashes is None:
+            try:
+                with open(ROW_HASHES_PATH) as f:
+                    _row_hashes = json.load(f)
+            except (OSError, ValueError):
+                _row_hashes = {}
+        return _row_hashes
+
+
+def save_row_hashes(hashes):
+    os.makedirs(os.path.dirname(ROW_HASHES_PATH) or '.', exist_ok=True)
+    tmp_path = ROW_HASHES_PATH + '.tmp'
+    with _row_hashes_lock:
+        with open(tmp_path, 'w') as f:
+            json.dump(hashes, f)
+        # Atomic swap so a crash mid-write never leaves a corrupt file
+        os.replace(tmp_path, ROW_HASHES_PATH)
+
+
+# Returns the rows that differ from what was last written, with their new hashes
+def find_changed_rows(rows):
+    changed_rows = []
+    new_hashes = {}
+    with _row_hashes_lock:
+        hashes = load_row_hashes()
+        for row in rows:
+            key = str(row['team_id'])  # JSON object keys are strings
+            row_hash = hash_row(row)
+            if hashes.get(key) != row_hash:
+                changed_rows.append(row)
+                new_hashes[key] = row_hash
+    return changed_rows, new_hashes
+
+
+# Single batch upsert, falls back to one row at a time if the batch fails.
+# Returns the team_ids that were written.
+def upsert_teams(supabase, rows):
+    with metrics.span('persist.upsert') as span:
+        try:
+            supabase.table('teams').upsert(rows, on_conflict='team_id').execute()
+            span.count('requests')
+            span.count('rows_written', len(rows))
+            return [row['team_id'] for row in rows]
+        except Exception as e:
+            print(f"Could not update teams: {e}")
+            span.count('batch_failures')
+            # Fallback to individual inserts if batch fails
+            written = []
+            for row in rows:
+                span.count('requests')
+                try:
+                    supabase.table('teams').upsert(row, on_conflict='team_id').execute()
+                    written.append(row['team_id'])
+                except Exception as individual_error:
+                    print(f"Error updating team {row['team_id']}: {individual_error}")
+                    span.count('row_failures')
+            span.count('rows_written', len(written))
+            return written
+
+
+# on_written callback for a WriteBehindQueue: remembers the hashes of teams
+# rows once they're in the database
+def remember_written(table, rows):
+    if table != 'teams':
+        return
+    with _row_hashes_lock:
+        hashes = load_row_hashes()
+        for row in rows:
+            hashes[str(row['team_id'])] = hash_row(row)
+        save_row_hashes(hashes)
+
+
+# Writes only the changed rows in one upsert. No request at all when nothing changed.
+# full=True ignores the stored hashes and rewrites every team.
+# With a writer (WriteBehindQueue, see write_behind.py) the rows are queued
+# and this returns without waiting on the database; hashes are saved by
+# remember_written as the writer gets them through.
+# With a local_store (LocalStore, see local_store.py) every row is written
+# through to it first, whatever the hashes say.
+def persist_snapshot(supabase, rows, full=False, writer=None, local_store=None):
+    with metrics.span('persist') as span:
+        if local_store is not None:
+            with metrics.span('persist.local'):
+                local_store.table('teams').upsert(rows, on_conflict='team_id').execute()
+
+        if full:
+            with _row_hashes_lock:
+                load_row_hashes().clear()
+
+        changed_rows, new_hashes = find_changed_rows(rows)
+        span.count('rows_unchanged', len(rows) - len(changed_rows))
+        if not changed_rows:
+            return 0
+
+        if writer is not None:
+            queued = writer.put_many('teams', changed_rows, 'team_id')
+            span.count('rows_queued', queued)
+            return queued
+
+        written = upsert_teams(supabase, changed_rows)
+
+        # Only remember hashes for rows that actually made it to the database
+        with _row_hashes_lock:
+            hashes = load_row_hashes()
+            for team_id in written:
+                hashes[str(team_id)] = new_hashes[str(team_id)]
+            save_row_hashes(hashes)
+        return len(written)
+
+
+# A run that changed no rows only sends its ingest_status row if the last one
+# sent is this old, often enough that the page never shows a healthy worker
+# as stale (app.STALE_AFTER_SECONDS)
+STATUS_HEARTBEAT_SECONDS = 45 * 60
+
+_status_sent = None  # (time.monotonic(), error) of the last ingest_status row sent
+
+
+# One row per worker in the ingest_status table. The page reads
+# last_success_at to tell how old the standings are (staleness badge).
+# With a writer it's queued behind the teams rows of the same run, and a
+# success turns into an error if those rows are given up on.
+# rows_changed=0 (nothing to write) skips the database unless the last status
+# sent was an error or is due for a heartbeat; the local store is always updated.
+def record_ingest_status(supabase, error=None, writer=None, local_store=None, rows_changed=None):
+    global _status_sent
+    now = datetime.now(timezone.utc).isoformat()
+    status = {'id': 1, 'last_attempt_at': now, 'last_error': str(error) if error else None}
+    if error is None:
+        status['last_success_at'] = now
+    if local_store is not None:
+        try:
+            local_store.table('ingest_status').upsert(status, on_conflict='id').execute()
+        except Exception as e:
+            print(f"Could not update local ingest status: {e}")
+
+    if error is None and rows_changed == 0 and _status_sent is not None and _status_sent[1] is None \
+            and time.monotonic() - _status_sent[0] < STATUS_HEARTBEAT_SECONDS:
+        return
+    _status_sent = (time.monotonic(), error)
+
+    if writer is not None:
+        def write_failed(write_error):
+            return {'id': 1, 'last_attempt_at': now, 'last_error': f"Could not write teams: {write_error}"}
+
+        writer.put('ingest_status', status, 'id', fallback=write_failed if error is None else None)
+        return
+    try:
+        supabase.table('ingest_status').upsert(status, on_conflict='id').execute()
+    except Exception as e:
+        print(f"Could not update ingest status: {e}")
+
+
+# writer: optional WriteBehindQueue, the run then only queues its writes
+# local_store: optional LocalStore, written through synchronously, and each new
+# version of the rows is added to its snapshot history
+def run_pipeline(supabase, full=False, season=SEASON, writer=None, local_store=None):
+    rows_counter = 'rows_written' if writer is None else 'rows_queued'
+    with metrics.span('ingest.run') as span:
+        try:
+            teams, remaining = fetch_all(season)
+            with metrics.span('compute'):
+                rows = compute_snapshot(teams, remaining, season)
+            rows_changed = persist_snapshot(supabase, rows, full=full, writer=writer, local_store=local_store)
+            span.count(rows_counter, rows_changed)
+            if local_store is not None:
+                local_store.record_snapshot(rows, compute_version(rows), time.time(), season)
+        except Exception as e:
+            # The teams table keeps the last good rows; the page shows them as stale
+            record_ingest_status(supabase, e, writer, local_store)
+            raise
+        record_ingest_status(supabase, writer=writer, local_store=local_store, rows_changed=rows_changed)
+
+    print(f"Ingestion run took {span.duration:.3f} seconds, {span.counters[rows_counter]} rows {'written' if writer is None else 'queued'}")
+    return rows
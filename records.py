@@ -0,0 +1,142 @@
+# Compact team records
+#
+# statsapi.get('teams') and statsapi.standings_data return large nested dicts
+# (venue links, springLeague, sport ranks, ...) of which the pipeline reads
+# about a dozen fields per team. Both responses are projected once, at fetch
+# time, into flat lists of typed values; those lists are what the response
+# cache stores and what TeamRecord is built from. Everything downstream
+# (seeding, magic numbers, elimination, odds, teams table rows) reads
+# TeamRecord attributes.
+#
+# Typed values:
+# - wc_rank is None for division leaders (the API's '-')
+# - gb is 0.0 for division leaders, wc_gb is 0.0 for '-' and None when missing
+# - elim_num / wc_elim_num stay strings, 'E' means eliminated
+
+TEAM_FIELDS = ('team_id', 'name', 'abbreviation', 'division', 'league')
+STANDINGS_FIELDS = ('w', 'l', 'gb', 'div_rank', 'wc_rank', 'wc_gb', 'league_rank', 'elim_num', 'wc_elim_num')
+
+
+class TeamRecord:
+    __slots__ = TEAM_FIELDS + STANDINGS_FIELDS
+
+    def __init__(self, team_fields, standings_fields):
+        for name, value in zip(TEAM_FIELDS, team_fields):
+            setattr(self, name, value)
+        for name, value in zip(STANDINGS_FIELDS, standings_fields):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"TeamRecord({self.abbreviation} {self.w}-{self.l})"
+
+    @property
+    def games_played(self):
+        return self.w + self.l
+
+    @property
+    def is_division_leader(self):
+        return self.wc_rank is None
+
+
+def _rank(value, default=None):
+    return default if value in ('-', '', None) else int(value)
+
+
+def _games_back(value):
+    if value == '-':
+        return 0.0
+    return float(value) if value else None
+
+
+# [[team_id, name, abbreviation, division, league], ...] from statsapi.get('teams')
+def project_teams_response(data):
+    return [
+        [team['id'], team['name'], team['abbreviation'], team['division']['name'], team['league']['name']]
+        for team in data['teams']
+    ]
+
+
+# [[team_id, w, l, gb, div_rank, wc_rank, wc_gb, league_rank, elim_num, wc_elim_num], ...]
+# from statsapi.standings_data
+def project_standings_response(standings_data):
+    rows = []
+    for division in standings_data.values():
+        for team in division['teams']:
+            rows.append([
+                team['team_id'], team['w'], team['l'],
+                _games_back(team['gb']) or 0.0,
+                _rank(team['div_rank'], default=1),
+                _rank(team['wc_rank']),
+                _games_back(team['wc_gb']),
+                _rank(team['league_rank']),
+                team['elim_num'], team['wc_elim_num']
+            ])
+    return rows
+
+
+# Joins the two projections, in the order of the teams response
+def build_team_records(team_rows, standings_rows):
+    standings_by_id = {row[0]: row[1:] for row in standings_rows}
+    return [TeamRecord(team_row, standings_by_id[team_row[0]]) for team_row in team_rows]
+
+
+def split_by_league(teams):
+    leagues = {}
+    for team in teams:
+        leagues.setdefault(team.league, []).append(team)
+    return leagues
+
+
+# One teams table row per team: standings data plus the computed columns
+# ({team_id: {column: value}}, see standings.compute_standings)
+def build_table_rows(teams, computed):
+    rows = []
+    for team in teams:
+        rows.append({
+            'team_id': team.team_id,
+            'team_name': team.name,
+            'abbreviation': team.abbreviation,
+            'division': team.division,
+            'league': team.league,
+
+            # standings data
+            'wins': team.w,
+            'losses': team.l,
+            'games_played': team.games_played,
+            'win_percentage': round(float(team.w / team.games_played), 3),
+            'division_rank': team.div_rank,
+            'games_back_in_division': team.gb,
+            'wild_card_rank': team.wc_rank,
+            'games_back_in_wild_card': team.wc_gb,
+            'league_rank': team.league_rank,
+
+            **computed[team.team_id]
+        })
+    return rows
+
+
+# Columns that come from the remaining schedule rather than the standings:
+# rows rebuilt from records (live, what-if) keep the source row's values
+SCHEDULE_COLUMNS = ('remaining_sos',)
+
+
+def carry_schedule_columns(rows, source_rows):
+    source = {row['team_id']: row for row in source_rows}
+    for row in rows:
+        for column in SCHEDULE_COLUMNS:
+            row[column] = source[row['team_id']].get(column)
+    return rows
+
+
+# TeamRecords back from teams table rows (e.g. the page's snapshot).
+# Elimination flags come back as 'E' so a recompute keeps them.
+def records_from_table_rows(rows):
+    return [
+        TeamRecord(
+            (row['team_id'], row['team_name'], row['abbreviation'], row['division'], row['league']),
+            (row['wins'], row['losses'], row['games_back_in_division'], row['division_rank'], row['wild_card_rank'],
+             row['games_back_in_wild_card'], int(row['league_rank']),
+             'E' if row['eliminated_from_division'] else '', 'E' if row['eliminated_from_wildcard'] else '')
+        )
+        for row in rows
+    ]
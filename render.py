@@ -0,0 +1,216 @@
+import hashlib
+import html
+import threading
+
+from collections import OrderedDict
+
+
+# HTML for one division: the racing lanes and the team data column
+#
+# All colours and layout live in one shared stylesheet (STYLESHEET_HTML, sent
+# once per page) keyed by status classes: clinched, leader, wildcard,
+# eliminated, chasing. Per-team markup only carries the class and the car
+# position.
+#
+# The output only depends on the division's team state, so built fragments are
+# kept in a bounded LRU cache keyed by a hash of that state. Unchanged divisions
+# are served from the cache without re-templating.
+
+# Every field the lanes or data column read
+FRAGMENT_FIELDS = (
+    'team_id', 'team_name', 'abbreviation', 'wins', 'losses', 'division_rank',
+    'games_back_in_division', 'wild_card_rank', 'magic_number_division',
+    'magic_number_wild_card', 'tragic_number_wild_card', 'distance_from_clinched_division',
+    'eliminated_from_division', 'eliminated_from_wildcard', 'clinch_scenarios', 'remaining_sos'
+)
+
+
+def division_state_hash(teams_in_div):
+    state = [
+        (rank, tuple(teams_in_div[rank].get(field) for field in FRAGMENT_FIELDS))
+        for rank in sorted(teams_in_div.keys())
+    ]
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+
+# One shared stylesheet for the whole page, emitted once per render.
+# Each status class sets the colours the lanes, data rows and legend read.
+STYLESHEET = """
+.rt-clinched{--rt-color:#4caf50;--rt-text:white;--rt-bg:linear-gradient(135deg,rgba(76,175,80,.9),rgba(102,187,106,.9))}
+.rt-leader{--rt-color:#ffd93d;--rt-text:#333;--rt-bg:linear-gradient(135deg,rgba(255,217,61,.9),rgba(255,237,78,.9))}
+.rt-wildcard{--rt-color:#4d96ff;--rt-text:white;--rt-bg:linear-gradient(135deg,rgba(77,150,255,.9),rgba(103,181,255,.9))}
+.rt-eliminated{--rt-color:#666;--rt-text:#ccc;--rt-bg:linear-gradient(135deg,rgba(66,66,66,.8),rgba(97,97,97,.8))}
+.rt-chasing{--rt-color:#9e9e9e;--rt-text:#333;--rt-bg:linear-gradient(135deg,rgba(158,158,158,.8),rgba(189,189,189,.8))}
+.rt-stack{display:flex;flex-direction:column;gap:8px}
+.rt-lane{position:relative;height:50px;background:linear-gradient(90deg,rgba(220,53,69,.15) 0%,rgba(255,193,7,.15) 35%,rgba(40,167,69,.15) 85%,rgba(40,167,69,.2) 100%);border-radius:25px;border:1px solid rgba(255,255,255,.15);overflow:hidden}
+.rt-lane::before{content:"";position:absolute;top:30%;bottom:30%;left:5%;right:8%;border-top:1px dashed rgba(255,255,255,.3);border-bottom:1px dashed rgba(255,255,255,.3)}
+.rt-lane::after{content:"";position:absolute;right:8%;top:8%;bottom:8%;width:3px;background:linear-gradient(180deg,#28a745,#40e95e);border-radius:1px;box-shadow:0 0 4px rgba(40,167,69,.4)}
+.rt-car{position:absolute;top:50%;transform:translateY(-50%);width:34px;height:34px;border-radius:50%;display:flex;align-items:center;justify-content:center;font-weight:700;font-size:8px;color:var(--rt-text);background:var(--rt-bg);border:2px solid var(--rt-color);transition:all .3s ease;z-index:10}
+.rt-car.rt-clinched{box-shadow:0 0 10px rgba(40,167,69,.6)}
+.rt-row{height:50px;display:flex;align-items:center;text-align:left;padding:0 12px;background:rgba(0,0,0,.2);border-radius:8px;border-left:3px solid var(--rt-color);font-size:.85rem;line-height:1.2}
+.rt-name{font-weight:600;color:white}
+.rt-line{font-size:.75rem;opacity:.8;color:white}
+.rt-status{color:var(--rt-color)}
+.rt-row>div{min-width:0}
+.rt-tonight{font-size:.7rem;color:#ffd93d;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}
+.rt-footer{position:fixed;bottom:0;left:0;width:100%;background:rgba(30,30,40,.95);padding:10px;z-index:999;border-top:1px solid rgba(255,217,61,.3);backdrop-filter:blur(5px);display:flex;justify-content:center;flex-wrap:wrap;gap:15px;align-items:center}
+.rt-footer b{color:#ffd93d;font-size:.85rem}
+.rt-footer span{display:flex;align-items:center;gap:5px;color:white;font-size:.8rem}
+.rt-dot{width:16px;height:16px;border-radius:50%;background:var(--rt-bg);border:2px solid var(--rt-color)}
+.rt-line-key{width:3px;height:16px;background:linear-gradient(180deg,#28a745,#40e95e);border-radius:1px}
+.rt-stale{display:table;margin:0 auto 10px;padding:4px 12px;border-radius:12px;background:rgba(255,193,7,.15);border:1px solid rgba(255,193,7,.6);color:#ffc107;font-size:.85rem}
+"""
+
+STYLESHEET_HTML = f"<style>{STYLESHEET.strip()}</style>"
+
+FOOTER_HTML = (
+    '<div class="rt-footer"><b>Legend:</b>'
+    '<span><i class="rt-dot rt-eliminated"></i>Eliminated</span>'
+    '<span><i class="rt-dot rt-chasing"></i>Chasing</span>'
+    '<span><i class="rt-dot rt-wildcard"></i>Wild Card</span>'
+    '<span><i class="rt-dot rt-leader"></i>Division Leader</span>'
+    '<span><i class="rt-dot rt-clinched"></i>Clinched</span>'
+    '<span><i class="rt-line-key"></i>Clinch Line</span>'
+    '</div>'
+)
+
+def format_age(seconds):
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "less than a minute"
+    if minutes < 120:
+        return f"{minutes} min"
+    return f"{minutes // 60} h"
+
+
+# Shown above the standings when they are older than they should be
+def build_stale_badge_html(age_seconds):
+    return f'<div class="rt-stale">⚠️ Standings from {format_age(age_seconds)} ago, live data is delayed</div>'
+
+
+# Label and emoji shown in the data column for each status
+STATUS_TEXT = {
+    'clinched': ("CLINCHED DIVISION", "🏆"),
+    'leader': ("LEADING", "🥇"),
+    'wildcard': ("PLAYOFFS", "🎯"),
+    'eliminated': ("ELIMINATED", "❌"),
+    'chasing': ("CHASING", "⚔️")
+}
+
+
+def has_clinched_division(team):
+    # Clinched division once the magic number reaches 0 or less
+    magic_number = team.get('magic_number_division')
+    return magic_number is not None and magic_number <= 0
+
+
+def team_status(team):
+    if has_clinched_division(team) and team['division_rank'] == 1:
+        return 'clinched'
+    if team['division_rank'] == 1:
+        return 'leader'
+    if team['wild_card_rank'] is not None and team['wild_card_rank'] <= 3:
+        return 'wildcard'
+    if team['eliminated_from_division']:
+        return 'eliminated'
+    return 'chasing'
+
+
+def lane_position(team):
+    # If clinched, place them clearly past the finish line
+    if has_clinched_division(team):
+        return 92
+
+    # Position based on distance_from_clinched_division, max 85% to leave room for finish zone
+    distance = team.get('distance_from_clinched_division')
+    if distance is None:
+        distance = 80
+    max_distance = 163
+    return round((max_distance - distance) / max_distance * 85, 1)
+
+
+# Racing lanes: one lane per team, only the car position is inline
+def build_lanes_html(teams_in_div):
+    lanes_html = '<div class="rt-stack">'
+    for rank in sorted(teams_in_div.keys()):
+        team = teams_in_div[rank]
+        lanes_html += (
+            f'<div class="rt-lane"><div class="rt-car rt-{team_status(team)}" '
+            f'style="left:{lane_position(team)}%">{team["abbreviation"]}</div></div>'
+        )
+    return lanes_html + '</div>'
+
+
+# Team data: single line per team, same 50px height as the lanes
+def build_data_html(teams_in_div):
+    data_html = '<div class="rt-stack">'
+    for rank in sorted(teams_in_div.keys()):
+        team = teams_in_div[rank]
+        status = team_status(team)
+        label, emoji = STATUS_TEXT[status]
+
+        record = f"{team['wins']}-{team['losses']}"
+        win_pct = f"{team['wins']/(team['wins'] + team['losses']):.3f}"
+        if status in ('wildcard', 'chasing'):
+            games_back = f"{team['games_back_in_division']:.1f}" if team['games_back_in_division'] else "LEAD"
+            label = f"{label} • {games_back} GB"
+
+        # Division magic number for leaders, wild card magic/elimination number for everyone else
+        magic_text = ""
+        if status == 'leader' and team.get('magic_number_division') is not None:
+            magic_text = f" • Magic #: {team['magic_number_division']}"
+        elif team.get('magic_number_wild_card') is not None:
+            magic_text = f" • WC Magic #: {team['magic_number_wild_card']}"
+        elif team.get('tragic_number_wild_card'):
+            magic_text = f" • Elim #: {team['tragic_number_wild_card']}"
+
+        # Remaining strength of schedule: opponents' win percentage, weighted by games left
+        sos_text = ""
+        if team.get('remaining_sos') is not None:
+            sos_text = f" • SOS {team['remaining_sos']:.3f}".replace(" 0.", " .")
+
+        # What clinches or eliminates the team on the next game day (see clinch.py)
+        tonight_html = ""
+        if team.get('clinch_scenarios'):
+            scenario = html.escape(team['clinch_scenarios'])
+            tonight_html = f'<div class="rt-tonight" title="{scenario}">{scenario}</div>'
+
+        data_html += (
+            f'<div class="rt-row rt-{status}"><div>'
+            f'<div class="rt-name">{emoji} {team["team_name"]}</div>'
+            f'<div class="rt-line">{record} ({win_pct}){magic_text}{sos_text} • <span class="rt-status">{label}</span></div>'
+            f'{tonight_html}'
+            f'</div></div>'
+        )
+    return data_html + '</div>'
+
+
+class FragmentCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Returns (lanes_html, data_html) for a division, building it only on a miss
+    def get(self, teams_in_div):
+        key = division_state_hash(teams_in_div)
+
+        with self._lock:
+            if key in self._fragments:
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                return self._fragments[key]
+
+        fragments = (build_lanes_html(teams_in_div), build_data_html(teams_in_div))
+
+        with self._lock:
+            self.misses += 1
+            self._fragments[key] = fragments
+            self._fragments.move_to_end(key)
+            # Evict the least recently used divisions
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+        return fragments
@@ -0,0 +1,92 @@
+import time
+
+import streamlit as st
+
+from history import SeasonHistory, history_written_at
+from render import build_data_html, build_lanes_html
+
+
+# Season replay view: the racing lanes on any day of the season, scrubbed with
+# a slider or played as an animation. Frames come from the memory-mapped
+# history (see history.py), a page view never calls the MLB API or Supabase.
+
+FRAME_SECONDS = 0.12
+
+LEAGUE_DIVISIONS = {
+    "American League": ['American League East', 'American League Central', 'American League West'],
+    "National League": ['National League East', 'National League Central', 'National League West']
+}
+
+
+# One memory map per season and backfill, shared by every session. Keyed by
+# when the history was written, so a backfill finishing (or re-running) after
+# the process started shows up.
+@st.cache_resource(max_entries=8)
+def load_season_history(season, written_at):
+    return SeasonHistory.load(season)
+
+
+# None while the season isn't backfilled, that isn't cached
+def get_season_history(season):
+    written_at = history_written_at(season)
+    if written_at is None:
+        return None
+    return load_season_history(season, written_at)
+
+
+# Empty slots for every division, filled frame by frame
+def build_layout():
+    date_slot = st.empty()
+    slots = {}
+    for column, (league, division_names) in zip(st.columns(2), LEAGUE_DIVISIONS.items()):
+        with column:
+            st.markdown(f"<h2 style='text-align: center;'>{league}</h2>", unsafe_allow_html=True)
+            for division_name in division_names:
+                st.markdown(f"<h3 style='color: #ffd93d; text-align: center; margin-bottom: 20px; font-size: 1.3rem;'>{division_name}</h3>", unsafe_allow_html=True)
+                lane_col, data_col = st.columns([2, 1])
+                with lane_col:
+                    lanes_slot = st.empty()
+                with data_col:
+                    data_slot = st.empty()
+                slots[division_name] = (lanes_slot, data_slot)
+    return date_slot, slots
+
+
+def draw_frame(history, day_index, date_slot, slots):
+    divisions_AL, divisions_NL = history.divisions_at(day_index)
+    date_slot.markdown(f"<h3 style='text-align: center;'>{history.days[day_index]}</h3>", unsafe_allow_html=True)
+    for divisions in (divisions_AL, divisions_NL):
+        for division_name, teams_in_div in divisions.items():
+            lanes_slot, data_slot = slots[division_name]
+            lanes_slot.html(build_lanes_html(teams_in_div))
+            data_slot.html(build_data_html(teams_in_div))
+
+
+# Scrubbing only reruns this fragment, not the whole page
+@st.fragment
+def render_replay(season):
+    history = get_season_history(season)
+    if history is None or len(history) == 0:
+        st.info(f"No standings history for {season} yet. Run `python history.py backfill --season {season}` on the worker.")
+        return
+
+    slider_col, button_col = st.columns([5, 1])
+    with slider_col:
+        day_index = st.select_slider(
+            "Day", options=range(len(history)), value=len(history) - 1,
+            format_func=lambda index: history.days[index], key=f"replay_day_{season}"
+        )
+    with button_col:
+        play = st.button("▶ Play season", key=f"replay_play_{season}")
+
+    date_slot, slots = build_layout()
+
+    if not play:
+        draw_frame(history, day_index, date_slot, slots)
+        return
+
+    # Play from the selected day, or from the start if it's already the last day
+    start = 0 if day_index == len(history) - 1 else day_index
+    for frame_index in range(start, len(history)):
+        draw_frame(history, frame_index, date_slot, slots)
+        time.sleep(FRAME_SECONDS)
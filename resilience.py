@@ -0,0 +1,66 @@
+import threading
+import time
+
+
+# Circuit breaker for calls to services we don't control (MLB Stats API, Supabase)
+#
+# closed    -> calls go through; failure_threshold failures in a row open it
+# open      -> calls fail straight away with CircuitOpenError for reset_seconds
+# half-open -> one trial call is let through; success closes, failure re-opens
+#
+# Timeouts count as failures: callers that wait on a future with a deadline
+# report the outcome with record_success() / record_failure() themselves.
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    # clock: seconds now, swapped for a fake one in tests
+    def __init__(self, name, failure_threshold=3, reset_seconds=300, clock=time.time):
+        self.name = name
+        self.clock = clock
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    # Raises CircuitOpenError if the call should not be attempted
+    def before_call(self):
+        with self._lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.reset_seconds:
+                    raise CircuitOpenError(f"{self.name} circuit open, skipping call")
+                # Cool-down over: let this one call through as a trial
+                self.state = HALF_OPEN
+            elif self.state == HALF_OPEN:
+                raise CircuitOpenError(f"{self.name} circuit half-open, trial call in flight")
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+    def call(self, fn, *args, **kwargs):
+        self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
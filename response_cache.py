@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+# On-disk cache for MLB API responses
+#
+# Each entry is one JSON file in RESPONSE_CACHE_DIR holding the payload, when
+# it was stored, when it was last confirmed and a content hash. A restarted
+# worker starts warm from these files instead of refetching everything.
+#
+# statsapi doesn't expose ETags, so revalidation uses the content hash: once
+# an entry is past its TTL the endpoint is fetched again, and if the hash is
+# unchanged only checked_at is bumped (the caller is told nothing changed).
+#
+# Entries carry the cache format version (entries from before versioning are
+# format 1). An entry written in another format, e.g. a raw API response from
+# before the pipeline cached records.py projections under the same key, is a
+# miss and gets refetched.
+#
+# Writes go to a temp file and are swapped in with os.replace, so a crash never
+# leaves a half written entry. When the directory grows past max_bytes the
+# least recently used entries are deleted.
+
+RESPONSE_CACHE_DIR = os.environ.get("RESPONSE_CACHE_DIR", os.path.join(".cache", "responses"))
+RESPONSE_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# Bump whenever what callers cache changes shape.
+# 2: the pipeline caches records.py projections, not raw responses
+CACHE_FORMAT_VERSION = 2
+
+
+def content_hash(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, directory=RESPONSE_CACHE_DIR, max_bytes=RESPONSE_CACHE_MAX_BYTES, format_version=CACHE_FORMAT_VERSION):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.format_version = format_version
+        self.hits = 0
+        self.misses = 0
+        self.unchanged = 0  # expired entries refetched with the same content
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        # Keys are like "standings:2025", keep file names portable
+        safe_key = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in key)
+        return os.path.join(self.directory, f"{safe_key}.json")
+
+    # The entry for key, None if there is none in this cache's format
+    def read(self, key):
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('format', 1) != self.format_version:
+            return None
+        return entry
+
+    def _write(self, key, entry):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        # Atomic swap so a crash mid-write never leaves a corrupt file
+        os.replace(tmp_path, path)
+
+    # Returns (payload, outcome): 'hit' served from disk, 'unchanged' refetched
+    # with the same content hash, 'miss' new content
+    def get_or_fetch(self, key, ttl_seconds, fetch):
+        entry = self.read(key)
+        now = time.time()
+
+        if entry is not None and now - entry['checked_at'] < ttl_seconds:
+            with self._lock:
+                self.hits += 1
+            # Touch so eviction sees this entry as recently used
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+            return entry['payload'], 'hit'
+
+        payload = fetch()
+        payload_hash = content_hash(payload)
+
+        if entry is not None and entry['hash'] == payload_hash:
+            with self._lock:
+                self.unchanged += 1
+            self._write(key, {**entry, 'checked_at': now})
+            return entry['payload'], 'unchanged'
+
+        with self._lock:
+            self.misses += 1
+        self._write(key, {
+            'format': self.format_version, 'stored_at': now, 'checked_at': now, 'hash': payload_hash, 'payload': payload
+        })
+        self.evict()
+        return payload, 'miss'
+
+    # Deletes least recently used entries until the directory fits in max_bytes
+    def evict(self):
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.json')]
+        except OSError:
+            return
+        files = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,63 @@
+import threading
+
+from collections import OrderedDict
+
+from records import build_table_rows, carry_schedule_columns, records_from_table_rows, split_by_league
+from snapshot import freeze_divisions
+from standings import GAMES_PER_SEASON, apply_results, compute_league
+
+
+# What-if scenarios: standings after a set of picked game outcomes
+#
+# A ScenarioEngine is built once per standings snapshot. It keeps that
+# snapshot's TeamRecords split by league along with its rows. Evaluating
+# a scenario ({(winner_id, loser_id), ...}) only re-ranks and recomputes
+# the leagues that have a team in a picked game; the other league's rows
+# are reused as they are. A whole league is recomputed because one result
+# can move every division's wild card numbers. Results are kept in a
+# bounded LRU keyed by the set of picks, so flipping back to a scenario
+# already explored is a dictionary lookup.
+
+SCENARIO_CACHE_ENTRIES = 256
+
+
+class ScenarioEngine:
+    def __init__(self, rows, games_per_season=GAMES_PER_SEASON, max_entries=SCENARIO_CACHE_ENTRIES):
+        self.games_per_season = games_per_season
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._leagues = split_by_league(records_from_table_rows(rows))
+        self._league_of = {team.team_id: league for league, teams in self._leagues.items() for team in teams}
+        self._rows = {}
+        for row in rows:
+            self._rows.setdefault(row['league'], []).append(row)
+        self._scenarios = OrderedDict()
+        self._lock = threading.Lock()
+
+    # (divisions_AL, divisions_NL) after the picked outcomes, see snapshot.freeze_divisions
+    def evaluate(self, outcomes):
+        key = frozenset(outcomes)
+        with self._lock:
+            if key in self._scenarios:
+                self._scenarios.move_to_end(key)
+                self.hits += 1
+                return self._scenarios[key]
+
+        affected = {self._league_of.get(team_id) for outcome in key for team_id in outcome}
+        rows = []
+        for league, teams in self._leagues.items():
+            if league not in affected:
+                rows.extend(self._rows[league])
+                continue
+            projected = apply_results(teams, key)
+            league_rows = build_table_rows(projected, compute_league(projected, games_per_season=self.games_per_season))
+            rows.extend(carry_schedule_columns(league_rows, self._rows[league]))
+        result = (freeze_divisions(rows, "American League"), freeze_divisions(rows, "National League"))
+
+        with self._lock:
+            self.misses += 1
+            self._scenarios[key] = result
+            while len(self._scenarios) > self.max_entries:
+                self._scenarios.popitem(last=False)
+        return result
@@ -0,0 +1,200 @@
+import os
+
+import numpy as np
+
+
+# Remaining-schedule index
+#
+# The full regular season schedule is fetched once per season and kept on
+# disk (SCHEDULE_DIR/<season>.npz). It's indexed into a teams x teams matrix
+# of games left between every pair (symmetric, int16) plus remaining home and
+# away games per team. Later runs only fetch a few days around today and
+# subtract the games that went final since (update()), they never rebuild the
+# matrix. Postponed games keep their slot until they're played; cancelled
+# games are taken out.
+#
+# The worker turns the index into a RemainingSchedule for the elimination
+# engine and clinch scenarios, per-team remaining games for the odds engine,
+# and remaining strength of schedule (opponents' win percentage weighted by
+# games left against each) for the data column.
+#
+# Delete the file to force a full refetch, e.g. after a schedule change that
+# adds new games.
+
+SCHEDULE_DIR = os.environ.get("SCHEDULE_DIR", os.path.join(".cache", "schedule"))
+
+# Games in these states won't be played (again): off the remaining matrix
+DONE_STATES = ('Final', 'Game Over', 'Completed Early', 'Cancelled')
+
+# Days past today each update fetches, enough to find the next game day over
+# the All-Star break
+LOOKAHEAD_DAYS = 5
+
+
+def schedule_path(season, schedule_dir=None):
+    return os.path.join(schedule_dir or SCHEDULE_DIR, f"{season}.npz")
+
+
+# {(team_a, team_b): games} with team_a < team_b, plus the next game day's
+# games as [(home_id, away_id), ...] for the clinch scenarios (see clinch.py)
+# and {team_id: games left} for the odds engine
+class RemainingSchedule(dict):
+    def __init__(self):
+        super().__init__()
+        self.next_day = None
+        self.next_games = []
+        self.by_team = {}
+        self.index = None  # SeasonSchedule it came from, if any
+
+
+class SeasonSchedule:
+    # games: {game_id: (game_date, home_id, away_id)}, every regular season game
+    def __init__(self, season, team_ids, games, remaining, home_remaining, away_remaining, played, updated_through=None):
+        self.season = str(season)
+        self.team_ids = list(team_ids)
+        self.index = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        self.games = games
+        self.remaining = remaining
+        self.home_remaining = home_remaining
+        self.away_remaining = away_remaining
+        self.played = played
+        self.updated_through = updated_through
+        self.next_day = None
+        self.next_games = []
+
+    # Index from a full season schedule (statsapi.schedule games)
+    @classmethod
+    def build(cls, season, schedule_games, today=None):
+        games = {}
+        for game in schedule_games:
+            if game['game_type'] == 'R' and (game['game_id'] not in games or game['status'] != 'Postponed'):
+                games[game['game_id']] = (game['game_date'], game['home_id'], game['away_id'])
+
+        team_ids = sorted({team_id for _, home_id, away_id in games.values() for team_id in (home_id, away_id)})
+        index = {team_id: i for i, team_id in enumerate(team_ids)}
+        homes = np.array([index[home_id] for _, home_id, _ in games.values()], dtype=np.intp)
+        aways = np.array([index[away_id] for _, _, away_id in games.values()], dtype=np.intp)
+
+        remaining = np.zeros((len(team_ids), len(team_ids)), dtype=np.int16)
+        np.add.at(remaining, (homes, aways), 1)
+        remaining += remaining.T
+        home_remaining = np.bincount(homes, minlength=len(team_ids)).astype(np.int16)
+        away_remaining = np.bincount(aways, minlength=len(team_ids)).astype(np.int16)
+
+        schedule = cls(season, team_ids, games, remaining, home_remaining, away_remaining, set())
+        schedule.update(schedule_games, today)
+        return schedule
+
+    def _add(self, home_id, away_id, games):
+        home, away = self.index[home_id], self.index[away_id]
+        self.remaining[home, away] += games
+        self.remaining[away, home] += games
+        self.home_remaining[home] += games
+        self.away_remaining[away] += games
+
+    # Applies a batch of statsapi.schedule games: finals (and cancellations)
+    # since the last update come off the matrix, new dates are recorded.
+    # The next game day is the first date from today (ISO date, the ET game
+    # day) on with games left; an earlier game still not final, e.g. a
+    # suspended one, stays on the matrix but isn't "next". Returns how many
+    # games came off.
+    def update(self, schedule_games, today=None):
+        taken_off = 0
+        next_day, next_games = None, []
+        for game in schedule_games:
+            if game['game_type'] != 'R':
+                continue
+            game_id = game['game_id']
+            if game_id in self.played:
+                continue
+            known = game_id in self.games
+
+            if game['status'] in DONE_STATES:
+                if known:
+                    self._add(game['home_id'], game['away_id'], -1)
+                    taken_off += 1
+                self.played.add(game_id)
+                continue
+            if game['status'] == 'Postponed':
+                continue  # the rescheduled listing carries the new date
+
+            if not known and game['home_id'] in self.index and game['away_id'] in self.index:
+                # Added to the schedule after the full fetch
+                self._add(game['home_id'], game['away_id'], 1)
+            self.games[game_id] = (game['game_date'], game['home_id'], game['away_id'])
+
+            if today is not None and game['game_date'] < today:
+                continue
+            if next_day is None or game['game_date'] < next_day:
+                next_day, next_games = game['game_date'], []
+            if game['game_date'] == next_day:
+                next_games.append((game['home_id'], game['away_id']))
+
+        self.next_day, self.next_games = next_day, next_games
+        return taken_off
+
+    # Games left per team
+    def games_left(self):
+        return self.home_remaining + self.away_remaining
+
+    def remaining_schedule(self):
+        remaining = RemainingSchedule()
+        rows, columns = np.nonzero(np.triu(self.remaining))
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            remaining[(self.team_ids[row], self.team_ids[column])] = int(self.remaining[row, column])
+        remaining.next_day = self.next_day
+        remaining.next_games = list(self.next_games)
+        remaining.by_team = dict(zip(self.team_ids, self.games_left().tolist()))
+        remaining.index = self
+        return remaining
+
+    # {team_id: average win percentage of the opponents left, weighted by
+    # games against each}, None for teams with no games left.
+    # win_percentage: {team_id: win percentage}
+    def strength_of_schedule(self, win_percentage):
+        opponent_pct = np.array([win_percentage.get(team_id, 0.5) for team_id in self.team_ids])
+        games = self.remaining.sum(axis=1)
+        weighted = self.remaining @ opponent_pct
+        return {
+            team_id: round(float(weighted[i] / games[i]), 3) if games[i] else None
+            for i, team_id in enumerate(self.team_ids)
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        game_ids = list(self.games)
+        tmp_path = path + '.tmp.npz'  # np.savez adds .npz to names without it
+        np.savez(
+            tmp_path,
+            season=np.array(self.season),
+            updated_through=np.array(self.updated_through or ''),
+            team_ids=np.array(self.team_ids, dtype=np.int64),
+            remaining=self.remaining,
+            home_remaining=self.home_remaining,
+            away_remaining=self.away_remaining,
+            game_ids=np.array(game_ids, dtype=np.int64),
+            game_dates=np.array([self.games[game_id][0] for game_id in game_ids]),
+            game_teams=np.array([self.games[game_id][1:] for game_id in game_ids], dtype=np.int64).reshape(-1, 2),
+            played=np.array(sorted(self.played), dtype=np.int64)
+        )
+        # Atomic swap so a crash mid-write never leaves a corrupt file
+        os.replace(tmp_path, path)
+
+    # The saved index, None if there is none (or it can't be read)
+    @classmethod
+    def load(cls, path):
+        try:
+            with np.load(path) as data:
+                games = {
+                    game_id: (game_date, home_id, away_id)
+                    for game_id, game_date, (home_id, away_id) in zip(
+                        data['game_ids'].tolist(), data['game_dates'].tolist(), data['game_teams'].tolist()
+                    )
+                }
+                return cls(
+                    str(data['season']), data['team_ids'].tolist(), games, data['remaining'].copy(),
+                    data['home_remaining'].copy(), data['away_remaining'].copy(), set(data['played'].tolist()),
+                    str(data['updated_through']) or None
+                )
+        except (OSError, ValueError, KeyError):
+            return None
@@ -0,0 +1,149 @@
+import argparse
+import contextlib
+import json
+import os
+import time
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from snapshot import StandingsSnapshot
+from standings import GAMES_PER_SEASON
+
+
+# Seasons and frozen season archives
+#
+# SEASON (environment, default 2025) is the season the worker keeps live in
+# the teams table. Any other season can be frozen once it's over:
+#   python seasons.py archive --season 2024
+#   python seasons.py list
+#
+# An archive is the final teams table rows for that season (standings,
+# seeding, final magic/tragic numbers) in ARCHIVE_DIR/<season>.json. It's
+# written once and never changes, so the page loads past seasons from the
+# file alone, without the MLB API or Supabase.
+
+CURRENT_SEASON = os.environ.get("SEASON", "2025")
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "archives")
+
+# Regular season length when it wasn't 162 games
+SHORTENED_SEASONS = {'2020': 60}
+
+# MLB dates games in Eastern Time: a 10 PM ET game is still "today" after
+# midnight UTC, where hosts like Render run
+MLB_TIMEZONE = ZoneInfo("America/New_York")
+
+# Set while replaying recorded fixtures (offline.py), see pinned_game_day
+_pinned_game_day = None
+
+
+# Today's date for MLB schedules, use instead of date.today()
+def game_day():
+    if _pinned_game_day is not None:
+        return _pinned_game_day
+    return datetime.now(MLB_TIMEZONE).date()
+
+
+# game_day() returns day inside the block, e.g. the day fixtures were recorded
+@contextlib.contextmanager
+def pinned_game_day(day):
+    global _pinned_game_day
+    previous, _pinned_game_day = _pinned_game_day, day
+    try:
+        yield day
+    finally:
+        _pinned_game_day = previous
+
+
+def games_per_season(season):
+    return SHORTENED_SEASONS.get(str(season), GAMES_PER_SEASON)
+
+
+# Regular season start/end from the API
+def regular_season_dates(season):
+    import statsapi
+
+    info = statsapi.get('season', {'seasonId': season, 'sportId': 1})['seasons'][0]
+    return date.fromisoformat(info['regularSeasonStartDate']), date.fromisoformat(info['regularSeasonEndDate'])
+
+
+# Regular season days played so far: yesterday caps the end of a running season
+def season_dates(season):
+    start, end = regular_season_dates(season)
+    return start, min(end, game_day() - timedelta(days=1))
+
+
+def archive_path(season, archive_dir=None):
+    return os.path.join(archive_dir or ARCHIVE_DIR, f"{season}.json")
+
+
+# Archived seasons, newest first
+def list_archived_seasons(archive_dir=None):
+    try:
+        names = os.listdir(archive_dir or ARCHIVE_DIR)
+    except OSError:
+        return []
+    return sorted((name[:-len('.json')] for name in names if name.endswith('.json')), reverse=True)
+
+
+# Final rows for an archived season as a snapshot, None if it was never archived
+def load_archive(season, archive_dir=None):
+    try:
+        with open(archive_path(season, archive_dir)) as f:
+            archive = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return StandingsSnapshot(archive['rows'], data_as_of=archive['frozen_at'])
+
+
+def save_archive(season, rows, archive_dir=None):
+    path = archive_path(season, archive_dir)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    archive = {'season': str(season), 'frozen_at': time.time(), 'games_per_season': games_per_season(season), 'rows': rows}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(archive, f)
+    os.replace(tmp_path, path)
+
+
+# Fetches and computes a finished season's final standings and freezes them.
+# An existing archive is left alone unless force=True.
+def archive_season(season, archive_dir=None, force=False):
+    if os.path.exists(archive_path(season, archive_dir)) and not force:
+        raise ValueError(f"{season} is already archived (use --force to rebuild it)")
+
+    # Over once its last day is: archivable from the (ET) day after
+    _, end = regular_season_dates(season)
+    if end >= game_day():
+        raise ValueError(f"The {season} regular season isn't over yet")
+
+    # The pipeline imports the Supabase client, only needed here
+    from pipeline import compute_snapshot, fetch_standing_data, fetch_teams_data
+    from records import build_team_records
+
+    teams = build_team_records(fetch_teams_data(season), fetch_standing_data(season))
+    # Nothing left to play, the API's final elimination flags are exact
+    rows = compute_snapshot(teams, remaining=None, season=season)
+    save_archive(season, rows, archive_dir)
+    print(f"Archived {len(rows)} teams for {season} to {archive_path(season, archive_dir)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frozen season archives")
+    parser.add_argument('command', choices=['archive', 'list'])
+    parser.add_argument('--season', help="Season to archive, e.g. 2024")
+    parser.add_argument('--force', action='store_true', help="Rebuild an existing archive")
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for season in list_archived_seasons():
+            print(season)
+        return
+
+    if args.season is None:
+        parser.error("archive needs --season")
+    archive_season(args.season, force=args.force)
+
+
+if __name__ == '__main__':
+    main()
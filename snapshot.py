@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from datetime import datetime
+from types import MappingProxyType
+
+
+# Process-wide computed standings snapshot
+#
+# Every browser session runs app.py on its own thread. Instead of each session
+# loading and regrouping the teams table, they all share one immutable
+# snapshot held by a SnapshotStore (created once with st.cache_resource).
+# When the snapshot expires only one session reloads it (single-flight),
+# every other session waits on the lock and reuses that result.
+#
+# The store also keeps the last snapshot in a local file (SNAPSHOT_PATH). A
+# freshly started process paints from that file straight away and only then
+# goes to the database, so a cold start doesn't wait on the Supabase import,
+# client setup and query before showing anything.
+#
+# Expired snapshots are served stale-while-revalidate: revalidate() reloads on
+# a background thread and callers decide how long to wait for it. If the
+# database is slow or down, the last snapshot keeps being served and
+# last_error says why.
+
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", os.path.join(".cache", "snapshot.json"))
+
+
+# Content hash of the source rows, identifies the data version of a snapshot
+def compute_version(rows):
+    payload = json.dumps(sorted(rows, key=lambda row: row['team_id']), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+# Read-only {division: {division_rank: row}} for one league
+def freeze_divisions(teams, league):
+    divisions = {}
+    for team in teams:
+        if team['league'] != league:
+            continue
+        divisions.setdefault(team['division'], {})[team['division_rank']] = team
+
+    return MappingProxyType({
+        division: MappingProxyType(teams_in_div)
+        for division, teams_in_div in divisions.items()
+    })
+
+
+class StandingsSnapshot:
+    __slots__ = ('version', 'loaded_at', 'data_as_of', 'teams', 'divisions_AL', 'divisions_NL')
+
+    # data_as_of: epoch seconds of the worker's last successful run, if known
+    def __init__(self, rows, version=None, loaded_at=None, data_as_of=None):
+        # Rows are copied and wrapped read-only so no session can mutate shared state
+        teams = tuple(MappingProxyType(dict(row)) for row in rows)
+
+        object.__setattr__(self, 'version', version or compute_version(rows))
+        object.__setattr__(self, 'loaded_at', loaded_at or time.time())
+        object.__setattr__(self, 'data_as_of', data_as_of)
+        object.__setattr__(self, 'teams', teams)
+        object.__setattr__(self, 'divisions_AL', freeze_divisions(teams, "American League"))
+        object.__setattr__(self, 'divisions_NL', freeze_divisions(teams, "National League"))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("StandingsSnapshot is immutable")
+
+    def age(self):
+        return time.time() - self.loaded_at
+
+    # Seconds since the standings were last computed, falls back to load time
+    def data_age(self):
+        return time.time() - (self.data_as_of or self.loaded_at)
+
+
+def save_snapshot_file(snapshot, path=SNAPSHOT_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    payload = {
+        'version': snapshot.version,
+        'loaded_at': snapshot.loaded_at,
+        'data_as_of': snapshot.data_as_of,
+        'rows': [dict(team) for team in snapshot.teams]
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f)
+    # Atomic swap so a crash mid-write never leaves a corrupt file
+    os.replace(tmp_path, path)
+
+
+# Last saved snapshot, or None if there is no usable file
+def load_snapshot_file(path=SNAPSHOT_PATH):
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+        return StandingsSnapshot(payload['rows'], payload['version'], payload['loaded_at'], payload.get('data_as_of'))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+# (teams table rows, epoch seconds of the worker's last success or None):
+# what a SnapshotStore loader returns, read from a Supabase client
+def read_standings(client):
+    rows = client.table('teams').select('*').execute().data
+    try:
+        status = client.table('ingest_status').select('last_success_at').execute().data
+        data_as_of = datetime.fromisoformat(status[0]['last_success_at']).timestamp()
+    except Exception:
+        # Older databases have no ingest_status table, ages fall back to load time
+        data_as_of = None
+    return rows, data_as_of
+
+
+class SnapshotStore:
+    # path=None turns the local snapshot file off
+    def __init__(self, ttl_seconds=300, path=SNAPSHOT_PATH):
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        # Starts out stale: good for a first paint, but the next get() reloads
+        self._snapshot = load_snapshot_file(path) if path else None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_done = None  # threading.Event of the running background reload
+        self.loads = 0  # times loader() was called
+        self.last_error = None  # why the last reload failed, None after a success
+
+    def _is_fresh(self):
+        return self._snapshot is not None and time.time() < self._expires_at
+
+    def is_fresh(self):
+        return self._is_fresh()
+
+    # Whatever snapshot is held right now, fresh or not, without loading
+    def peek(self):
+        return self._snapshot
+
+    # Returns the current snapshot, calling loader() to rebuild it when expired.
+    # loader returns (teams table rows, data_as_of).
+    def get(self, loader):
+        if self._is_fresh():
+            return self._snapshot
+
+        with self._lock:
+            # Another session may have reloaded while we waited on the lock
+            if self._is_fresh():
+                return self._snapshot
+            return self._load(loader)
+
+    # Caller holds self._lock
+    def _load(self, loader):
+        rows, data_as_of = loader()
+        self.loads += 1
+        return self._swap(rows, data_as_of)
+
+    # Caller holds self._lock. Installs freshly loaded rows.
+    def _swap(self, rows, data_as_of):
+        version = compute_version(rows)
+
+        # Same source data as before: keep the existing snapshot object
+        changed = self._snapshot is None or self._snapshot.version != version
+        if changed or self._snapshot.data_as_of != data_as_of:
+            self._snapshot = StandingsSnapshot(rows, version, data_as_of=data_as_of)
+            if self.path:
+                try:
+                    save_snapshot_file(self._snapshot, self.path)
+                except OSError as e:
+                    print(f"Could not save snapshot file: {e}")
+
+        self._expires_at = time.time() + self.ttl_seconds
+        self.last_error = None
+        return self._snapshot
+
+    # Starts a background reload (one at a time) and returns a threading.Event
+    # set when it finishes, successfully or not
+    def revalidate(self, loader):
+        with self._lock:
+            if self._refresh_done is not None and not self._refresh_done.is_set():
+                return self._refresh_done
+            done = self._refresh_done = threading.Event()
+
+        # The read runs without the lock, so peek(), revalidate() and fresh
+        # get() calls keep serving the old snapshot however long it takes
+        def refresh():
+            try:
+                rows, data_as_of = loader()
+                with self._lock:
+                    self.loads += 1
+                    self._swap(rows, data_as_of)
+            except Exception as e:
+                with self._lock:
+                    self.last_error = e
+                    # Don't retry on every page view while the database is failing
+                    self._expires_at = time.time() + min(self.ttl_seconds, 30)
+            finally:
+                done.set()
+
+        threading.Thread(target=refresh, name='snapshot-revalidate', daemon=True).start()
+        return done
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = 0.0
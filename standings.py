@@ -0,0 +1,185 @@
+from elimination import WILD_CARD_SPOTS
+from records import STANDINGS_FIELDS, TEAM_FIELDS, TeamRecord, split_by_league
+
+
+# Standings engine: seeding, magic/tragic numbers, clinch distance and
+# elimination flags for every team, from TeamRecords (see records.py)
+#
+# Pure functions, no I/O: the ingestion worker, the odds simulator, the
+# benchmarks and anything else can call them with any list of records.
+# Nothing here is specific to the AL or NL, each league is indexed once
+# (divisions, leaders, wild card order) and then every team's numbers come
+# out of a single pass over that index.
+
+GAMES_PER_SEASON = 162
+
+
+# Playoff Position Logic:
+# Seeds 1-3: Division winners ranked by win percentage (highest = seed 1).
+#            If two or more division winners are tied in win percentage,
+#            use league_rank as the tie-breaker. This tie-break rule only
+#            applies to division winners.
+# Seeds 4-6: Wild card teams ranked by wild_card_rank (1st WC = seed 4, etc.)
+# Seeds 7-15: Non-playoff teams ranked by wild_card_rank
+
+def get_division_sort_key(team):
+    return (-round(team.w / team.games_played, 4), team.league_rank)
+
+
+def get_wildcard_sort_key(team):
+    return team.wc_rank
+
+
+# {division: {div_rank: TeamRecord}}
+def create_divisions_dict(teams):
+    divisions = {}
+    for team in teams:
+        divisions.setdefault(team.division, {})[team.div_rank] = team
+    return divisions
+
+
+# Division Magic Number Formula:
+# RG + 1 - (Losses by second place team - losses by first place team)
+# RG = Remaining games for the first place team
+#
+# Once every team in the division has played every game the first place team
+# (by tiebreaker rules when records are identical) has magic number 0.
+def division_magic_number(division_teams, games_per_season=GAMES_PER_SEASON):
+    leader = division_teams[1]
+    remaining_games = games_per_season - leader.games_played
+    all_teams_finished = all(team.games_played == games_per_season for team in division_teams.values())
+
+    if all_teams_finished and remaining_games == 0:
+        return 0
+    return remaining_games + 1 - (division_teams[2].l - leader.l)
+
+
+# One league: {team_id: {column: value}} with the teams table column names
+#
+# Wild card magic number (seeds 4-6): G + 1 - wins of the team - losses of the first team out
+# Division tragic number (everyone but the leader): G + 1 - most wins of a division rival - losses of the team
+#   (the rival with the most wins, which isn't the leader when the leader is
+#   ahead on win percentage with fewer games played)
+# Wild card tragic number (teams outside seeds 4-6): G + 1 - wins of the last wild card - losses of the team
+# G = games in the season (games_per_season). Numbers never go below 0.
+#
+# Distance from clinch (race track position): the division leader's magic
+# number, plus games back for everyone else.
+#
+# Eliminated if the API says 'E' or local_elimination (see elimination.py)
+# proves it earlier.
+def compute_league(teams, local_elimination=None, games_per_season=GAMES_PER_SEASON):
+    local_elimination = local_elimination or {}
+
+    # Index the league once
+    divisions = create_divisions_dict(teams)
+    division_winners = sorted((team for team in teams if team.is_division_leader), key=get_division_sort_key)
+    wildcard_order = sorted((team for team in teams if not team.is_division_leader), key=get_wildcard_sort_key)
+
+    # Seeds 1-3: Division winners (sorted by win % and league_rank), 4-15: everyone else
+    playoff_positions = {team.team_id: position for position, team in enumerate(division_winners + wildcard_order, start=1)}
+    magic_numbers = {division: division_magic_number(division_teams, games_per_season) for division, division_teams in divisions.items()}
+
+    # Last team holding a wild card and the first team out
+    last_wild_card = wildcard_order[WILD_CARD_SPOTS - 1] if len(wildcard_order) >= WILD_CARD_SPOTS else None
+    first_team_out = wildcard_order[WILD_CARD_SPOTS] if len(wildcard_order) > WILD_CARD_SPOTS else None
+
+    results = {}
+    for team in teams:
+        leader_magic_number = magic_numbers[team.division] or 0
+        local = local_elimination.get(team.team_id, {})
+
+        result = {
+            'playoff_position': playoff_positions[team.team_id],
+            'magic_number_division': magic_numbers[team.division] if team.div_rank == 1 else None,
+            'magic_number_wild_card': None,
+            'tragic_number_division': None,
+            'tragic_number_wild_card': None,
+            'distance_from_clinched_division': leader_magic_number if team.div_rank == 1 else leader_magic_number + team.gb,
+            'eliminated_from_division': 1 if team.elim_num == 'E' or local.get('eliminated_from_division') else 0,
+            'eliminated_from_wildcard': 1 if team.wc_elim_num == 'E' or local.get('eliminated_from_playoffs') else 0
+        }
+
+        if not team.is_division_leader:
+            rival_wins = [other.w for other in divisions[team.division].values() if other is not team]
+            if rival_wins:
+                result['tragic_number_division'] = max(0, games_per_season + 1 - max(rival_wins) - team.l)
+
+            if team.wc_rank <= WILD_CARD_SPOTS:
+                if first_team_out is not None:
+                    result['magic_number_wild_card'] = max(0, games_per_season + 1 - team.w - first_team_out.l)
+            elif last_wild_card is not None:
+                result['tragic_number_wild_card'] = max(0, games_per_season + 1 - last_wild_card.w - team.l)
+
+        results[team.team_id] = result
+
+    return results
+
+
+# Every league in one call: {team_id: {column: value}}
+def compute_standings(teams, local_elimination=None, games_per_season=GAMES_PER_SEASON):
+    results = {}
+    for league_teams in split_by_league(teams).values():
+        results.update(compute_league(league_teams, local_elimination, games_per_season))
+    return results
+
+
+def win_percentage(team):
+    return team.w / team.games_played if team.games_played else 0.0
+
+
+# Games team is behind other (negative when ahead)
+def games_behind(other, team):
+    return ((other.w - team.w) + (team.l - other.l)) / 2
+
+
+# New records as if results [(winner_id, loser_id), ...] were final.
+# Division rank, games back, wild card rank/games back and league rank are
+# re-derived by win percentage, ties keep the current order. Elimination
+# flags carry over, more games can't undo an elimination.
+def apply_results(teams, results):
+    projected = {
+        team.team_id: TeamRecord([getattr(team, name) for name in TEAM_FIELDS],
+                                 [getattr(team, name) for name in STANDINGS_FIELDS])
+        for team in teams
+    }
+    # Either side can be missing (one league at a time, interleague games)
+    for winner_id, loser_id in results:
+        if winner_id in projected:
+            projected[winner_id].w += 1
+        if loser_id in projected:
+            projected[loser_id].l += 1
+
+    for league_teams in split_by_league(projected.values()).values():
+        # Sorted before any rank is overwritten, the current ranks are the tie-breakers
+        league_order = sorted(league_teams, key=lambda team: (-win_percentage(team), team.league_rank))
+        divisions = {}
+        for team in league_teams:
+            divisions.setdefault(team.division, []).append(team)
+        division_orders = [
+            sorted(division_teams, key=lambda team: (-win_percentage(team), team.div_rank))
+            for division_teams in divisions.values()
+        ]
+        leaders = {division_order[0].team_id for division_order in division_orders}
+        wildcard_order = sorted(
+            (team for team in league_teams if team.team_id not in leaders),
+            key=lambda team: (-win_percentage(team), team.wc_rank or 0)
+        )
+
+        for rank, team in enumerate(league_order, start=1):
+            team.league_rank = rank
+        for division_order in division_orders:
+            for rank, team in enumerate(division_order, start=1):
+                team.div_rank = rank
+                team.gb = games_behind(division_order[0], team)
+        for team in league_teams:
+            if team.team_id in leaders:
+                team.wc_rank = None
+                team.wc_gb = 0.0
+        # Wild card games back are measured from the last wild card spot
+        last_wild_card = wildcard_order[min(WILD_CARD_SPOTS, len(wildcard_order)) - 1] if wildcard_order else None
+        for rank, team in enumerate(wildcard_order, start=1):
+            team.wc_rank = rank
+            team.wc_gb = abs(games_behind(last_wild_card, team))
+
+    return [projected[team.team_id] for team in teams]
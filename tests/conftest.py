@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline
+
+
+# Row hashes and cached responses go to a temporary directory, never .cache,
+# and every test starts without a status row sent
+@pytest.fixture(autouse=True)
+def isolated_pipeline_state(tmp_path, monkeypatch):
+    from response_cache import ResponseCache
+
+    monkeypatch.setattr(pipeline, 'ROW_HASHES_PATH', str(tmp_path / 'row_hashes.json'))
+    monkeypatch.setattr(pipeline, '_row_hashes', None)
+    monkeypatch.setattr(pipeline, 'response_cache', ResponseCache(str(tmp_path / 'responses')))
+    monkeypatch.setattr(pipeline, 'schedule_dir', str(tmp_path / 'schedule'))
+    monkeypatch.setattr(pipeline, 'season_schedules', {})
+    monkeypatch.setattr(pipeline, '_status_sent', None)
@@ -0,0 +1,80 @@
+import gzip
+import http.client
+import json
+import threading
+
+import pytest
+
+import api
+import pipeline
+
+from offline import offline_statsapi
+
+
+@pytest.fixture
+def server():
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+    rows = pipeline.compute_snapshot(teams, remaining)
+
+    server = api.serve('127.0.0.1', 0, lambda: (rows, 1757977500.0), snapshot_path=None)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+    connection.request('GET', path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_plain_json_with_stable_strong_etag(server):
+    response, body = get(server, '/standings')
+    again, _ = get(server, '/standings')
+
+    assert response.status == 200
+    assert response.getheader('Content-Encoding') is None
+    assert response.getheader('Content-Type') == 'application/json'
+    assert len(json.loads(body)['teams']) == 30
+    etag = response.getheader('ETag')
+    assert etag.startswith('"') and not etag.startswith('W/')
+    assert again.getheader('ETag') == etag
+
+
+def test_gzip_is_negotiated(server):
+    plain, plain_body = get(server, '/league/AL')
+    response, body = get(server, '/league/AL', {'Accept-Encoding': 'gzip'})
+
+    assert response.status == 200
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert response.getheader('Vary') == 'Accept-Encoding'
+    assert gzip.decompress(body) == plain_body
+    # Strong ETags differ per encoding
+    assert response.getheader('ETag') != plain.getheader('ETag')
+
+
+def test_matching_if_none_match_gets_304(server):
+    response, _ = get(server, '/team/141', {'Accept-Encoding': 'gzip'})
+    etag = response.getheader('ETag')
+
+    not_modified, body = get(server, '/team/141', {'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert not_modified.status == 304
+    assert body == b''
+    assert not_modified.getheader('ETag') == etag
+
+    # The plain ETag doesn't match the gzip representation
+    plain, _ = get(server, '/team/141')
+    changed, _ = get(server, '/team/141', {'Accept-Encoding': 'gzip', 'If-None-Match': plain.getheader('ETag')})
+    assert changed.status == 200
+
+
+def test_unknown_path_is_404(server):
+    response, body = get(server, '/team/1')
+    assert response.status == 404
+    assert 'error' in json.loads(body)
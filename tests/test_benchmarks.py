@@ -0,0 +1,29 @@
+import pytest
+
+import pipeline
+
+from benchmarks.pipeline_stages import STAGE_BUDGETS_MS, measure_full_page, over_budget, run_stages
+from offline import offline_statsapi
+
+
+# The offline stage benchmarks, each stage's median against its budget
+def test_pipeline_stages_within_budget():
+    results = run_stages(repeat=5, db_latency=0.0, full_page=False)
+
+    assert set(results) == set(STAGE_BUDGETS_MS) - {'full_page'}
+    assert over_budget(results) == {}
+
+
+# The whole page on the offline rows. The page's caches and snapshot file are
+# relative to the working directory, so it runs in a temporary one.
+def test_full_page_within_budget(tmp_path, monkeypatch):
+    supabase = pytest.importorskip('supabase')
+    pytest.importorskip('streamlit.testing.v1')
+    monkeypatch.setattr(supabase, 'create_client', supabase.create_client)
+    monkeypatch.chdir(tmp_path)
+
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+    rows = pipeline.compute_snapshot(teams, remaining)
+
+    assert over_budget({'full_page': measure_full_page(rows, repeat=1, db_latency=0.0)}) == {}
@@ -0,0 +1,102 @@
+import itertools
+
+from clinch import EVENT_TEXT, clinch_scenarios
+from elimination import WILD_CARD_SPOTS
+from records import TeamRecord
+
+# A 20 game season keeps the numbers small enough to check by hand
+GAMES = 20
+
+
+def team(team_id, abbreviation, division, w, l):
+    return TeamRecord([team_id, abbreviation, abbreviation, division, 'Test League'],
+                      [w, l, 0.0, 1, None, None, team_id, '-', '-'])
+
+
+def league():
+    return [
+        team(1, 'AAA', 'East', 15, 3),
+        team(2, 'BBB', 'East', 13, 5),
+        team(3, 'CCC', 'Central', 9, 9),
+        team(4, 'DDD', 'Central', 9, 9),
+        team(5, 'EEE', 'West', 12, 4),
+        team(6, 'FFF', 'West', 3, 15),
+        team(7, 'GGG', 'West', 4, 14)
+    ]
+
+
+GAMES_TONIGHT = [(1, 3), (2, 4), (5, 6), (7, 5)]
+
+
+# The module's rules, one outcome at a time: {event: {team_id: bool}}
+def brute_force_events(teams, games, home_wins):
+    wins = {team.team_id: team.w for team in teams}
+    losses = {team.team_id: team.l for team in teams}
+    for (home_id, away_id), home_won in zip(games, home_wins):
+        winner, loser = (home_id, away_id) if home_won else (away_id, home_id)
+        wins[winner] += 1
+        losses[loser] += 1
+    max_wins = {team_id: GAMES - lost for team_id, lost in losses.items()}
+    divisions = {team.division for team in teams}
+
+    events = {event: {} for event in EVENT_TEXT}
+    for team in teams:
+        t = team.team_id
+        rivals = [other.team_id for other in teams if other.division == team.division and other.team_id != t]
+        others = [other.team_id for other in teams if other.team_id != t]
+        clinch_division = all(wins[t] > max_wins[r] for r in rivals)
+        eliminated_division = any(wins[r] > max_wins[t] for r in rivals)
+        events['clinch_division'][t] = clinch_division
+        events['clinch_playoffs'][t] = clinch_division or sum(max_wins[o] >= wins[t] for o in others) <= WILD_CARD_SPOTS
+        events['eliminated_division'][t] = eliminated_division
+        events['eliminated_playoffs'][t] = eliminated_division and \
+            sum(wins[o] > max_wins[t] for o in others) >= len(divisions) + WILD_CARD_SPOTS
+    return events
+
+
+# "AAA beat CCC or DDD beat BBB & ..." as a predicate on {(winner, loser)}
+def parse_condition(text):
+    if text == "any result":
+        return lambda results: True
+    terms = [[tuple(result.split(" beat ")) for result in term.split(" & ")] for term in text.split(" or ")]
+    return lambda results: any(all(result in results for result in term) for term in terms)
+
+
+def test_conditions_match_brute_force():
+    teams = league()
+    names = {team.team_id: team.abbreviation for team in teams}
+    scenarios = clinch_scenarios(teams, GAMES_TONIGHT, games_per_season=GAMES)
+    assert scenarios
+
+    outcomes = list(itertools.product((True, False), repeat=len(GAMES_TONIGHT)))
+    now = brute_force_events(teams, [], [])
+    for team_id, text in scenarios.items():
+        for line in text.split("; "):
+            event = next(event for event, label in EVENT_TEXT.items() if line.startswith(f"{label} tonight with "))
+            condition = parse_condition(line.split(" tonight with ", 1)[1])
+            assert not now[event][team_id]
+            for home_wins in outcomes:
+                results = {
+                    (names[home_id], names[away_id]) if home_won else (names[away_id], names[home_id])
+                    for (home_id, away_id), home_won in zip(GAMES_TONIGHT, home_wins)
+                }
+                assert condition(results) == brute_force_events(teams, GAMES_TONIGHT, home_wins)[event][team_id], line
+
+
+def test_hand_checked_conditions():
+    scenarios = clinch_scenarios(league(), GAMES_TONIGHT, games_per_season=GAMES)
+
+    # AAA (15-3) clinches over BBB (13-5, can reach 15) with a win (16), or
+    # when BBB loses (can reach 14)
+    assert scenarios[1] == "Clinches division tonight with AAA beat CCC or DDD beat BBB"
+    # The same results put AAA past BBB's best
+    assert scenarios[2] == "Out of division race tonight with AAA beat CCC or DDD beat BBB"
+    # FFF (3-15) is out once all six others are past its best: a loss leaves
+    # it at most 5 wins, which GGG (4-14) reaches only by beating EEE
+    assert scenarios[6] == "Eliminated tonight with EEE beat FFF & GGG beat EEE"
+
+
+def test_already_clinched_events_are_not_repeated():
+    already = {1: {'magic_number_division': 0}}
+    scenarios = clinch_scenarios(league(), GAMES_TONIGHT, already, games_per_season=GAMES)
+    assert not scenarios.get(1, "").startswith("Clinches division")
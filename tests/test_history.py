@@ -0,0 +1,37 @@
+from datetime import date
+
+import history
+
+from history import SeasonHistory, backfill, history_written_at
+from offline import offline_statsapi
+
+
+def test_backfill_round_trip(tmp_path):
+    history_dir = str(tmp_path)
+    assert history_written_at('2025', history_dir) is None
+    assert SeasonHistory.load('2025', history_dir) is None
+
+    with offline_statsapi() as api:
+        backfill('2025', date(2025, 9, 13), date(2025, 9, 15), workers=2, history_dir=history_dir)
+        fixture_wins = {team['team_id']: team['w'] for division in api.standings.values() for team in division['teams']}
+        assert api.calls == 4  # teams + one standings call per day
+
+        # Days already fetched come from the day cache
+        backfill('2025', date(2025, 9, 13), date(2025, 9, 15), workers=2, history_dir=history_dir)
+        assert api.calls == 5
+
+    assert history_written_at('2025', history_dir) is not None
+    season = SeasonHistory.load('2025', history_dir)
+    assert len(season) == 3
+    assert season.days == ['2025-09-13', '2025-09-14', '2025-09-15']
+    # Memory-mapped, not read into memory
+    assert all(isinstance(array, history.np.memmap) for array in season.arrays.values())
+
+    rows = {row['team_id']: row for row in season.rows_at(2)}
+    assert {team_id: row['wins'] for team_id, row in rows.items()} == fixture_wins
+    assert rows[141]['abbreviation'] == 'TOR'
+    assert rows[139]['division_rank'] == 1 and rows[139]['wild_card_rank'] is None
+
+    divisions_AL, divisions_NL = season.divisions_at(0)
+    assert len(divisions_AL) == 3 and len(divisions_NL) == 3
+    assert divisions_AL['American League East'][1]['team_id'] == 139
@@ -0,0 +1,121 @@
+import pytest
+
+import pipeline
+
+from live import LiveScores
+from offline import offline_statsapi
+from snapshot import StandingsSnapshot
+
+# 2025-09-15 19:05 ET
+FIRST_PITCH = '2025-09-15T23:05:00Z'
+FIRST_PITCH_EPOCH = 1757977500
+
+
+@pytest.fixture
+def rows():
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+        return pipeline.compute_snapshot(teams, remaining)
+
+
+def game(rows, status, inning=5, home_score=4, away_score=1):
+    home, away = rows[0], rows[1]
+    return {
+        'game_id': 1, 'game_type': 'R', 'game_date': '2025-09-15', 'game_datetime': FIRST_PITCH, 'status': status,
+        'current_inning': inning, 'home_id': home['team_id'], 'away_id': away['team_id'],
+        'home_score': home_score, 'away_score': away_score
+    }
+
+
+def played_one_more(rows, team_ids):
+    return [
+        {**row, 'games_played': row['games_played'] + 1} if row['team_id'] in team_ids else row
+        for row in rows
+    ]
+
+
+def wins(snapshot, team_id):
+    return next(row['wins'] for row in snapshot.teams if row['team_id'] == team_id)
+
+
+def test_final_game_stays_until_snapshot_counts_it(rows):
+    scoreboard = [game(rows, 'In Progress')]
+    live = LiveScores(poll_seconds=0, fetch=lambda: scoreboard)
+    snapshot = StandingsSnapshot(rows, 'v1', data_as_of=FIRST_PITCH_EPOCH + 600)
+    home_id = rows[0]['team_id']
+
+    assert wins(live.project(snapshot), home_id) == rows[0]['wins'] + 1
+
+    # Over, but the worker hasn't run since
+    scoreboard[0] = game(rows, 'Final', inning=9)
+    assert wins(live.project(snapshot), home_id) == rows[0]['wins'] + 1
+
+    # The worker's next run has it
+    counted_rows = played_one_more(rows, {rows[0]['team_id'], rows[1]['team_id']})
+    counted_rows = [{**row, 'wins': row['wins'] + 1} if row['team_id'] == home_id else row for row in counted_rows]
+    counted = StandingsSnapshot(counted_rows, 'v2', data_as_of=FIRST_PITCH_EPOCH + 4 * 3600)
+    assert live.project(counted) is counted
+
+
+def test_final_game_never_seen_live_uses_data_as_of(rows):
+    live = LiveScores(poll_seconds=0, fetch=lambda: [game(rows, 'Final', inning=9)])
+
+    before = StandingsSnapshot(rows, 'v1', data_as_of=FIRST_PITCH_EPOCH - 600)
+    assert wins(live.project(before), rows[0]['team_id']) == rows[0]['wins'] + 1
+
+    # Still being played when the worker ran
+    during = StandingsSnapshot(rows, 'v1', data_as_of=FIRST_PITCH_EPOCH + 3600)
+    assert wins(live.project(during), rows[0]['team_id']) == rows[0]['wins'] + 1
+
+    after = StandingsSnapshot(rows, 'v1', data_as_of=FIRST_PITCH_EPOCH + 4 * 3600)
+    assert live.project(after) is after
+
+    unknown = StandingsSnapshot(rows, 'v1')
+    assert live.project(unknown) is unknown
+
+
+def test_doubleheader_games_are_counted_one_at_a_time(rows):
+    home_id = rows[0]['team_id']
+    first = game(rows, 'Scheduled', inning=None, home_score=0, away_score=0)
+    second = dict(first, game_id=2, game_num=2, game_datetime='2025-09-16T02:35:00Z')
+    scoreboard = [first, second]
+    live = LiveScores(poll_seconds=0, fetch=lambda: scoreboard)
+    snapshot = StandingsSnapshot(rows, 'v1', data_as_of=FIRST_PITCH_EPOCH - 600)
+    assert live.project(snapshot) is snapshot
+
+    # Both over, the worker has only counted the first
+    scoreboard[:] = [game(rows, 'Final', inning=9), dict(game(rows, 'Final', inning=9), game_id=2, game_num=2,
+                                                          game_datetime='2025-09-16T02:35:00Z')]
+    counted_first = played_one_more(rows, {home_id, rows[1]['team_id']})
+    counted_first = [{**row, 'wins': row['wins'] + 1} if row['team_id'] == home_id else row for row in counted_first]
+    snapshot = StandingsSnapshot(counted_first, 'v2', data_as_of=FIRST_PITCH_EPOCH + 3 * 3600)
+    assert wins(live.project(snapshot), home_id) == rows[0]['wins'] + 2
+
+    counted_both = played_one_more(counted_first, {home_id, rows[1]['team_id']})
+    counted_both = [{**row, 'wins': row['wins'] + 1} if row['team_id'] == home_id else row for row in counted_both]
+    snapshot = StandingsSnapshot(counted_both, 'v3', data_as_of=FIRST_PITCH_EPOCH + 7 * 3600)
+    assert live.project(snapshot) is snapshot
+
+
+def test_uncounted_finals_keep_their_teams_live(rows):
+    scoreboard = [game(rows, 'In Progress')]
+    live = LiveScores(poll_seconds=0, fetch=lambda: scoreboard)
+    snapshot = StandingsSnapshot(rows, 'v1', data_as_of=FIRST_PITCH_EPOCH + 600)
+    teams = {rows[0]['team_id'], rows[1]['team_id']}
+    assert live.live_teams(snapshot) == teams
+
+    scoreboard[0] = game(rows, 'Final', inning=9)
+    assert live.live_teams(snapshot) == teams
+
+    counted = StandingsSnapshot(played_one_more(rows, teams), 'v2', data_as_of=FIRST_PITCH_EPOCH + 4 * 3600)
+    assert live.live_teams(counted) == set()
+
+
+def test_scheduled_and_tied_games_leave_snapshot_alone(rows):
+    scoreboard = [game(rows, 'Scheduled', inning=None, home_score=0, away_score=0)]
+    live = LiveScores(poll_seconds=0, fetch=lambda: scoreboard)
+    snapshot = StandingsSnapshot(rows, 'v1', data_as_of=FIRST_PITCH_EPOCH - 600)
+    assert live.project(snapshot) is snapshot
+
+    scoreboard[0] = game(rows, 'In Progress', home_score=2, away_score=2)
+    assert live.project(snapshot) is snapshot
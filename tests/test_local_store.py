@@ -0,0 +1,29 @@
+import local_store
+
+from local_store import LocalStore
+
+
+def test_snapshot_history_keeps_last_versions_and_one_per_day(monkeypatch):
+    store = LocalStore(':memory:')
+    clock = [1757937600.0]  # 2025-09-15 08:00 ET
+    monkeypatch.setattr(local_store.time, 'time', lambda: clock[0])
+
+    # Three days of versions every 6 hours
+    for version in range(12):
+        store.record_snapshot([{'team_id': 1, 'wins': version}], str(version), season='2025', keep_last=3)
+        clock[0] += 6 * 3600
+
+    versions = [version for _, version, _ in store.snapshot_versions(season='2025')]
+    # The last three, then the last version of each earlier day
+    assert versions == ['11', '10', '9', '6', '2']
+    assert store.snapshot_at(1757937600.0 + 13 * 3600, season='2025')[0] == [{'team_id': 1, 'wins': 2}]
+
+
+def test_snapshot_history_is_per_season():
+    store = LocalStore(':memory:')
+    store.record_snapshot([{'team_id': 1}], 'a', season='2024', keep_last=1)
+    store.record_snapshot([{'team_id': 1}], 'b', season='2025', keep_last=1)
+    store.record_snapshot([{'team_id': 1}], 'b', season='2025', keep_last=1)
+
+    assert [version for _, version, _ in store.snapshot_versions(season='2024')] == ['a']
+    assert [version for _, version, _ in store.snapshot_versions(season='2025')] == ['b']
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+import pipeline
+
+from odds import build_pair_inputs, simulate_league, simulate_playoff_odds
+from offline import offline_statsapi
+from records import split_by_league
+from standings import create_divisions_dict
+
+
+@pytest.mark.parametrize('use_pairs', [False, True])
+def test_odds_add_up_to_three_divisions_and_six_spots(use_pairs):
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+
+    for league_teams in split_by_league(teams).values():
+        odds = simulate_playoff_odds(create_divisions_dict(league_teams), simulations=2000, seed=1,
+                                     remaining_by_team=remaining.by_team,
+                                     remaining_pairs=remaining if use_pairs else None)
+        assert sum(team['division'] for team in odds.values()) == pytest.approx(3)
+        assert sum(team['wild_card'] for team in odds.values()) == pytest.approx(3)
+        assert sum(team['playoffs'] for team in odds.values()) == pytest.approx(6)
+        assert sum(team['bye'] for team in odds.values()) == pytest.approx(2)
+
+
+def test_clinched_and_eliminated_teams():
+    # Three divisions of three, 12 games left each, all within the league
+    wins = np.array([100, 80, 78, 85, 84, 83, 82, 81, 50], dtype=np.int32)
+    losses = 150 - wins
+    division_index = np.repeat(np.arange(3), 3).astype(np.int32)
+    remaining = {(0, 1): 6, (0, 2): 6, (1, 2): 6, (3, 4): 6, (3, 5): 6, (4, 5): 6, (6, 7): 6, (6, 8): 6, (7, 8): 6}
+    pairs, other_games = build_pair_inputs(list(range(9)), remaining, [12] * 9)
+
+    assert other_games.tolist() == [0] * 9
+    counts = simulate_league(wins, losses, division_index, 2000, seed=1, remaining_games=other_games, pairs=pairs)
+
+    # Team 0 can't be caught in its division, team 8 can't reach the sixth spot
+    assert counts['division'][0] == 2000
+    assert counts['division'][8] == 0
+    assert counts['wild_card'][8] == 0
+
+
+def test_head_to_head_games_are_zero_sum():
+    # Teams 0 and 1 (10-5 and 9-6) have one game left, against each other.
+    # Team 1 ties only by winning it, then takes the random tie-break half the
+    # time: about 25%. Independent draws would need team 0 to also lose
+    # another game, about 12.5%.
+    wins = np.array([10, 9, 5, 8, 7, 6, 8, 7, 6], dtype=np.int32)
+    losses = 15 - wins
+    division_index = np.repeat(np.arange(3), 3).astype(np.int32)
+    pairs, other_games = build_pair_inputs(list(range(9)), {(0, 1): 1}, [1, 1, 0, 0, 0, 0, 0, 0, 0])
+    counts = simulate_league(wins, losses, division_index, 20000, seed=1, remaining_games=other_games, pairs=pairs)
+
+    assert counts['division'][1] / 20000 == pytest.approx(0.25, abs=0.02)
@@ -0,0 +1,68 @@
+import pytest
+import statsapi
+
+import pipeline
+
+from offline import FakeSupabase, FakeSupabaseError, offline_statsapi
+
+
+def test_fake_supabase_fails_the_next_requests_then_recovers():
+    supabase = FakeSupabase(fail_next=2)
+
+    for _ in range(2):
+        with pytest.raises(FakeSupabaseError):
+            supabase.table('teams').upsert([{'team_id': 1, 'wins': 80}], on_conflict='team_id').execute()
+    supabase.table('teams').upsert([{'team_id': 1, 'wins': 80}], on_conflict='team_id').execute()
+
+    assert supabase.tables['teams'] == {1: {'team_id': 1, 'wins': 80}}
+    # Failed requests are still recorded
+    assert supabase.requests == [('teams', 'upsert', 1)] * 3
+
+
+def test_fake_supabase_random_failures_follow_the_seed():
+    def outcomes(seed):
+        supabase = FakeSupabase(failure_rate=0.5, seed=seed)
+        results = []
+        for _ in range(20):
+            try:
+                supabase.table('teams').select('*').execute()
+                results.append(True)
+            except FakeSupabaseError:
+                results.append(False)
+        return results
+
+    assert outcomes(7) == outcomes(7)
+    assert True in outcomes(7) and False in outcomes(7)
+
+
+def test_fake_supabase_upsert_merges_and_select_filters():
+    supabase = FakeSupabase()
+    supabase.seed_table('teams', [{'team_id': 1, 'league': 'AL', 'wins': 80}, {'team_id': 2, 'league': 'NL', 'wins': 70}])
+
+    supabase.table('teams').upsert({'team_id': 1, 'wins': 81}, on_conflict='team_id').execute()
+
+    assert supabase.table('teams').select('*').eq('league', 'AL').execute().data == [
+        {'team_id': 1, 'league': 'AL', 'wins': 81}
+    ]
+
+
+def test_offline_statsapi_serves_the_fixtures_and_restores_statsapi():
+    original = statsapi.schedule
+    with offline_statsapi() as api:
+        assert statsapi.schedule is not original
+
+        # Schedule filters start from the recording day, not the real today
+        games = statsapi.schedule(start_date='2020-01-01', end_date='2100-01-01')
+        assert games == api.games
+        assert min(game['game_date'] for game in games) >= api.meta['recorded_at']
+
+        # Every call gets its own copy
+        games[0]['status'] = 'Final'
+        assert api.games[0]['status'] != 'Final'
+
+        teams, remaining = pipeline.fetch_all()
+        assert api.calls == 4
+
+    assert statsapi.schedule is original
+    assert len(teams) == 30
+    assert remaining.next_day == api.meta['recorded_at']
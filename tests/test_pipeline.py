@@ -0,0 +1,66 @@
+import json
+import threading
+
+import pipeline
+
+from offline import FakeSupabase, offline_statsapi
+
+
+def test_unchanged_run_sends_no_requests():
+    supabase = FakeSupabase()
+    with offline_statsapi():
+        pipeline.run_pipeline(supabase)
+        assert ('teams', 'upsert', 30) in supabase.requests
+        assert supabase.tables['ingest_status'][1]['last_success_at'] is not None
+        requests = len(supabase.requests)
+
+        pipeline.run_pipeline(supabase)
+    assert len(supabase.requests) == requests
+
+
+def test_unchanged_run_sends_status_heartbeat_when_due(monkeypatch):
+    supabase = FakeSupabase()
+    with offline_statsapi():
+        pipeline.run_pipeline(supabase)
+        requests = len(supabase.requests)
+
+        sent_at, error = pipeline._status_sent
+        monkeypatch.setattr(pipeline, '_status_sent', (sent_at - pipeline.STATUS_HEARTBEAT_SECONDS, error))
+        pipeline.run_pipeline(supabase)
+    assert supabase.requests[requests:] == [('ingest_status', 'upsert', 1)]
+
+
+def test_unchanged_run_after_an_error_clears_it():
+    supabase = FakeSupabase()
+    with offline_statsapi():
+        pipeline.run_pipeline(supabase)
+        pipeline.record_ingest_status(supabase, RuntimeError("MLB API down"))
+        assert supabase.tables['ingest_status'][1]['last_error'] == "MLB API down"
+
+        pipeline.run_pipeline(supabase)
+    assert supabase.tables['ingest_status'][1]['last_error'] is None
+
+
+# remember_written runs on the write-behind thread while the worker diffs and
+# persists the next run
+def test_row_hashes_survive_concurrent_writers():
+    def rows(start):
+        return [{'team_id': team_id, 'wins': team_id} for team_id in range(start, start + 10)]
+
+    def writer(start):
+        for _ in range(20):
+            pipeline.remember_written('teams', rows(start))
+
+    threads = [threading.Thread(target=writer, args=(start,)) for start in range(0, 80, 10)]
+    for thread in threads:
+        thread.start()
+    for _ in range(20):
+        pipeline.persist_snapshot(FakeSupabase(), rows(100))
+    for thread in threads:
+        thread.join()
+
+    with open(pipeline.ROW_HASHES_PATH) as f:
+        saved = json.load(f)
+    assert saved == pipeline.load_row_hashes()
+    assert set(saved) == {str(team_id) for team_id in list(range(80)) + list(range(100, 110))}
+    assert pipeline.find_changed_rows(rows(0) + rows(100)) == ([], {})
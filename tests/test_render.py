@@ -0,0 +1,56 @@
+import pytest
+
+import pipeline
+
+from offline import offline_statsapi
+from render import FragmentCache, build_data_html, build_lanes_html
+from snapshot import freeze_divisions
+
+
+@pytest.fixture
+def divisions():
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+        rows = pipeline.compute_snapshot(teams, remaining)
+    return list(freeze_divisions(rows, "American League").values())
+
+
+def test_unchanged_division_is_a_hit(divisions):
+    cache = FragmentCache()
+    fragments = cache.get(divisions[0])
+
+    assert fragments == (build_lanes_html(divisions[0]), build_data_html(divisions[0]))
+    assert cache.get(divisions[0]) is fragments
+    # A copy with the same state hashes the same
+    assert cache.get(dict(divisions[0])) is fragments
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_changed_division_is_a_miss(divisions):
+    cache = FragmentCache()
+    fragments = cache.get(divisions[0])
+
+    changed = dict(divisions[0])
+    changed[1] = {**changed[1], 'wins': changed[1]['wins'] + 1}
+    changed_fragments = cache.get(changed)
+
+    assert changed_fragments != fragments
+    assert changed_fragments == (build_lanes_html(changed), build_data_html(changed))
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_least_recently_used_division_is_evicted(divisions):
+    east, central, west = divisions
+    cache = FragmentCache(max_entries=2)
+    cache.get(east)
+    cache.get(central)
+    # East is now the most recently used, central goes when west comes in
+    cache.get(east)
+    cache.get(west)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    cache.get(east)
+    cache.get(west)
+    assert (cache.hits, cache.misses) == (3, 3)
+    cache.get(central)
+    assert (cache.hits, cache.misses) == (3, 4)
@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+
+import pipeline
+
+from offline import offline_statsapi
+from resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise RuntimeError("down")
+
+
+def test_breaker_opens_after_threshold_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_seconds=60, clock=FakeClock())
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(fail)
+    assert breaker.state == CLOSED
+
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, clock=FakeClock())
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_trial_closes_or_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_seconds=60, clock=clock)
+    with pytest.raises(RuntimeError):
+        breaker.call(fail)
+
+    clock.now += 59
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # Cool-down over: one trial call, others fail fast meanwhile
+    clock.now += 1
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # A failed trial opens it for another reset_seconds
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 30
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now += 30
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CLOSED
+
+
+@pytest.fixture
+def breakers(monkeypatch):
+    breakers = {name: CircuitBreaker(f"MLB {name}", clock=FakeClock()) for name in pipeline.FETCH_DEADLINES_SECONDS}
+    monkeypatch.setattr(pipeline, 'api_breakers', breakers)
+    monkeypatch.setattr(pipeline, 'FETCH_DEADLINES_SECONDS', {'teams': 0.2, 'standings': 0.2, 'schedule': 0.2})
+    return breakers
+
+
+@pytest.fixture
+def hang():
+    release = threading.Event()
+    yield lambda season: release.wait(5)
+    release.set()
+
+
+def test_hung_fetch_times_out_at_its_deadline(breakers, hang, monkeypatch):
+    monkeypatch.setattr(pipeline, 'fetch_standing_data', hang)
+    with offline_statsapi():
+        with pytest.raises(pipeline.FetchError, match="standings call timed out"):
+            pipeline.fetch_all()
+    assert breakers['standings'].failures == 1
+    assert breakers['teams'].failures == 0
+
+
+def test_hung_schedule_falls_back_to_api_flags(breakers, hang, monkeypatch):
+    monkeypatch.setattr(pipeline, 'fetch_remaining_schedule', hang)
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+    assert len(teams) == 30
+    assert remaining is None
+    assert breakers['schedule'].failures == 1
+
+
+def test_open_breaker_skips_the_call(breakers, monkeypatch):
+    calls = []
+    monkeypatch.setattr(pipeline, 'fetch_teams_data', lambda season: calls.append(season))
+    breakers['teams'].state = OPEN
+    breakers['teams'].opened_at = breakers['teams'].clock()
+
+    with offline_statsapi():
+        with pytest.raises(pipeline.FetchError, match="circuit open"):
+            pipeline.fetch_all()
+    assert calls == []
@@ -0,0 +1,25 @@
+import json
+
+from response_cache import CACHE_FORMAT_VERSION, ResponseCache
+
+
+def test_fresh_entry_is_a_hit(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.get_or_fetch('teams:2025', 60, lambda: {'teams': [1]}) == ({'teams': [1]}, 'miss')
+    assert cache.get_or_fetch('teams:2025', 60, lambda: {'teams': [2]}) == ({'teams': [1]}, 'hit')
+
+
+def test_entry_in_another_format_is_a_miss(tmp_path):
+    # A raw response cached under the same key before entries were versioned
+    old_entry = {'stored_at': 0, 'checked_at': 9e12, 'hash': 'x', 'payload': {'teams': 'raw'}}
+    (tmp_path / 'teams_2025.json').write_text(json.dumps(old_entry))
+    cache = ResponseCache(str(tmp_path))
+
+    assert cache.read('teams:2025') is None
+    assert cache.get_or_fetch('teams:2025', 60, lambda: {'teams': [1]}) == ({'teams': [1]}, 'miss')
+    assert json.loads((tmp_path / 'teams_2025.json').read_text())['format'] == CACHE_FORMAT_VERSION
+
+    assert ResponseCache(str(tmp_path), format_version=1).read('teams:2025') is None
+
+    newer = ResponseCache(str(tmp_path), format_version=CACHE_FORMAT_VERSION + 1)
+    assert newer.get_or_fetch('teams:2025', 60, lambda: {'teams': [2]}) == ({'teams': [2]}, 'miss')
@@ -0,0 +1,57 @@
+import pytest
+
+import pipeline
+
+from offline import offline_statsapi
+from records import build_table_rows, carry_schedule_columns, records_from_table_rows
+from scenarios import ScenarioEngine
+from standings import apply_results, compute_league
+
+TOR, TB, BOS = 141, 139, 111
+
+
+@pytest.fixture
+def rows():
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+        return pipeline.compute_snapshot(teams, remaining)
+
+
+def rows_by_team(divisions):
+    return {row['team_id']: row for teams_in_div in divisions.values() for row in teams_in_div.values()}
+
+
+def test_what_if_matches_compute_league_on_the_rescored_league(rows):
+    picks = {(TOR, TB), (TOR, BOS)}
+    divisions_AL, divisions_NL = ScenarioEngine(rows).evaluate(picks)
+
+    al_rows = [row for row in rows if row['league'] == "American League"]
+    projected = apply_results(records_from_table_rows(al_rows), picks)
+    expected = carry_schedule_columns(build_table_rows(projected, compute_league(projected)), al_rows)
+
+    assert rows_by_team(divisions_AL) == {row['team_id']: row for row in expected}
+    original = {row['team_id']: row for row in rows}
+    assert rows_by_team(divisions_AL)[TOR]['wins'] == original[TOR]['wins'] + 2
+    assert rows_by_team(divisions_AL)[TB]['losses'] == original[TB]['losses'] + 1
+    # No NL team picked, its rows are the snapshot's own
+    assert all(row is original[team_id] for team_id, row in rows_by_team(divisions_NL).items())
+
+
+def test_repeated_pick_set_comes_from_the_cache(rows):
+    engine = ScenarioEngine(rows)
+    result = engine.evaluate([(TOR, TB), (TOR, BOS)])
+
+    # Same picks in any order are the same scenario
+    assert engine.evaluate([(TOR, BOS), (TOR, TB)]) is result
+    assert (engine.hits, engine.misses) == (1, 1)
+    assert engine.evaluate([(TB, TOR)]) is not result
+    assert (engine.hits, engine.misses) == (1, 2)
+
+
+def test_oldest_scenario_is_evicted(rows):
+    engine = ScenarioEngine(rows, max_entries=1)
+    first = engine.evaluate([(TOR, TB)])
+    engine.evaluate([(TB, TOR)])
+
+    assert engine.evaluate([(TOR, TB)]) is not first
+    assert (engine.hits, engine.misses) == (0, 3)
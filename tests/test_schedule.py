@@ -0,0 +1,35 @@
+from schedule import SeasonSchedule
+
+
+def schedule_game(game_id, game_date, home_id, away_id, status='Scheduled'):
+    return {
+        'game_id': game_id, 'game_type': 'R', 'game_date': game_date, 'status': status,
+        'home_id': home_id, 'away_id': away_id
+    }
+
+
+def test_next_day_skips_games_dated_before_today():
+    games = [
+        # Suspended yesterday and never marked final
+        schedule_game(1, '2025-09-14', 1, 2, status='Suspended'),
+        schedule_game(2, '2025-09-15', 3, 4, status='Final'),
+        schedule_game(3, '2025-09-16', 1, 3),
+        schedule_game(4, '2025-09-16', 2, 4),
+        schedule_game(5, '2025-09-17', 1, 4)
+    ]
+    schedule = SeasonSchedule.build('2025', games, today='2025-09-15')
+
+    assert schedule.next_day == '2025-09-16'
+    assert schedule.next_games == [(1, 3), (2, 4)]
+    # The suspended game is still left to play
+    assert schedule.remaining_schedule()[(1, 2)] == 1
+
+    schedule.update([schedule_game(3, '2025-09-16', 1, 3, status='Final'), schedule_game(4, '2025-09-16', 2, 4),
+                     schedule_game(5, '2025-09-17', 1, 4)], today='2025-09-17')
+    assert schedule.next_day == '2025-09-17'
+    assert schedule.next_games == [(1, 4)]
+
+
+def test_next_day_without_today_is_the_earliest_game_left():
+    games = [schedule_game(1, '2025-09-14', 1, 2, status='Suspended'), schedule_game(2, '2025-09-16', 3, 4)]
+    assert SeasonSchedule.build('2025', games).next_day == '2025-09-14'
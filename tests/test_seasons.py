@@ -0,0 +1,38 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+import seasons
+
+from offline import offline_statsapi
+
+
+class FrozenDatetime(datetime):
+    now_utc = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.now_utc.astimezone(tz)
+
+
+def test_game_day_is_eastern_time_date(monkeypatch):
+    monkeypatch.setattr(seasons, 'datetime', FrozenDatetime)
+
+    # 9:30 PM EDT, already the next day in UTC
+    FrozenDatetime.now_utc = datetime(2025, 9, 16, 1, 30, tzinfo=timezone.utc)
+    assert seasons.game_day() == date(2025, 9, 15)
+
+    FrozenDatetime.now_utc = datetime(2025, 9, 16, 4, 30, tzinfo=timezone.utc)
+    assert seasons.game_day() == date(2025, 9, 16)
+
+
+def test_season_can_be_archived_the_day_after_it_ends(tmp_path, monkeypatch):
+    monkeypatch.setattr(seasons, 'regular_season_dates', lambda season: (date(2025, 3, 27), date(2025, 9, 15)))
+
+    with seasons.pinned_game_day(date(2025, 9, 15)):
+        with pytest.raises(ValueError, match="isn't over yet"):
+            seasons.archive_season('2025', archive_dir=str(tmp_path))
+
+    with offline_statsapi(), seasons.pinned_game_day(date(2025, 9, 16)):
+        seasons.archive_season('2025', archive_dir=str(tmp_path))
+    assert len(seasons.load_archive('2025', archive_dir=str(tmp_path)).teams) == 30
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from snapshot import SnapshotStore
+
+
+def rows(wins=80):
+    return [{'team_id': 1, 'league': 'American League', 'division': 'American League East', 'division_rank': 1,
+             'wins': wins}]
+
+
+def test_reads_dont_wait_for_a_slow_revalidation():
+    store = SnapshotStore(ttl_seconds=0, path=None)
+    store.get(lambda: (rows(), None))
+    release = threading.Event()
+
+    def slow_loader():
+        release.wait(5)
+        return rows(81), None
+
+    done = store.revalidate(slow_loader)
+    start_time = time.perf_counter()
+    assert store.peek().teams[0]['wins'] == 80
+    assert store.revalidate(slow_loader) is done
+    assert time.perf_counter() - start_time < 0.5
+    assert not done.is_set()
+
+    release.set()
+    assert done.wait(5)
+    assert store.peek().teams[0]['wins'] == 81
+    assert store.last_error is None
+
+
+def test_concurrent_revalidations_run_the_loader_once():
+    store = SnapshotStore(ttl_seconds=0, path=None)
+    store.get(lambda: (rows(), None))
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        release.wait(5)
+        return rows(81), None
+
+    events = []
+    threads = [threading.Thread(target=lambda: events.append(store.revalidate(slow_loader))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    release.set()
+
+    assert len({id(event) for event in events}) == 1
+    assert events[0].wait(5)
+    assert len(calls) == 1
+    assert store.loads == 2
+
+
+def test_concurrent_gets_of_an_empty_store_load_once():
+    store = SnapshotStore(path=None)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return rows(), None
+
+    snapshots = []
+    threads = [threading.Thread(target=lambda: snapshots.append(store.get(loader))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+
+
+def test_snapshot_rows_are_read_only():
+    source = rows()
+    snapshot = SnapshotStore(path=None).get(lambda: (source, None))
+
+    with pytest.raises(TypeError):
+        snapshot.teams[0]['wins'] = 100
+    with pytest.raises(TypeError):
+        snapshot.divisions_AL['American League East'][1]['wins'] = 100
+    with pytest.raises(AttributeError):
+        snapshot.teams = ()
+    # The loader's rows were copied, changing them doesn't reach the snapshot
+    source[0]['wins'] = 100
+    assert snapshot.teams[0]['wins'] == 80
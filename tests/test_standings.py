@@ -0,0 +1,110 @@
+import pipeline
+
+from offline import offline_statsapi
+from records import TeamRecord
+from standings import apply_results, compute_league
+
+# A 20 game season keeps the numbers small enough to check by hand
+GAMES = 20
+
+
+def team(team_id, abbreviation, division, w, l, gb, div_rank, wc_rank, league_rank, elim_num='-', wc_elim_num='-'):
+    return TeamRecord(
+        [team_id, abbreviation, abbreviation, division, 'Test League'],
+        [w, l, gb, div_rank, wc_rank, None, league_rank, elim_num, wc_elim_num]
+    )
+
+
+# East: EA has clinched, EC is out of everything.
+# Central: CA leads on win percentage (.750) with fewer wins than CB (13).
+# West: WB and EB are tied at 10-8 for the last wild card, WB holds it.
+def league():
+    return [
+        team(1, 'EA', 'East', 15, 3, 0.0, 1, None, 1),
+        team(2, 'EB', 'East', 10, 8, 5.0, 2, 4, 7),
+        team(3, 'EC', 'East', 4, 14, 11.0, 3, 5, 8, elim_num='E', wc_elim_num='E'),
+        team(4, 'CA', 'Central', 12, 4, 0.0, 1, None, 2),
+        team(5, 'CB', 'Central', 13, 6, 0.5, 2, 1, 3),
+        team(6, 'CC', 'Central', 11, 7, 2.0, 3, 2, 5),
+        team(7, 'WA', 'West', 11, 7, 0.0, 1, None, 4),
+        team(8, 'WB', 'West', 10, 8, 1.0, 2, 3, 6),
+        team(9, 'WC', 'West', 3, 15, 8.0, 3, 6, 9, elim_num='E', wc_elim_num='E')
+    ]
+
+
+def column(results, name):
+    return {team_id: result[name] for team_id, result in results.items()}
+
+
+def test_seeding():
+    results = compute_league(league(), games_per_season=GAMES)
+    # Division winners by win percentage, then the wild card order
+    assert column(results, 'playoff_position') == {1: 1, 4: 2, 7: 3, 5: 4, 6: 5, 8: 6, 2: 7, 3: 8, 9: 9}
+
+
+def test_division_magic_numbers():
+    results = compute_league(league(), games_per_season=GAMES)
+    # RG + 1 - (second place losses - leader losses)
+    assert column(results, 'magic_number_division') == {
+        1: -2,  # 2 + 1 - (8 - 3): clinched
+        4: 3,   # 4 + 1 - (6 - 4)
+        7: 2,   # 2 + 1 - (8 - 7)
+        2: None, 3: None, 5: None, 6: None, 8: None, 9: None
+    }
+    # The leader's magic number, plus games back
+    assert results[1]['distance_from_clinched_division'] == -2
+    assert results[2]['distance_from_clinched_division'] == 3.0
+    assert results[6]['distance_from_clinched_division'] == 5.0
+
+
+def test_division_tragic_numbers_use_the_rival_with_most_wins():
+    results = compute_league(league(), games_per_season=GAMES)
+    assert column(results, 'tragic_number_division') == {
+        2: 0,  # 21 - 15 - 8 < 0
+        3: 0,
+        5: 3,  # 21 - CA's 12 - 6
+        6: 1,  # 21 - CB's 13 - 7, not 21 - CA's 12 - 7
+        8: 2,  # 21 - 11 - 8
+        9: 0,
+        1: None, 4: None, 7: None
+    }
+
+
+def test_wild_card_numbers_with_a_tie_for_the_last_spot():
+    results = compute_league(league(), games_per_season=GAMES)
+    # Wild cards against EB (first team out, 8 losses)
+    assert column(results, 'magic_number_wild_card') == {
+        5: 0, 6: 2, 8: 3, 1: None, 2: None, 3: None, 4: None, 7: None, 9: None
+    }
+    # Everyone out against WB (last wild card, 10 wins)
+    assert column(results, 'tragic_number_wild_card') == {
+        2: 3, 3: 0, 9: 0, 1: None, 4: None, 5: None, 6: None, 7: None, 8: None
+    }
+
+
+def test_elimination_flags_from_api_or_local_engine():
+    results = compute_league(league(), {2: {'eliminated_from_division': True}}, games_per_season=GAMES)
+    assert column(results, 'eliminated_from_division') == {1: 0, 2: 1, 3: 1, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 1}
+    assert column(results, 'eliminated_from_wildcard') == {1: 0, 2: 0, 3: 1, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 1}
+
+
+def test_apply_results_reranks_by_win_percentage():
+    # CB beats CA twice: 15-6 (.714) passes 12-6 (.667)
+    projected = {team.team_id: team for team in apply_results(league(), [(5, 4), (5, 4)])}
+
+    assert (projected[5].w, projected[5].l, projected[5].div_rank, projected[5].wc_rank) == (15, 6, 1, None)
+    assert (projected[4].w, projected[4].l, projected[4].div_rank, projected[4].wc_rank) == (12, 6, 2, 1)
+    assert projected[4].gb == 1.5
+    results = compute_league(list(projected.values()), games_per_season=GAMES)
+    assert results[5]['playoff_position'] == 2
+    assert results[4]['playoff_position'] == 4
+
+
+def test_fixture_tragic_number_matches_elimination():
+    with offline_statsapi():
+        teams, remaining = pipeline.fetch_all()
+    rows = {row['team_id']: row for row in pipeline.compute_snapshot(teams, remaining)}
+
+    # TOR (66-80) is behind leader TB (80 wins) but BOS has 84: 163 - 84 - 80 < 0
+    assert rows[141]['eliminated_from_division'] == 1
+    assert rows[141]['tragic_number_division'] == 0
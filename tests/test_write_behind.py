@@ -0,0 +1,61 @@
+import pipeline
+
+from offline import FakeSupabase
+from write_behind import WriteBehindQueue
+
+
+def team_rows(count=3):
+    return [{'team_id': team_id, 'wins': 80 + team_id} for team_id in range(1, count + 1)]
+
+
+def queue(supabase, max_attempts=2):
+    return WriteBehindQueue(supabase, on_written=pipeline.remember_written, max_attempts=max_attempts,
+                            backoff_seconds=0.001)
+
+
+def test_rows_and_success_status_are_written():
+    supabase = FakeSupabase()
+    writer = queue(supabase)
+
+    pipeline.persist_snapshot(supabase, team_rows(), writer=writer)
+    pipeline.record_ingest_status(supabase, writer=writer)
+    assert writer.close(5)
+
+    assert len(supabase.tables['teams']) == 3
+    status = supabase.tables['ingest_status'][1]
+    assert status['last_success_at'] is not None
+    assert status['last_error'] is None
+    assert set(pipeline.load_row_hashes()) == {'1', '2', '3'}
+
+
+def test_given_up_teams_batch_records_error_not_success():
+    # Both attempts at the teams batch fail, then the database is back
+    supabase = FakeSupabase(fail_next=2)
+    writer = queue(supabase, max_attempts=2)
+
+    pipeline.persist_snapshot(supabase, team_rows(), writer=writer)
+    pipeline.record_ingest_status(supabase, writer=writer)
+    assert writer.close(5)
+
+    assert writer.rows_failed == 3
+    assert 'teams' not in supabase.tables
+    status = supabase.tables['ingest_status'][1]
+    assert 'last_success_at' not in status
+    assert 'Injected failure' in status['last_error']
+    # Nothing remembered as written, the next run sends every row again
+    assert pipeline.load_row_hashes() == {}
+
+
+def test_given_up_batch_keeps_previous_success_time():
+    supabase = FakeSupabase()
+    supabase.seed_table('ingest_status', [{'id': 1, 'last_success_at': '2025-09-14T12:00:00+00:00'}], key='id')
+    supabase.fail_next = 2
+    writer = queue(supabase, max_attempts=2)
+
+    pipeline.persist_snapshot(supabase, team_rows(), writer=writer)
+    pipeline.record_ingest_status(supabase, writer=writer)
+    assert writer.close(5)
+
+    status = supabase.tables['ingest_status'][1]
+    assert status['last_success_at'] == '2025-09-14T12:00:00+00:00'
+    assert status['last_error'] is not None
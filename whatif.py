@@ -0,0 +1,63 @@
+import streamlit as st
+
+import metrics
+
+from live import teams_playing
+
+
+# What-if view: pick winners for today's remaining games and see seeding,
+# magic numbers and lanes update straight away (see scenarios.py).
+# The games come from the shared live poller (live.py), the standings from
+# the page's snapshot, so toggling never calls the MLB API or Supabase.
+
+LEAGUE_DIVISIONS = {
+    "American League": ['American League East', 'American League Central', 'American League West'],
+    "National League": ['National League East', 'National League Central', 'National League West']
+}
+
+
+# Regular season games today that aren't over yet
+def open_games(games):
+    playing = teams_playing(games)
+    return [game for game in games if game['game_type'] == 'R' and game['home_id'] in playing]
+
+
+# Toggling a pick only reruns this fragment, not the whole page
+@st.fragment
+def render_whatif(engine, games, fragment_cache, abbreviations):
+    games = open_games(games)
+    if not games:
+        st.info("No games left to pick today.")
+        return
+
+    outcomes = []
+    with st.expander(f"Pick winners ({len(games)} games today)", expanded=True):
+        columns = st.columns(3)
+        for index, game in enumerate(games):
+            away, home = abbreviations.get(game['away_id'], game['away_name']), abbreviations.get(game['home_id'], game['home_name'])
+            with columns[index % 3]:
+                winner = st.segmented_control(f"{away} @ {home}", [away, home], key=f"whatif_{game['game_id']}")
+            if winner == home:
+                outcomes.append((game['home_id'], game['away_id']))
+            elif winner == away:
+                outcomes.append((game['away_id'], game['home_id']))
+
+    with metrics.span('page.whatif') as span:
+        hits_before = engine.hits
+        divisions_AL, divisions_NL = engine.evaluate(outcomes)
+        span.count('scenario_hits' if engine.hits > hits_before else 'scenario_misses')
+
+    # Unchanged divisions come straight from the fragment cache
+    for column, league, divisions in zip(st.columns(2), LEAGUE_DIVISIONS, (divisions_AL, divisions_NL)):
+        with column:
+            st.markdown(f"<h2 style='text-align: center;'>{league}</h2>", unsafe_allow_html=True)
+            for division_name in LEAGUE_DIVISIONS[league]:
+                if division_name not in divisions:
+                    continue
+                st.markdown(f"<h3 style='color: #ffd93d; text-align: center; margin-bottom: 20px; font-size: 1.3rem;'>{division_name}</h3>", unsafe_allow_html=True)
+                lanes_html, data_html = fragment_cache.get(divisions[division_name])
+                lane_col, data_col = st.columns([2, 1])
+                with lane_col:
+                    st.html(lanes_html)
+                with data_col:
+                    st.html(data_html)
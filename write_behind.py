@@ -0,0 +1,191 @@
+import threading
+import time
+
+from collections import OrderedDict
+
+import metrics
+
+
+# Write-behind persistence queue
+#
+# The worker hands rows to a WriteBehindQueue and moves on; a dedicated thread
+# writes them to Supabase. Rows are coalesced by table and key (a team queued
+# twice is written once, with its newest row), written as one upsert per table
+# per batch, and a failed batch is retried with exponential backoff instead of
+# falling back to one request per row. Tables are written in the order their
+# rows were queued, so ingest_status is only updated after the teams rows
+# queued before it. A row can come with a fallback: if any batch was given up
+# on between queueing the row and writing it, fallback(error) is written
+# instead (ingest_status then records the error rather than a success).
+#
+# The queue is bounded: once MAX_PENDING_ROWS distinct rows are waiting, new
+# keys are dropped (and counted). For the teams table that's harmless, a row
+# that was never written keeps its old hash and is queued again next run.
+#
+# Observability (metrics.py): gauge persist.queue_depth, span persist.write
+# per upsert (rows_written, errors, retries), persist.queue_latency, the time
+# from queueing a batch's oldest row to it being written, and
+# persist.give_up (rows_failed).
+
+MAX_PENDING_ROWS = 1000
+BATCH_SIZE = 500
+MAX_ATTEMPTS = 6          # 1 + 5 retries, 1+2+4+8+16 seconds of backoff
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class WriteBehindQueue:
+    # on_written(table, rows) is called on the writer thread after every
+    # successful upsert
+    def __init__(self, supabase, on_written=None, max_pending=MAX_PENDING_ROWS, batch_size=BATCH_SIZE,
+                 max_attempts=MAX_ATTEMPTS, backoff_seconds=BACKOFF_SECONDS, max_backoff_seconds=MAX_BACKOFF_SECONDS):
+        self.supabase = supabase
+        self.on_written = on_written
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        # (table, key value) -> (row, on_conflict column, queued_at, give_ups when queued, fallback),
+        # oldest first
+        self._pending = OrderedDict()
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._closed = threading.Event()
+        self._thread = None
+        self.rows_written = 0
+        self.rows_dropped = 0   # queue full
+        self.rows_failed = 0    # gave up after max_attempts
+        self.give_ups = 0       # batches given up on
+        self.last_error = None  # why the last upsert failed, None after a success
+        self.last_give_up_error = None
+
+    # Queues one row, replacing a pending row with the same key.
+    # Returns False if the queue is full and the row was dropped.
+    # fallback(error) -> row replaces row if a batch is given up on before it's written.
+    def put(self, table, row, key, fallback=None):
+        return self.put_many(table, [row], key, fallback) == 1
+
+    # Queues rows all at once, so the writer never takes part of them as a
+    # batch of their own. Returns how many rows were queued.
+    def put_many(self, table, rows, key, fallback=None):
+        queued = 0
+        with self._condition:
+            for row in rows:
+                pending_key = (table, row[key])
+                if pending_key in self._pending:
+                    queued_at = self._pending.pop(pending_key)[2]
+                elif len(self._pending) >= self.max_pending:
+                    self.rows_dropped += 1
+                    continue
+                else:
+                    queued_at = time.time()
+                # Newest row goes to the back, behind whatever was queued before it
+                self._pending[pending_key] = (row, key, queued_at, self.give_ups, fallback)
+                queued += 1
+            self._update_depth()
+            self._condition.notify_all()
+
+        if self._thread is None:
+            self._start()
+        return queued
+
+    # Rows waiting or being written
+    def depth(self):
+        with self._condition:
+            return len(self._pending) + self._in_flight
+
+    # Waits until everything queued so far is written (or given up on).
+    # Returns False on timeout.
+    def flush(self, timeout=None):
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    # Stops the writer thread once the queue is empty or after timeout
+    def close(self, timeout=None):
+        flushed = self.flush(timeout)
+        self._closed.set()
+        with self._condition:
+            self._condition.notify_all()
+        return flushed
+
+    def _start(self):
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                self._thread.start()
+
+    # Caller holds self._condition
+    def _update_depth(self):
+        metrics.registry.set_gauge('persist.queue_depth', len(self._pending) + self._in_flight)
+
+    # Up to batch_size rows of the table at the front of the queue, removed from it
+    def _take_batch(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self._closed.is_set())
+            if not self._pending:
+                return None
+
+            table = next(iter(self._pending))[0]
+            batch = []
+            for pending_key, (row, key, queued_at, give_ups, fallback) in self._pending.items():
+                if pending_key[0] == table and len(batch) < self.batch_size:
+                    if fallback is not None and self.give_ups > give_ups:
+                        row = fallback(self.last_give_up_error)
+                    batch.append((pending_key, row, key, queued_at))
+            for pending_key, *_ in batch:
+                del self._pending[pending_key]
+            self._in_flight = len(batch)
+            return table, batch
+
+    def _run(self):
+        while True:
+            taken = self._take_batch()
+            if taken is None:
+                return
+            table, batch = taken
+            try:
+                self._write(table, batch)
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self._update_depth()
+                    self._condition.notify_all()
+
+    def _write(self, table, batch):
+        for attempt in range(1, self.max_attempts + 1):
+            # Rows queued again while this batch waited are written with that newer row instead
+            with self._condition:
+                batch = [entry for entry in batch if entry[0] not in self._pending]
+                self._in_flight = len(batch)
+            if not batch:
+                return
+
+            rows = [row for _, row, _, _ in batch]
+            try:
+                with metrics.span('persist.write') as span:
+                    if attempt > 1:
+                        span.count('retries')
+                    self.supabase.table(table).upsert(rows, on_conflict=batch[0][2]).execute()
+                    span.count('rows_written', len(rows))
+            except Exception as e:
+                self.last_error = e
+                print(f"Could not write {len(rows)} {table} rows (attempt {attempt} of {self.max_attempts}): {e}")
+                if attempt < self.max_attempts:
+                    delay = min(self.backoff_seconds * 2 ** (attempt - 1), self.max_backoff_seconds)
+                    if self._closed.wait(delay):
+                        break
+                continue
+
+            metrics.registry.record_value('persist.queue_latency', time.time() - min(entry[3] for entry in batch))
+            self.last_error = None
+            self.rows_written += len(rows)
+            if self.on_written:
+                self.on_written(table, rows)
+            return
+
+        self.rows_failed += len(batch)
+        self.give_ups += 1
+        self.last_give_up_error = self.last_error
+        with metrics.span('persist.give_up') as span:
+            span.count('rows_failed', len(batch))